@@ -2,11 +2,12 @@
 DSP Controller - Connects optimized Rust AudioProcessor to Python GUI
 """
 
+import asyncio
 import numpy as np
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional
 
 try:
-    from spectral_workbench import AudioProcessor, WindowType
+    from spectral_workbench import AudioProcessor, WindowType, MAX_WAVEFORM_SIZE, MAX_SPECTRUM_SIZE
     RUST_AVAILABLE = True
 except ImportError:
     RUST_AVAILABLE = False
@@ -20,6 +21,17 @@ class DSPController:
         self.processor = None
         self.sample_rate = 48000.0
         self._cached_results = None  # Cache to prevent double-fetch race condition
+        self._frequencies = None  # Frequency axis, only re-sent when it changes
+        self._spectrum_generation = None
+        self.display_width = 0  # Waveform plot width in pixels (0 = full resolution)
+        self.detail_range = None  # Optional (start, stop) samples also sent at full resolution
+        self._sequence = None  # Sequence number of the last fetched frame
+
+        # Persistent result buffers filled in place by get_results_into
+        if RUST_AVAILABLE:
+            self._input_buffer = np.zeros(MAX_WAVEFORM_SIZE)
+            self._filtered_buffer = np.zeros(MAX_WAVEFORM_SIZE)
+            self._magnitude_buffer = np.zeros(MAX_SPECTRUM_SIZE)
 
         if RUST_AVAILABLE:
             self._initialize_processor()
@@ -29,9 +41,47 @@ class DSPController:
     def _fetch_results(self):
         """Fetch and cache results from processor (prevents double-fetch)"""
         if self._cached_results is None and self.processor:
-            self._cached_results = self.processor.get_results()
+            if self.detail_range is not None:
+                self._cached_results = self.processor.get_results(self.display_width, self.detail_range)
+            else:
+                self._cached_results = self._fetch_results_into()
         return self._cached_results
 
+    def _fetch_results_into(self):
+        """Fetch results into the persistent buffers (arrays are views, not copies)"""
+        info = self.processor.get_results_into(
+            self._input_buffer,
+            self._filtered_buffer,
+            self._magnitude_buffer,
+            self.display_width
+        )
+        if info is None:
+            return None
+
+        waveform_len, columns, spectrum_len, generation, self._sequence, sample_rate = info
+
+        # Same keys as get_results(); the axis is fetched only on a new generation
+        results = {
+            'waveform_len': waveform_len,
+            'spectrum_magnitude': self._magnitude_buffer[:spectrum_len],
+            'spectrum_generation': generation,
+            'sample_rate': sample_rate,
+        }
+
+        if columns > 0:
+            results['input_envelope'] = self._input_buffer[:2 * columns]
+            results['filtered_envelope'] = self._filtered_buffer[:2 * columns]
+        else:
+            results['input_waveform'] = self._input_buffer[:waveform_len]
+            results['filtered_waveform'] = self._filtered_buffer[:waveform_len]
+
+        if generation != self._spectrum_generation:
+            axis = self.processor.get_frequency_axis()
+            if axis is not None and axis[0] == generation:
+                results['spectrum_frequencies'] = axis[1]
+
+        return results
+
     def clear_cache(self):
         """Clear cached results after both getters have been called"""
         self._cached_results = None
@@ -124,6 +174,59 @@ class DSPController:
             print(f"Error designing filter: {e}")
             return {'length': 0, 'delay': 0.0}
             
+    def set_min_block_fill(self, samples: int):
+        """Set minimum buffered samples before the processing thread wakes"""
+        if self.processor:
+            self.processor.set_min_block_fill(samples)
+
+    def set_analysis_overlap(self, overlap: float):
+        """Set overlap between analysis frames (0.0-0.99, e.g. 0.5 or 0.75)"""
+        if self.processor:
+            self.processor.set_analysis_overlap(overlap)
+
+    def set_analysis_rate(self, fps: float):
+        """Limit spectrum analysis to fps per second (0 = every STFT hop)"""
+        if self.processor:
+            self.processor.set_analysis_rate(fps)
+
+    def set_analysis_on_demand(self):
+        """Recompute the spectrum only when results are fetched"""
+        if self.processor:
+            self.processor.set_analysis_on_demand()
+
+    def set_averaging(self, mode: str, parameter: float = 0.0):
+        """
+        Set spectrum averaging mode (computed in Rust, power domain)
+
+        Args:
+            mode: 'none', 'welch', 'exponential' or 'peak_hold'
+            parameter: Frames (welch), time constant in s (exponential)
+                or decay in dB/s (peak_hold)
+        """
+        if self.processor:
+            try:
+                self.processor.set_averaging(mode, parameter)
+            except ValueError as e:
+                print(f"Error setting averaging: {e}")
+
+    def get_stats(self) -> Optional[Dict]:
+        """
+        Get processing thread statistics
+
+        Returns:
+            Dictionary with 'wakeups_per_second', 'average_block_fill',
+            'wakeups', 'blocks', 'analyses_per_second' and 'elapsed_seconds',
+            or None
+        """
+        if not self.processor:
+            return None
+        return self.processor.get_stats()
+
+    def set_crossfade_samples(self, samples: int):
+        """Set crossfade length (in samples) used when filters are swapped"""
+        if self.processor:
+            self.processor.set_crossfade_samples(samples)
+
     def set_bypass(self, bypass: bool):
         """Set filter bypass state"""
         if self.processor:
@@ -144,6 +247,12 @@ class DSPController:
         if self.processor:
             return self.processor.is_monitoring()
         return False
+
+    def monitoring_underruns(self) -> int:
+        """Get number of monitoring output underruns"""
+        if self.processor:
+            return self.processor.monitoring_underruns()
+        return 0
         
     def set_fft_size(self, size: int):
         """Update FFT size"""
@@ -168,10 +277,22 @@ class DSPController:
         # Update with current FFT size (default 4096)
         self.processor.update_fft_config(4096, window_enum)
         
+    def set_display_width(self, width: int):
+        """
+        Set the waveform plot width for min/max envelope decimation
+
+        Args:
+            width: Plot width in pixels (0 = full-resolution waveforms)
+        """
+        self.display_width = max(0, int(width))
+
     def get_waveform_data(self) -> Optional[Dict]:
         """
         Get latest waveform data
 
+        With a display width set, 'input' and 'filtered' hold interleaved
+        min/max pairs per pixel column and 'time' repeats each column's start.
+
         Returns:
             Dictionary with 'time', 'input' and 'filtered' numpy arrays, or None
         """
@@ -184,23 +305,225 @@ class DSPController:
             if results is None:
                 return None
 
-            # Create time axis
-            input_waveform = np.array(results['input_waveform'], dtype=np.float64)
-            filtered_waveform = np.array(results['filtered_waveform'], dtype=np.float64)
             sample_rate = float(results['sample_rate'])
 
-            time = np.arange(len(input_waveform)) / sample_rate
+            if 'input_envelope' in results:
+                # Envelope: one (min, max) pair per column, drawn as a vertical stroke
+                input_waveform = results['input_envelope']
+                filtered_waveform = results['filtered_envelope']
+                columns = len(input_waveform) // 2
+                column_start = np.arange(columns) * (results['waveform_len'] / max(columns, 1))
+                time = np.repeat(column_start, 2) / sample_rate
+            else:
+                input_waveform = results['input_waveform']
+                filtered_waveform = results['filtered_waveform']
+                time = np.arange(len(input_waveform)) / sample_rate
 
-            return {
+            data = {
                 'time': time,
                 'input': input_waveform,
                 'filtered': filtered_waveform,
             }
 
+            if 'input_detail' in results:
+                start = results['detail_start']
+                data['detail_time'] = (start + np.arange(len(results['input_detail']))) / sample_rate
+                data['input_detail'] = results['input_detail']
+                data['filtered_detail'] = results['filtered_detail']
+
+            return data
+
         except Exception as e:
             print(f"Error getting waveform: {e}")
             return None
             
+    def set_trigger(self, enabled: bool, **settings):
+        """
+        Enable or disable the triggered oscilloscope capture
+
+        Args:
+            enabled: Capture trigger-aligned frames in the processing thread
+            **settings: Trigger parameters (level, slope, frame_len,
+                pre_trigger, holdoff, mode, auto_timeout, source)
+        """
+        if not self.processor:
+            return
+
+        try:
+            if enabled:
+                self.processor.set_trigger(**settings)
+            else:
+                self.processor.disable_trigger()
+        except ValueError as e:
+            print(f"Invalid trigger settings: {e}")
+
+    def get_scope_frame(self) -> Optional[Dict]:
+        """
+        Get the latest triggered waveform frame
+
+        Returns:
+            Dictionary with 'time' (seconds relative to the trigger point),
+            'input', 'filtered' and 'triggered', or None if nothing fired
+            since the previous call
+        """
+        if not self.processor:
+            return None
+
+        try:
+            frame = self.processor.get_scope_frame()
+
+            if frame is None:
+                return None
+
+            input_waveform = frame['input_waveform']
+            time = (np.arange(len(input_waveform)) - frame['trigger_index']) / frame['sample_rate']
+
+            return {
+                'time': time,
+                'input': input_waveform,
+                'filtered': frame['filtered_waveform'],
+                'triggered': frame['triggered'],
+            }
+
+        except Exception as e:
+            print(f"Error getting scope frame: {e}")
+            return None
+
+    def set_result_queue_capacity(self, capacity: int):
+        """
+        Keep every processed frame for batched retrieval (applied on start)
+
+        Args:
+            capacity: Maximum pending frames (0 disables the queue)
+        """
+        if self.processor:
+            self.processor.set_result_queue_capacity(capacity)
+
+    def get_results_batch(self, max_frames: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get all frames processed since the previous call
+
+        Args:
+            max_frames: Maximum frames to return (None = all pending)
+
+        Returns:
+            Dictionary of stacked 2D arrays (one row per frame) with
+            'sequence' numbers and the 'dropped' frame count, or None
+        """
+        if not self.processor:
+            return None
+
+        try:
+            return self.processor.get_results_batch(max_frames)
+        except Exception as e:
+            print(f"Error getting result batch: {e}")
+            return None
+
+    def process_offline(
+        self,
+        signal: np.ndarray,
+        block_size: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """
+        Run a recording through the current processing chain (no device)
+
+        Args:
+            signal: Input samples
+            block_size: Samples per chain block (None = live block size)
+            sample_rate: Sample rate of the recording (None = current rate)
+
+        Returns:
+            Dictionary with 'filtered', 'spectrogram' (rows x bins, dB),
+            'frequencies', 'hop' and 'sample_rate', or None
+        """
+        if not self.processor:
+            return None
+
+        signal = np.ascontiguousarray(signal, dtype=np.float64)
+        return self.processor.process_offline(signal, block_size, sample_rate)
+
+    def process_offline_chunks(
+        self,
+        chunks: Iterable[np.ndarray],
+        block_size: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ) -> Iterator[Dict]:
+        """
+        Run an arbitrarily long recording through the chain chunk by chunk
+
+        Filter and analysis state carry over between chunks, so the output
+        matches process_offline on the whole recording.
+
+        Args:
+            chunks: Iterable of sample arrays (e.g. blocks read from a file)
+            block_size: Samples per chain block (None = live block size)
+            sample_rate: Sample rate of the recording (None = current rate)
+
+        Returns:
+            Iterator of dictionaries with 'filtered' and 'spectrogram' per chunk
+        """
+        if not self.processor:
+            return
+
+        offline = self.processor.offline_processor(block_size, sample_rate)
+        for chunk in chunks:
+            yield offline.process(np.ascontiguousarray(chunk, dtype=np.float64))
+
+    def iter_frames(self, timeout: float = 1.0) -> Iterator[Dict]:
+        """
+        Iterate over results frames as they are published (no polling)
+
+        Like frames(), this takes frames from the slot get_results() reads;
+        do not poll at the same time.
+
+        Args:
+            timeout: Seconds to wait for a frame before the iteration ends
+
+        Returns:
+            Iterator of get_results() dictionaries; ends on timeout or stop
+        """
+        if not self.processor:
+            return iter(())
+
+        return self.processor.iter_frames(timeout, self.display_width)
+
+    async def frames(self, timeout: float = 1.0) -> AsyncIterator[Dict]:
+        """
+        Asynchronously iterate over results frames
+
+        Waiting happens in the default executor with the GIL released, so the
+        event loop keeps running; results are read on the loop thread.
+        Closing or cancelling the iteration releases the executor thread
+        right away.
+
+        Frames are taken from the same slot get_results() reads, so this is
+        an alternative to polling (e.g. the GUI timer), not an addition: run
+        only one of the two at a time, or both see gaps.
+
+        Args:
+            timeout: Seconds to wait for a frame before the iteration ends
+        """
+        if not self.processor:
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = self.processor.frame_waiter()
+        seen = waiter.sequence()
+
+        try:
+            while True:
+                sequence = await loop.run_in_executor(None, waiter.wait, seen, timeout)
+                if sequence is None:
+                    return
+                seen = sequence
+
+                results = self.processor.get_results(self.display_width)
+                if results is not None:
+                    yield results
+        finally:
+            waiter.close()
+
     def get_spectrum_data(self) -> Optional[Dict]:
         """
         Get latest spectrum data
@@ -217,12 +540,18 @@ class DSPController:
             if results is None:
                 return None
 
-            # Ensure arrays are proper numpy arrays
-            frequencies = np.array(results['spectrum_frequencies'], dtype=np.float64)
-            magnitude = np.array(results['spectrum_magnitude'], dtype=np.float64)
+            # Frequency axis arrives only when the FFT configuration changes
+            if 'spectrum_frequencies' in results:
+                self._frequencies = np.asarray(results['spectrum_frequencies'], dtype=np.float64)
+                self._spectrum_generation = results['spectrum_generation']
+
+            if self._frequencies is None or results['spectrum_generation'] != self._spectrum_generation:
+                return None
+
+            magnitude = results['spectrum_magnitude']
 
             return {
-                'frequencies': frequencies,
+                'frequencies': self._frequencies,
                 'magnitude': magnitude,
             }
 
@@ -230,6 +559,66 @@ class DSPController:
             print(f"Error getting spectrum: {e}")
             return None
             
+    def get_spectrogram(self, new_only: bool = True) -> Optional[np.ndarray]:
+        """
+        Get waterfall rows from the Rust spectrogram ring
+
+        Args:
+            new_only: Only rows added since the previous call
+
+        Returns:
+            2D array of shape (rows, bins) in dB, oldest row first, or None
+        """
+        if not self.processor:
+            return None
+
+        try:
+            return self.processor.get_spectrogram(new_only)
+        except Exception as e:
+            print(f"Error getting spectrogram: {e}")
+            return None
+
+    def set_waterfall_rendering(self, enabled: bool, colors: Optional[list] = None):
+        """
+        Render waterfall rows to RGBA in Rust (quantized, colormapped)
+
+        Args:
+            enabled: Render each new spectrogram row in the processing thread
+            colors: Optional list of (r, g, b) colormap stops
+        """
+        if not self.processor:
+            return
+
+        try:
+            if colors:
+                self.processor.set_waterfall_colormap(colors)
+            self.processor.set_waterfall_rendering(enabled)
+        except Exception as e:
+            print(f"Error configuring waterfall rendering: {e}")
+
+    def get_waterfall_image(self, new_only: bool = True) -> Optional[np.ndarray]:
+        """
+        Get rendered waterfall rows
+
+        Args:
+            new_only: Only rows rendered since the previous call
+
+        Returns:
+            uint8 array of shape (rows, bins, 4) with RGBA pixels, or None
+        """
+        if not self.processor:
+            return None
+
+        try:
+            return self.processor.get_waterfall_image(new_only)
+        except Exception as e:
+            print(f"Error getting waterfall image: {e}")
+            return None
+
+    def frequencies(self) -> Optional[np.ndarray]:
+        """Get the cached spectrum frequency axis in Hz"""
+        return self._frequencies
+
     def list_devices(self) -> list:
         """List available audio input devices"""
         if not RUST_AVAILABLE or not self.processor:
@@ -14,7 +14,7 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction
 
 from .filter_panel import FilterPanel
-from .spectrum_plot import SpectrumPlot
+from .spectrum_plot import SpectrumPlot, WATERFALL_COLORS
 from .waveform_plot import WaveformPlot
 from ..controllers.dsp_controller import DSPController
 
@@ -35,6 +35,10 @@ class MainWindow(QMainWindow):
         self._setup_ui()
         self._setup_menubar()
         self._setup_statusbar()
+
+        # Waterfall rows are quantized and colormapped in the Rust engine
+        if self.spectrum_plot.engine_rendering:
+            self.dsp_controller.set_waterfall_rendering(True, WATERFALL_COLORS)
         
         # Setup update timer (60 Hz)
         self.update_timer = QTimer()
@@ -108,6 +112,11 @@ class MainWindow(QMainWindow):
         reset_view_action.setShortcut("Ctrl+R")
         reset_view_action.triggered.connect(self._reset_view)
         view_menu.addAction(reset_view_action)
+
+        self.trigger_action = QAction("&Triggered Waveform", self)
+        self.trigger_action.setCheckable(True)
+        self.trigger_action.toggled.connect(self._toggle_trigger)
+        view_menu.addAction(self.trigger_action)
         
         # Help menu
         help_menu = menubar.addMenu("&Help")
@@ -146,6 +155,9 @@ class MainWindow(QMainWindow):
     def _update_plots(self):
         """Update plots with new data (called at 60 Hz)"""
         try:
+            # Waveforms arrive as min/max envelopes at the plot's pixel width
+            self.dsp_controller.set_display_width(self.waveform_plot.display_width())
+
             # Get processed audio data (uses cached results to prevent double-fetch)
             waveform_data = self.dsp_controller.get_waveform_data()
             spectrum_data = self.dsp_controller.get_spectrum_data()
@@ -153,6 +165,10 @@ class MainWindow(QMainWindow):
             # Clear cache after both getters have been called
             self.dsp_controller.clear_cache()
 
+            # Triggered mode: redraw only when a new aligned frame was captured
+            if self.trigger_action.isChecked():
+                waveform_data = self.dsp_controller.get_scope_frame()
+
             if waveform_data is not None:
                 self.waveform_plot.update_plot(waveform_data)
 
@@ -162,9 +178,28 @@ class MainWindow(QMainWindow):
                     spectrum_data['magnitude']
                 )
 
+            # Waterfall rows are kept in Rust; fetch only new rows, and only
+            # while the waterfall is on screen
+            if self.spectrum_plot.is_waterfall_visible():
+                if self.spectrum_plot.engine_rendering:
+                    self.spectrum_plot.update_waterfall_rgba(
+                        self.dsp_controller.get_waterfall_image(new_only=True),
+                        self.dsp_controller.frequencies()
+                    )
+                else:
+                    self.spectrum_plot.update_waterfall(
+                        self.dsp_controller.get_spectrogram(new_only=True),
+                        self.dsp_controller.frequencies()
+                    )
+
         except Exception as e:
             self.statusBar.showMessage(f"Update error: {e}")
             
+    def _toggle_trigger(self, enabled: bool):
+        """Switch the waveform view between free-running and triggered"""
+        self.dsp_controller.set_trigger(enabled)
+        self.statusBar.showMessage("Triggered waveform" if enabled else "Free-running waveform")
+
     def _reset_view(self):
         """Reset plot views"""
         self.waveform_plot.reset_view()
@@ -7,14 +7,28 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
 import numpy as np
 
 
+# Waterfall colormap (hot): black, purple, red, yellow, white
+WATERFALL_COLORS = [
+    (0, 0, 0),
+    (128, 0, 128),
+    (255, 0, 0),
+    (255, 255, 0),
+    (255, 255, 255),
+]
+
 class SpectrumPlot(QWidget):
     """Frequency-domain spectrum display with waterfall"""
     
-    def __init__(self):
+    def __init__(self, engine_rendering: bool = True):
         super().__init__()
         
-        self.waterfall_history = []
+        # Preallocated waterfall image (rows x bins), filled from the Rust ring
         self.max_waterfall_lines = 200
+        self.waterfall_data = None
+        self.waterfall_rows = 0
+
+        # Rows arrive as RGBA from the Rust renderer (no per-frame levels or LUT)
+        self.engine_rendering = engine_rendering
         
         self._setup_ui()
         
@@ -51,16 +65,10 @@ class SpectrumPlot(QWidget):
         self.waterfall_image = pg.ImageItem()
         self.waterfall_widget.addItem(self.waterfall_image)
         
-        # Setup colormap (hot)
-        colors = [
-            (0, 0, 0),      # black
-            (128, 0, 128),  # purple
-            (255, 0, 0),    # red
-            (255, 255, 0),  # yellow
-            (255, 255, 255) # white
-        ]
-        cmap = pg.ColorMap(pos=np.linspace(0, 1, len(colors)), color=colors)
-        self.waterfall_image.setLookupTable(cmap.getLookupTable())
+        # Setup colormap (hot); the Rust renderer applies it itself
+        if not self.engine_rendering:
+            cmap = pg.ColorMap(pos=np.linspace(0, 1, len(WATERFALL_COLORS)), color=WATERFALL_COLORS)
+            self.waterfall_image.setLookupTable(cmap.getLookupTable())
         
         self.tabs.addTab(self.waterfall_widget, "Waterfall (Spectrogram)")
         
@@ -76,35 +84,90 @@ class SpectrumPlot(QWidget):
         """
         # Update magnitude plot
         self.magnitude_curve.setData(frequencies, magnitude)
-        
-        # Update waterfall
-        self.waterfall_history.append(magnitude.copy())
-        
-        # Keep only recent history
-        if len(self.waterfall_history) > self.max_waterfall_lines:
-            self.waterfall_history.pop(0)
-            
-        # Create waterfall image
-        if len(self.waterfall_history) > 1:
-            waterfall_data = np.array(self.waterfall_history)
-            
-            # Normalize for display
-            vmin = np.percentile(waterfall_data, 5)
-            vmax = np.percentile(waterfall_data, 95)
-            waterfall_data = np.clip((waterfall_data - vmin) / (vmax - vmin + 1e-10), 0, 1)
-            
+
+    def is_waterfall_visible(self) -> bool:
+        """Check whether the waterfall tab is shown (skip fetching otherwise)"""
+        return self.tabs.currentWidget() is self.waterfall_widget and self.isVisible()
+
+    def update_waterfall(self, rows, frequencies):
+        """
+        Append new spectrogram rows to the waterfall
+
+        Args:
+            rows: 2D array (new_rows, bins) in dB, oldest first
+            frequencies: Frequency bins in Hz
+        """
+        if rows is None or rows.shape[0] == 0 or frequencies is None:
+            return
+
+        bins = rows.shape[1]
+        if self.waterfall_data is None or self.waterfall_data.shape[1] != bins:
+            # FFT size changed: start a new image
+            self.waterfall_data = np.zeros((self.max_waterfall_lines, bins))
+            self.waterfall_rows = 0
+
+        # Shift the image in place and copy the new rows at the bottom
+        k = min(rows.shape[0], self.max_waterfall_lines)
+        if k < self.max_waterfall_lines:
+            self.waterfall_data[:-k] = self.waterfall_data[k:]
+        self.waterfall_data[-k:] = rows[-k:]
+        self.waterfall_rows = min(self.waterfall_rows + k, self.max_waterfall_lines)
+
+        if self.waterfall_rows > 1:
+            filled = self.waterfall_data[-self.waterfall_rows:]
+
+            # Both display levels from a single percentile pass
+            vmin, vmax = np.percentile(filled, (5, 95))
+
             self.waterfall_image.setImage(
-                waterfall_data.T,
+                filled.T,
                 autoLevels=False,
-                levels=[0, 1]
+                levels=(vmin, vmax + 1e-10)
             )
-            
+
             # Set correct scaling
             self.waterfall_image.setRect(
                 0, 0,
-                frequencies[-1], len(self.waterfall_history)
+                frequencies[-1], self.waterfall_rows
             )
-            
+
+    def update_waterfall_rgba(self, rows, frequencies):
+        """
+        Append rendered RGBA rows to the waterfall
+
+        Args:
+            rows: uint8 array (new_rows, bins, 4) from the Rust renderer, oldest first
+            frequencies: Frequency bins in Hz
+        """
+        if rows is None or rows.shape[0] == 0 or frequencies is None:
+            return
+
+        bins = rows.shape[1]
+        if self.waterfall_data is None or self.waterfall_data.shape[1:] != (bins, 4):
+            # FFT size changed: start a new image
+            self.waterfall_data = np.zeros((self.max_waterfall_lines, bins, 4), dtype=np.uint8)
+            self.waterfall_rows = 0
+
+        # Shift the image in place and copy only the new rows
+        k = min(rows.shape[0], self.max_waterfall_lines)
+        if k < self.max_waterfall_lines:
+            self.waterfall_data[:-k] = self.waterfall_data[k:]
+        self.waterfall_data[-k:] = rows[-k:]
+        self.waterfall_rows = min(self.waterfall_rows + k, self.max_waterfall_lines)
+
+        # Pixels are final: no levels, no lookup table
+        filled = self.waterfall_data[-self.waterfall_rows:]
+        self.waterfall_image.setImage(
+            filled.transpose(1, 0, 2),
+            autoLevels=False
+        )
+
+        # Set correct scaling
+        self.waterfall_image.setRect(
+            0, 0,
+            frequencies[-1], self.waterfall_rows
+        )
+
     def reset_view(self):
         """Reset view to auto-range"""
         self.magnitude_widget.enableAutoRange()
@@ -112,4 +175,5 @@ class SpectrumPlot(QWidget):
         
     def clear_waterfall(self):
         """Clear waterfall history"""
-        self.waterfall_history.clear()
+        self.waterfall_data = None
+        self.waterfall_rows = 0
@@ -56,6 +56,10 @@ class WaveformPlot(QWidget):
         if 'time' in data and 'filtered' in data:
             self.filtered_curve.setData(data['time'], data['filtered'])
             
+    def display_width(self) -> int:
+        """Get the plot area width in pixels (for envelope decimation)"""
+        return int(self.plot_widget.getViewBox().width())
+
     def reset_view(self):
         """Reset view to auto-range"""
         self.plot_widget.enableAutoRange()
@@ -0,0 +1,41 @@
+"""
+Blocking AudioProcessor calls must not lock out other threads
+"""
+
+import threading
+
+import pytest
+
+core = pytest.importorskip("spectral_workbench")
+
+
+def test_get_results_during_design_filter():
+    """get_results keeps working while design_filter runs with the GIL released"""
+    processor = core.AudioProcessor()
+    errors = []
+    designing = threading.Event()
+
+    def poll():
+        designing.wait(timeout=5.0)
+        while designing.is_set():
+            try:
+                processor.get_results()
+            except Exception as e:  # "Already mutably borrowed" before the fix
+                errors.append(e)
+                return
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        designing.set()
+        for _ in range(20):
+            # Narrow transition: long filter, so design takes a while
+            filter_length, _ = processor.design_filter(
+                0.1, 0.3, 0.001, core.WindowType.Blackman, core.FilterType.Bandpass
+            )
+            assert filter_length > 1
+    finally:
+        designing.clear()
+        poller.join(timeout=5.0)
+
+    assert not errors, errors
@@ -75,6 +75,11 @@ impl AudioProducer {
         self.producer.free_len()
     }
     
+    /// Get number of samples waiting to be read
+    pub fn len(&self) -> usize {
+        self.producer.len()
+    }
+    
     /// Get buffer capacity
     pub fn capacity(&self) -> usize {
         self.capacity
@@ -99,6 +104,22 @@ impl AudioConsumer {
         self.consumer.pop_slice(buffer)
     }
     
+    /// Read samples directly into an `f32` output slice
+    /// 
+    /// Converts while popping, so no intermediate buffer is needed
+    /// (allocation-free, safe for use in audio callbacks).
+    /// 
+    /// # Returns
+    /// Number of samples actually written to `output`
+    pub fn read_into_f32(&mut self, output: &mut [f32]) -> usize {
+        let mut read = 0;
+        for (dst, src) in output.iter_mut().zip(self.consumer.pop_iter()) {
+            *dst = src as f32;
+            read += 1;
+        }
+        read
+    }
+    
     /// Read exactly n samples, blocking until available
     /// 
     /// NOTE: This will spin-wait, use only in real-time audio threads
@@ -174,6 +195,21 @@ mod tests {
         assert_eq!(read, written);
     }
     
+    #[test]
+    fn test_ring_buffer_read_into_f32() {
+        let rb = AudioRingBuffer::new(1024);
+        let (mut producer, mut consumer) = rb.split();
+        
+        producer.write(&[0.25, -0.5, 1.0]);
+        
+        // Output larger than available data: only available samples written
+        let mut output = [9.0f32; 5];
+        let read = consumer.read_into_f32(&mut output);
+        assert_eq!(read, 3);
+        assert_eq!(&output[..3], &[0.25, -0.5, 1.0]);
+        assert!(consumer.is_empty());
+    }
+    
     #[test]
     fn test_ring_buffer_underflow() {
         let rb = AudioRingBuffer::new(1024);
@@ -0,0 +1,566 @@
+//! Filter chain with lock-free hot swap and crossfading
+//!
+//! The control thread builds replacement filters and publishes them through
+//! an atomic pointer slot (RCU style). The processing thread picks them up at
+//! a block boundary and crossfades the outgoing and incoming outputs, so
+//! filter redesigns and preset switches do not click.
+
+use crate::filters::{FirFilter, BlockFirFilter, FastFirFilter, PartitionedFirFilter};
+use crate::audio::gate::NoiseGate;
+use std::ptr;
+use std::sync::atomic::{AtomicPtr, AtomicUsize, Ordering};
+
+/// Number of stages in the chain ([0] = noise gate, [1] = user filter)
+pub const CHAIN_STAGES: usize = 2;
+
+/// Chain position of the noise gate
+pub const GATE_STAGE: usize = 0;
+
+/// Chain position of the user filter
+pub const USER_FILTER_STAGE: usize = 1;
+
+/// Retired values a slot holds until the control thread frees them
+pub const RETIRE_CAPACITY: usize = 4;
+
+/// Default crossfade length when a stage is replaced (~21 ms at 48 kHz)
+pub const DEFAULT_CROSSFADE_SAMPLES: usize = 1024;
+
+/// Trait for polymorphic filter types with zero-allocation in-place processing
+pub trait FilterTrait {
+    /// Process block in-place (zero allocations)
+    fn process_block_inplace(&mut self, buffer: &mut [f64]);
+    #[allow(dead_code)]
+    fn reset(&mut self);
+
+    /// Output delay in samples on top of the filter's own group delay
+    fn latency(&self) -> usize {
+        0
+    }
+}
+
+impl FilterTrait for FirFilter {
+    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        FirFilter::process_block_inplace(self, buffer)
+    }
+
+    fn reset(&mut self) {
+        FirFilter::reset(self)
+    }
+}
+
+impl FilterTrait for BlockFirFilter {
+    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        BlockFirFilter::process_block_inplace(self, buffer)
+    }
+
+    fn reset(&mut self) {
+        BlockFirFilter::reset(self)
+    }
+}
+
+impl FilterTrait for FastFirFilter {
+    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        FastFirFilter::process_block_inplace(self, buffer)
+    }
+
+    fn reset(&mut self) {
+        FastFirFilter::reset(self)
+    }
+}
+
+impl FilterTrait for PartitionedFirFilter {
+    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        PartitionedFirFilter::process_block_inplace(self, buffer)
+    }
+
+    fn reset(&mut self) {
+        PartitionedFirFilter::reset(self)
+    }
+
+    fn latency(&self) -> usize {
+        PartitionedFirFilter::latency(self)
+    }
+}
+
+impl FilterTrait for NoiseGate {
+    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        NoiseGate::process_block_inplace(self, buffer)
+    }
+
+    fn reset(&mut self) {
+        NoiseGate::reset(self)
+    }
+}
+
+/// Contents of one chain stage (None = pass-through)
+pub type Stage = Option<Box<dyn FilterTrait + Send>>;
+
+/// Single-value RCU mailbox between the control and processing threads
+///
+/// The control thread `publish`es boxed values; the processing thread `take`s
+/// them without locking and hands replaced values back through `retire`, so
+/// that deallocation happens on the control thread rather than the audio path.
+/// The processing thread never frees: when the retire list is full, `retire`
+/// refuses and the caller keeps the value until a later block.
+pub struct SwapSlot<T> {
+    /// Newest published value not yet picked up (null if none)
+    pending: AtomicPtr<T>,
+
+    /// Values released by the processing thread, waiting to be freed
+    retired: [AtomicPtr<T>; RETIRE_CAPACITY],
+}
+
+// Values are moved between threads, never shared
+unsafe impl<T: Send> Send for SwapSlot<T> {}
+unsafe impl<T: Send> Sync for SwapSlot<T> {}
+
+impl<T> SwapSlot<T> {
+    /// Create empty slot
+    pub fn new() -> Self {
+        Self {
+            pending: AtomicPtr::new(ptr::null_mut()),
+            retired: std::array::from_fn(|_| AtomicPtr::new(ptr::null_mut())),
+        }
+    }
+
+    /// Publish a new value (control thread)
+    ///
+    /// A previously published value that was never picked up is replaced and
+    /// freed here, as is any value retired by the processing thread.
+    pub fn publish(&self, value: Box<T>) {
+        self.collect_retired();
+
+        let previous = self.pending.swap(Box::into_raw(value), Ordering::AcqRel);
+        if !previous.is_null() {
+            drop(unsafe { Box::from_raw(previous) });
+        }
+    }
+
+    /// Take the pending value, if any (processing thread, wait-free)
+    pub fn take(&self) -> Option<Box<T>> {
+        let value = self.pending.swap(ptr::null_mut(), Ordering::AcqRel);
+        if value.is_null() {
+            None
+        } else {
+            Some(unsafe { Box::from_raw(value) })
+        }
+    }
+
+    /// Hand a replaced value back for deallocation (processing thread, wait-free)
+    ///
+    /// # Returns
+    /// The value itself if the retire list is full; the caller keeps it and
+    /// retries later, so nothing is ever freed on the processing thread
+    pub fn retire(&self, value: Box<T>) -> Result<(), Box<T>> {
+        let raw = Box::into_raw(value);
+        for entry in &self.retired {
+            // Only the processing thread fills entries, so a null entry stays
+            // ours until this exchange
+            if entry
+                .compare_exchange(ptr::null_mut(), raw, Ordering::AcqRel, Ordering::Relaxed)
+                .is_ok()
+            {
+                return Ok(());
+            }
+        }
+        Err(unsafe { Box::from_raw(raw) })
+    }
+
+    /// Number of values `retire` is guaranteed to accept (processing thread)
+    pub fn retire_vacancies(&self) -> usize {
+        self.retired
+            .iter()
+            .filter(|entry| entry.load(Ordering::Acquire).is_null())
+            .count()
+    }
+
+    /// Free all retired values (control thread)
+    pub fn collect_retired(&self) {
+        for entry in &self.retired {
+            let retired = entry.swap(ptr::null_mut(), Ordering::AcqRel);
+            if !retired.is_null() {
+                drop(unsafe { Box::from_raw(retired) });
+            }
+        }
+    }
+}
+
+impl<T> Default for SwapSlot<T> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<T> Drop for SwapSlot<T> {
+    fn drop(&mut self) {
+        self.collect_retired();
+        drop(self.take());
+    }
+}
+
+/// Control side of the filter chain (shared with the processing thread)
+pub struct FilterChainControl {
+    slots: [SwapSlot<Stage>; CHAIN_STAGES],
+    crossfade_samples: AtomicUsize,
+}
+
+impl FilterChainControl {
+    /// Create control block with empty slots
+    pub fn new() -> Self {
+        Self {
+            slots: [SwapSlot::new(), SwapSlot::new()],
+            crossfade_samples: AtomicUsize::new(DEFAULT_CROSSFADE_SAMPLES),
+        }
+    }
+
+    /// Replace a stage; takes effect at the next block boundary
+    ///
+    /// # Arguments
+    /// * `stage` - Chain position (`GATE_STAGE` or `USER_FILTER_STAGE`)
+    /// * `filter` - New stage contents (None removes the stage)
+    pub fn publish(&self, stage: usize, filter: Stage) {
+        self.slots[stage].publish(Box::new(filter));
+    }
+
+    /// Free stages retired by the processing thread (control thread)
+    ///
+    /// Also done on every `publish`; call periodically and on stop so
+    /// replaced filters do not linger until the next swap.
+    pub fn collect_retired(&self) {
+        for slot in &self.slots {
+            slot.collect_retired();
+        }
+    }
+
+    /// Set crossfade length used for subsequent swaps (0 = hard switch)
+    pub fn set_crossfade_samples(&self, samples: usize) {
+        self.crossfade_samples.store(samples, Ordering::Relaxed);
+    }
+
+    /// Get crossfade length in samples
+    pub fn crossfade_samples(&self) -> usize {
+        self.crossfade_samples.load(Ordering::Relaxed)
+    }
+}
+
+impl Default for FilterChainControl {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+/// Processing-thread state of one chain stage
+struct StageRunner {
+    /// Stage currently producing output
+    active: Box<Stage>,
+
+    /// Replaced stage still fading out
+    outgoing: Option<Box<Stage>>,
+
+    /// Samples of the current crossfade already rendered
+    fade_pos: usize,
+
+    /// Total crossfade length
+    fade_len: usize,
+
+    /// Finished stage the retire list had no room for (handed off later)
+    held: Option<Box<Stage>>,
+}
+
+/// Apply a stage to a buffer (None = pass-through)
+#[inline]
+fn run_stage(stage: &mut Stage, buffer: &mut [f64]) {
+    if let Some(filter) = stage.as_mut() {
+        filter.process_block_inplace(buffer);
+    }
+}
+
+/// Output delay of a stage (pass-through = 0)
+#[inline]
+fn stage_latency(stage: &Stage) -> usize {
+    stage.as_ref().map_or(0, |filter| filter.latency())
+}
+
+/// Filter chain owned by the processing thread
+///
+/// Applies the stages in order, picking up replacements published through
+/// `FilterChainControl` at block boundaries. Never locks and never allocates
+/// while processing.
+pub struct FilterChain {
+    stages: Vec<StageRunner>,
+
+    /// Scratch buffer for the outgoing stage during a crossfade
+    scratch: Vec<f64>,
+}
+
+impl FilterChain {
+    /// Create empty (pass-through) chain
+    ///
+    /// # Arguments
+    /// * `max_block` - Largest block processed without chunking
+    pub fn new(max_block: usize) -> Self {
+        let stages = (0..CHAIN_STAGES)
+            .map(|_| StageRunner {
+                active: Box::new(None),
+                outgoing: None,
+                fade_pos: 0,
+                fade_len: 0,
+                held: None,
+            })
+            .collect();
+
+        Self {
+            stages,
+            scratch: vec![0.0; max_block.max(1)],
+        }
+    }
+
+    /// Process block in-place through every stage
+    pub fn process_block_inplace(&mut self, control: &FilterChainControl, buffer: &mut [f64]) {
+        for (index, runner) in self.stages.iter_mut().enumerate() {
+            let slot = &control.slots[index];
+
+            // Retry handing off a stage the retire list had no room for
+            if let Some(held) = runner.held.take() {
+                runner.held = slot.retire(held).err();
+            }
+
+            // Pick up a replacement at the block boundary, but only when both
+            // stages it can displace are sure to fit in the retire list;
+            // otherwise it stays pending until the control thread collects
+            if runner.held.is_none() && slot.retire_vacancies() >= 2 {
+                if let Some(incoming) = slot.take() {
+                    if let Some(previous) = runner.outgoing.take() {
+                        // Swapped again mid-fade: retire the oldest stage immediately
+                        runner.held = slot.retire(previous).err();
+                    }
+
+                    let replaced = std::mem::replace(&mut runner.active, incoming);
+
+                    // Outputs offset in time would comb-filter while mixed,
+                    // so a swap that changes the stage latency switches hard
+                    let fade_len = if stage_latency(&replaced) == stage_latency(&runner.active) {
+                        control.crossfade_samples()
+                    } else {
+                        0
+                    };
+
+                    if fade_len == 0 {
+                        if let Err(replaced) = slot.retire(replaced) {
+                            runner.held = Some(replaced);
+                        }
+                    } else {
+                        runner.outgoing = Some(replaced);
+                        runner.fade_pos = 0;
+                        runner.fade_len = fade_len;
+                    }
+                }
+            }
+
+            match runner.outgoing.as_mut() {
+                None => run_stage(&mut runner.active, buffer),
+                Some(outgoing) => {
+                    for chunk in buffer.chunks_mut(self.scratch.len()) {
+                        let scratch = &mut self.scratch[..chunk.len()];
+                        scratch.copy_from_slice(chunk);
+
+                        run_stage(outgoing, scratch);
+                        run_stage(&mut runner.active, chunk);
+
+                        // Linear crossfade: both stages see the same input, so
+                        // their outputs are correlated and amplitudes add
+                        let fade_len = runner.fade_len as f64;
+                        for (out, &old) in chunk.iter_mut().zip(scratch.iter()) {
+                            let gain = if runner.fade_pos < runner.fade_len {
+                                runner.fade_pos as f64 / fade_len
+                            } else {
+                                1.0
+                            };
+                            *out = old + gain * (*out - old);
+                            runner.fade_pos += 1;
+                        }
+                    }
+
+                    if runner.fade_pos >= runner.fade_len {
+                        if let Some(finished) = runner.outgoing.take() {
+                            runner.held = slot.retire(finished).err();
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    /// Check whether any stage is currently crossfading
+    pub fn is_crossfading(&self) -> bool {
+        self.stages.iter().any(|runner| runner.outgoing.is_some())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Constant gain stage for testing
+    struct Gain(f64);
+
+    impl FilterTrait for Gain {
+        fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+            for sample in buffer.iter_mut() {
+                *sample *= self.0;
+            }
+        }
+
+        fn reset(&mut self) {}
+    }
+
+    /// Gain stage with a reported block delay
+    struct DelayedGain(f64, usize);
+
+    impl FilterTrait for DelayedGain {
+        fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+            for sample in buffer.iter_mut() {
+                *sample *= self.0;
+            }
+        }
+
+        fn reset(&mut self) {}
+
+        fn latency(&self) -> usize {
+            self.1
+        }
+    }
+
+    #[test]
+    fn test_swap_slot_publish_take() {
+        let slot = SwapSlot::new();
+        assert!(slot.take().is_none());
+
+        slot.publish(Box::new(1));
+        slot.publish(Box::new(2));
+
+        // Only the newest unpicked value is delivered
+        assert_eq!(slot.take().map(|v| *v), Some(2));
+        assert!(slot.take().is_none());
+    }
+
+    #[test]
+    fn test_swap_slot_retire_refuses_when_full() {
+        let slot = SwapSlot::new();
+        for value in 0..RETIRE_CAPACITY {
+            assert!(slot.retire(Box::new(value)).is_ok());
+        }
+        assert_eq!(slot.retire_vacancies(), 0);
+
+        // Full: the value comes back instead of being freed here
+        assert_eq!(slot.retire(Box::new(99)).map_err(|v| *v), Err(99));
+
+        slot.collect_retired();
+        assert_eq!(slot.retire_vacancies(), RETIRE_CAPACITY);
+    }
+
+    #[test]
+    fn test_chain_defers_swaps_until_retirees_collected() {
+        let control = FilterChainControl::new();
+        control.set_crossfade_samples(0);
+        let mut chain = FilterChain::new(8);
+        let mut buffer = vec![1.0; 8];
+
+        // Fill the retire list without letting the control side collect
+        // (publish would collect them, so the new stage is placed directly)
+        let slot = &control.slots[USER_FILTER_STAGE];
+        for gain in 0..RETIRE_CAPACITY {
+            assert!(slot.retire(Box::new(Some(Box::new(Gain(gain as f64))))).is_ok());
+        }
+        let incoming: Box<Stage> = Box::new(Some(Box::new(Gain(3.0))));
+        slot.pending.store(Box::into_raw(incoming), Ordering::Release);
+
+        // No room to retire the replaced stage: the swap waits
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(buffer.iter().all(|&x| x == 1.0));
+
+        control.collect_retired();
+        buffer.fill(1.0);
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(buffer.iter().all(|&x| (x - 3.0).abs() < 1e-12));
+    }
+
+    #[test]
+    fn test_chain_passthrough() {
+        let control = FilterChainControl::new();
+        let mut chain = FilterChain::new(64);
+
+        let mut buffer = vec![0.5; 64];
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(buffer.iter().all(|&x| x == 0.5));
+    }
+
+    #[test]
+    fn test_chain_hard_switch() {
+        let control = FilterChainControl::new();
+        control.set_crossfade_samples(0);
+        let mut chain = FilterChain::new(64);
+
+        control.publish(USER_FILTER_STAGE, Some(Box::new(Gain(2.0))));
+
+        let mut buffer = vec![1.0; 64];
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(buffer.iter().all(|&x| (x - 2.0).abs() < 1e-12));
+        assert!(!chain.is_crossfading());
+    }
+
+    #[test]
+    fn test_chain_crossfade_is_smooth() {
+        let control = FilterChainControl::new();
+        control.set_crossfade_samples(0);
+        let mut chain = FilterChain::new(32);
+
+        control.publish(USER_FILTER_STAGE, Some(Box::new(Gain(1.0))));
+        let mut buffer = vec![1.0; 32];
+        chain.process_block_inplace(&control, &mut buffer);
+
+        // Swap to a muting stage with a 100-sample crossfade
+        control.set_crossfade_samples(100);
+        control.publish(USER_FILTER_STAGE, Some(Box::new(Gain(0.0))));
+
+        let mut output = Vec::new();
+        for _ in 0..5 {
+            let mut buffer = vec![1.0; 32];
+            chain.process_block_inplace(&control, &mut buffer);
+            output.extend_from_slice(&buffer);
+        }
+
+        // Output ramps down without jumps and ends fully switched
+        assert!((output[0] - 1.0).abs() < 1e-12);
+        for pair in output.windows(2) {
+            assert!(pair[1] <= pair[0]);
+            assert!(pair[0] - pair[1] <= 0.01 + 1e-12);
+        }
+        assert!(output[100..].iter().all(|&x| x.abs() < 1e-12));
+        assert!(!chain.is_crossfading());
+    }
+
+    #[test]
+    fn test_chain_skips_crossfade_when_latency_changes() {
+        let control = FilterChainControl::new();
+        control.set_crossfade_samples(0);
+        let mut chain = FilterChain::new(32);
+
+        control.publish(USER_FILTER_STAGE, Some(Box::new(Gain(1.0))));
+        let mut buffer = vec![1.0; 32];
+        chain.process_block_inplace(&control, &mut buffer);
+
+        // Same latency: crossfades as configured
+        control.set_crossfade_samples(100);
+        control.publish(USER_FILTER_STAGE, Some(Box::new(Gain(0.5))));
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(chain.is_crossfading());
+
+        // Different latency: switches at the block boundary
+        control.publish(USER_FILTER_STAGE, Some(Box::new(DelayedGain(2.0, 256))));
+        let mut buffer = vec![1.0; 32];
+        chain.process_block_inplace(&control, &mut buffer);
+        assert!(!chain.is_crossfading());
+        assert!(buffer.iter().all(|&x| (x - 2.0).abs() < 1e-12));
+    }
+}
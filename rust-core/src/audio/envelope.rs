@@ -0,0 +1,87 @@
+//! Min/max envelope decimation of waveforms for display
+//!
+//! A plot can only show one vertical line per pixel column, so drawing
+//! thousands of samples into a few hundred columns wastes transfer and
+//! rendering time. Keeping the minimum and maximum of each column's samples
+//! preserves peaks and the visual envelope exactly.
+
+/// Number of columns an envelope of `samples` samples will have
+///
+/// # Arguments
+/// * `samples` - Waveform length
+/// * `width` - Requested display width in columns
+pub fn envelope_columns(samples: usize, width: usize) -> usize {
+    width.min(samples)
+}
+
+/// Decimate a waveform into interleaved (min, max) pairs per column
+///
+/// Column `c` covers samples `c * n / columns .. (c + 1) * n / columns`, so
+/// every sample belongs to exactly one column.
+///
+/// # Arguments
+/// * `samples` - Waveform
+/// * `width` - Requested display width in columns
+/// * `out` - Destination of at least `2 * envelope_columns(samples.len(), width)` values
+///
+/// # Returns
+/// Number of columns written (`out[2c]` = min, `out[2c + 1]` = max)
+pub fn min_max_envelope_into(samples: &[f64], width: usize, out: &mut [f64]) -> usize {
+    let n = samples.len();
+    let columns = envelope_columns(n, width).min(out.len() / 2);
+
+    for (c, pair) in out[..2 * columns].chunks_exact_mut(2).enumerate() {
+        let start = c * n / columns;
+        let end = (c + 1) * n / columns;
+
+        let (min, max) = samples[start..end]
+            .iter()
+            .fold((f64::INFINITY, f64::NEG_INFINITY), |(lo, hi), &x| (lo.min(x), hi.max(x)));
+        pair[0] = min;
+        pair[1] = max;
+    }
+
+    columns
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_envelope_keeps_extremes() {
+        let samples: Vec<f64> = (0..1000).map(|i| ((i as f64) * 0.37).sin()).collect();
+        let mut out = vec![0.0; 200];
+        let columns = min_max_envelope_into(&samples, 100, &mut out);
+        assert_eq!(columns, 100);
+
+        for c in 0..columns {
+            let chunk = &samples[c * 10..(c + 1) * 10];
+            assert_eq!(out[2 * c], chunk.iter().cloned().fold(f64::INFINITY, f64::min));
+            assert_eq!(out[2 * c + 1], chunk.iter().cloned().fold(f64::NEG_INFINITY, f64::max));
+        }
+    }
+
+    #[test]
+    fn test_envelope_uneven_columns_cover_all_samples() {
+        // A single spike must survive wherever it falls
+        for spike in [0, 499, 1022] {
+            let mut samples = vec![0.0; 1023];
+            samples[spike] = 1.0;
+
+            let mut out = vec![0.0; 2 * 7];
+            let columns = min_max_envelope_into(&samples, 7, &mut out);
+            assert_eq!(columns, 7);
+            assert_eq!(out.iter().filter(|&&v| v == 1.0).count(), 1);
+        }
+    }
+
+    #[test]
+    fn test_envelope_wider_than_waveform() {
+        let samples = [1.0, -2.0, 3.0];
+        let mut out = vec![0.0; 20];
+        assert_eq!(min_max_envelope_into(&samples, 10, &mut out), 3);
+        assert_eq!(&out[..6], &[1.0, 1.0, -2.0, -2.0, 3.0, 3.0]);
+        assert_eq!(min_max_envelope_into(&[], 10, &mut out), 0);
+    }
+}
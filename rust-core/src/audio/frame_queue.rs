@@ -0,0 +1,189 @@
+//! Bounded single-producer single-consumer queue of pre-allocated frames
+//!
+//! Unlike the triple buffer, which only keeps the newest frame, the queue
+//! keeps every frame until the reader consumes it. Slots are allocated once;
+//! the writer fills a slot in place and commits it with one atomic store.
+//! When the reader falls behind and the queue is full, new frames are
+//! dropped and counted instead of blocking the processing thread.
+
+use std::cell::UnsafeCell;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicU64, AtomicUsize, Ordering};
+
+/// Storage shared by the writer and reader ends
+struct Shared<T> {
+    slots: Box<[UnsafeCell<T>]>,
+
+    /// Frames consumed (reader position, wrapping)
+    head: AtomicUsize,
+
+    /// Frames committed (writer position, wrapping)
+    tail: AtomicUsize,
+
+    /// Frames dropped because the queue was full
+    dropped: AtomicU64,
+}
+
+// Slots between head and tail belong to the reader, all others to the
+// writer; ownership moves through `head`/`tail` with acquire/release.
+unsafe impl<T: Send> Sync for Shared<T> {}
+
+/// Bounded queue holding `capacity` pre-allocated instances of `T`
+pub struct FrameQueue<T> {
+    shared: Arc<Shared<T>>,
+}
+
+impl<T: Clone> FrameQueue<T> {
+    /// Create new queue with every slot initialised to `initial`
+    ///
+    /// # Arguments
+    /// * `initial` - Slot template (cloned `capacity` times)
+    /// * `capacity` - Maximum number of pending frames (at least 1)
+    pub fn new(initial: T, capacity: usize) -> Self {
+        let slots = (0..capacity.max(1))
+            .map(|_| UnsafeCell::new(initial.clone()))
+            .collect();
+
+        Self {
+            shared: Arc::new(Shared {
+                slots,
+                head: AtomicUsize::new(0),
+                tail: AtomicUsize::new(0),
+                dropped: AtomicU64::new(0),
+            }),
+        }
+    }
+}
+
+impl<T> FrameQueue<T> {
+    /// Split into writer and reader ends
+    pub fn split(self) -> (FrameQueueInput<T>, FrameQueueOutput<T>) {
+        (
+            FrameQueueInput {
+                shared: Arc::clone(&self.shared),
+            },
+            FrameQueueOutput { shared: self.shared },
+        )
+    }
+}
+
+/// Writer end of a frame queue (owned by the processing thread)
+pub struct FrameQueueInput<T> {
+    shared: Arc<Shared<T>>,
+}
+
+impl<T> FrameQueueInput<T> {
+    /// Fill the next free slot in place and commit it (wait-free)
+    ///
+    /// The slot holds a stale frame, so `fill` must rewrite every field the
+    /// reader relies on.
+    ///
+    /// # Returns
+    /// False if the queue was full and the frame was dropped
+    pub fn push_with<F: FnOnce(&mut T)>(&mut self, fill: F) -> bool {
+        let capacity = self.shared.slots.len();
+        let tail = self.shared.tail.load(Ordering::Relaxed);
+        let head = self.shared.head.load(Ordering::Acquire);
+
+        if tail.wrapping_sub(head) >= capacity {
+            self.shared.dropped.fetch_add(1, Ordering::Relaxed);
+            return false;
+        }
+
+        fill(unsafe { &mut *self.shared.slots[tail % capacity].get() });
+        self.shared.tail.store(tail.wrapping_add(1), Ordering::Release);
+        true
+    }
+}
+
+/// Reader end of a frame queue
+pub struct FrameQueueOutput<T> {
+    shared: Arc<Shared<T>>,
+}
+
+impl<T> FrameQueueOutput<T> {
+    /// Number of committed frames not yet consumed
+    pub fn pending(&self) -> usize {
+        let head = self.shared.head.load(Ordering::Relaxed);
+        self.shared.tail.load(Ordering::Acquire).wrapping_sub(head)
+    }
+
+    /// Get a pending frame without consuming it
+    ///
+    /// # Arguments
+    /// * `index` - 0 = oldest; must be below a value `pending()` returned
+    pub fn get(&self, index: usize) -> &T {
+        let head = self.shared.head.load(Ordering::Relaxed);
+        assert!(index < self.pending(), "frame index out of range");
+        let slot = head.wrapping_add(index) % self.shared.slots.len();
+        unsafe { &*self.shared.slots[slot].get() }
+    }
+
+    /// Release the `count` oldest frames back to the writer
+    pub fn consume(&mut self, count: usize) {
+        let count = count.min(self.pending());
+        let head = self.shared.head.load(Ordering::Relaxed);
+        self.shared.head.store(head.wrapping_add(count), Ordering::Release);
+    }
+
+    /// Total frames dropped because the queue was full
+    pub fn dropped(&self) -> u64 {
+        self.shared.dropped.load(Ordering::Relaxed)
+    }
+
+    /// Maximum number of pending frames
+    pub fn capacity(&self) -> usize {
+        self.shared.slots.len()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_frame_queue_fifo_and_drop_count() {
+        let (mut input, mut output) = FrameQueue::new(0u32, 3).split();
+
+        for value in 1..=5 {
+            input.push_with(|slot| *slot = value);
+        }
+
+        // Oldest frames kept, overflow counted
+        assert_eq!(output.pending(), 3);
+        assert_eq!(output.dropped(), 2);
+        assert_eq!((*output.get(0), *output.get(2)), (1, 3));
+
+        output.consume(2);
+        assert_eq!(output.pending(), 1);
+        assert!(input.push_with(|slot| *slot = 6));
+        assert_eq!((*output.get(0), *output.get(1)), (3, 6));
+    }
+
+    #[test]
+    fn test_frame_queue_concurrent() {
+        let (mut input, mut output) = FrameQueue::new([0u64; 64], 8).split();
+
+        let writer = std::thread::spawn(move || {
+            for value in 1..=5_000u64 {
+                while !input.push_with(|slot| slot.fill(value)) {
+                    std::thread::yield_now();
+                }
+            }
+        });
+
+        // Every frame arrives, complete and in order
+        let mut expected = 1;
+        while expected <= 5_000 {
+            let pending = output.pending();
+            for i in 0..pending {
+                let frame = output.get(i);
+                assert!(frame.iter().all(|&v| v == expected));
+                expected += 1;
+            }
+            output.consume(pending);
+        }
+
+        writer.join().unwrap();
+    }
+}
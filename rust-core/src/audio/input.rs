@@ -6,13 +6,17 @@
 use cpal::traits::{DeviceTrait, HostTrait, StreamTrait};
 use cpal::{Device, Stream, StreamConfig};
 use super::buffer::AudioProducer;
+use super::notify::BlockNotifier;
 use rubato::{FftFixedIn, Resampler};
-use std::sync::{Arc, Mutex};
+use std::sync::Arc;
 use thiserror::Error;
 
 /// Target sample rate for internal processing
 pub const TARGET_SAMPLE_RATE: u32 = 48000;
 
+/// Scratch buffer size for f32 -> f64 conversion in the capture callback
+const CALLBACK_SCRATCH_SIZE: usize = 1024;
+
 #[derive(Error, Debug)]
 pub enum AudioError {
     #[error("No audio input device found")]
@@ -33,6 +37,9 @@ pub enum AudioError {
     #[error("Failed to create resampler: {0}")]
     ResamplerError(String),
 
+    #[error("Audio stream thread failed: {0}")]
+    StreamThread(String),
+
     #[error("Output device does not support 48000 Hz (found: {0} Hz). Audio monitoring requires 48 kHz output device.")]
     UnsupportedSampleRate(u32),
 }
@@ -56,20 +63,28 @@ impl AudioInput {
     ///
     /// # Arguments
     /// * `producer` - Ring buffer producer for captured audio
+    /// * `notifier` - Optional notifier woken when enough samples are buffered
     ///
     /// # Returns
     /// Audio input stream and device info
-    pub fn from_default_device(producer: AudioProducer) -> Result<Self, AudioError> {
+    pub fn from_default_device(
+        producer: AudioProducer,
+        notifier: Option<Arc<BlockNotifier>>,
+    ) -> Result<Self, AudioError> {
         let host = cpal::default_host();
         let device = host
             .default_input_device()
             .ok_or(AudioError::NoDevice)?;
 
-        Self::from_device(device, producer)
+        Self::from_device(device, producer, notifier)
     }
 
     /// Create audio input from specific device
-    pub fn from_device(device: Device, producer: AudioProducer) -> Result<Self, AudioError> {
+    pub fn from_device(
+        device: Device,
+        producer: AudioProducer,
+        notifier: Option<Arc<BlockNotifier>>,
+    ) -> Result<Self, AudioError> {
         let name = device
             .name()
             .map_err(|e| AudioError::DeviceName(e.to_string()))?;
@@ -90,8 +105,9 @@ impl AudioInput {
 
         let stream_config: StreamConfig = config.into();
 
-        // Wrap producer in Arc<Mutex> for thread-safe access
-        let producer = Arc::new(Mutex::new(producer));
+        // The callback is the sole owner of the producer, resampler and scratch
+        // buffers: no locks and no heap allocation on the audio thread
+        let mut producer = producer;
 
         // Create resampler if device rate differs from target
         let needs_resampling = device_sample_rate != TARGET_SAMPLE_RATE;
@@ -105,7 +121,7 @@ impl AudioInput {
             // Create FFT-based resampler (high quality, handles any ratio)
             // chunk_size is the input block size
             let chunk_size = 1024;
-            let resampler = FftFixedIn::<f64>::new(
+            let mut resampler = FftFixedIn::<f64>::new(
                 device_sample_rate as usize,
                 TARGET_SAMPLE_RATE as usize,
                 chunk_size,
@@ -114,41 +130,49 @@ impl AudioInput {
             )
             .map_err(|e| AudioError::ResamplerError(e.to_string()))?;
 
-            let resampler = Arc::new(Mutex::new(resampler));
-            let input_buffer: Arc<Mutex<Vec<f64>>> = Arc::new(Mutex::new(Vec::with_capacity(chunk_size * 2)));
+            // Pre-sized scratch buffers (allocated once, here)
+            let mut pending = vec![0.0; resampler.input_frames_max()];
+            let mut pending_len = 0;
+            let mut resampled = [vec![0.0; resampler.output_frames_max()]];
 
             // Build audio input stream with resampling
-            let producer_clone = Arc::clone(&producer);
-            let resampler_clone = Arc::clone(&resampler);
-            let input_buffer_clone = Arc::clone(&input_buffer);
-
             let stream = device
                 .build_input_stream(
                     &stream_config,
                     move |data: &[f32], _: &cpal::InputCallbackInfo| {
-                        // Convert f32 to f64 and accumulate in input buffer
-                        if let Ok(mut buffer) = input_buffer_clone.lock() {
-                            buffer.extend(data.iter().map(|&s| s as f64));
-
-                            // Process when we have enough samples
-                            if let Ok(mut resampler) = resampler_clone.lock() {
-                                let input_frames_needed = resampler.input_frames_next();
-
-                                while buffer.len() >= input_frames_needed {
-                                    // Extract input chunk
-                                    let input_chunk: Vec<f64> = buffer.drain(..input_frames_needed).collect();
-
-                                    // Resample (single channel)
-                                    if let Ok(output) = resampler.process(&[input_chunk], None) {
-                                        if !output.is_empty() && !output[0].is_empty() {
-                                            if let Ok(mut prod) = producer_clone.lock() {
-                                                prod.write(&output[0]);
-                                            }
-                                        }
-                                    }
+                        let mut remaining = data;
+
+                        while !remaining.is_empty() {
+                            // Convert f32 to f64 and accumulate one resampler chunk
+                            let needed = resampler.input_frames_next();
+                            let take = (needed - pending_len).min(remaining.len());
+
+                            for (dst, &src) in pending[pending_len..pending_len + take]
+                                .iter_mut()
+                                .zip(&remaining[..take])
+                            {
+                                *dst = src as f64;
+                            }
+                            pending_len += take;
+                            remaining = &remaining[take..];
+
+                            // Resample (single channel) into the pre-allocated output
+                            if pending_len == needed {
+                                if let Ok((_, frames)) = resampler.process_into_buffer(
+                                    &[&pending[..needed]],
+                                    &mut resampled[..],
+                                    None,
+                                ) {
+                                    producer.write(&resampled[0][..frames]);
                                 }
+                                pending_len = 0;
                             }
                         }
+
+                        // Wake the processing thread if a block is ready
+                        if let Some(notifier) = &notifier {
+                            notifier.notify(producer.len());
+                        }
                     },
                     move |err| {
                         eprintln!("Audio input error: {}", err);
@@ -159,18 +183,25 @@ impl AudioInput {
 
             Ok(Self { stream, device_info })
         } else {
-            // No resampling needed - direct passthrough
-            let producer_clone = Arc::clone(&producer);
+            // No resampling needed - direct passthrough via a pre-sized scratch buffer
+            let mut scratch = vec![0.0; CALLBACK_SCRATCH_SIZE];
 
             let stream = device
                 .build_input_stream(
                     &stream_config,
                     move |data: &[f32], _: &cpal::InputCallbackInfo| {
                         // Convert f32 samples to f64 and write to ring buffer
-                        let samples: Vec<f64> = data.iter().map(|&s| s as f64).collect();
+                        for chunk in data.chunks(scratch.len()) {
+                            let samples = &mut scratch[..chunk.len()];
+                            for (dst, &src) in samples.iter_mut().zip(chunk) {
+                                *dst = src as f64;
+                            }
+                            producer.write(samples);
+                        }
 
-                        if let Ok(mut prod) = producer_clone.lock() {
-                            prod.write(&samples);
+                        // Wake the processing thread if a block is ready
+                        if let Some(notifier) = &notifier {
+                            notifier.notify(producer.len());
                         }
                     },
                     move |err| {
@@ -5,8 +5,17 @@ pub mod output;
 pub mod buffer;
 pub mod processor;
 pub mod gate;
+pub mod triple_buffer;
+pub mod frame_queue;
+pub mod stream_host;
+pub mod chain;
+pub mod notify;
+pub mod envelope;
+pub mod trigger;
+pub mod offline;
 
 pub use input::AudioInput;
 pub use output::AudioOutput;
 pub use buffer::AudioRingBuffer;
 pub use processor::AudioProcessor;
+pub use triple_buffer::TripleBuffer;
@@ -0,0 +1,343 @@
+//! Block-ready notification from the capture callback to the processing thread
+//!
+//! Replaces sleep polling: the processing thread parks until the input
+//! callback reports that at least `min_fill` samples are waiting in the ring
+//! buffer. Signalling uses thread park/unpark (futex / WaitOnAddress based),
+//! which never blocks or allocates in the audio callback.
+//!
+//! `FrameSignal` does the same in the other direction: consumers block until
+//! the processing thread publishes a new results frame.
+
+use std::sync::{Condvar, Mutex, OnceLock};
+use std::sync::atomic::{AtomicBool, AtomicU64, AtomicUsize, Ordering};
+use std::thread::Thread;
+use std::time::{Duration, Instant};
+
+/// Default minimum fill level before the processing thread is woken
+pub const DEFAULT_MIN_FILL: usize = 256;
+
+/// Wakes the processing thread once enough samples are buffered
+pub struct BlockNotifier {
+    /// Thread parked in `wait` (registered once by the processing thread)
+    waiter: OnceLock<Thread>,
+
+    /// Minimum number of buffered samples that triggers a wakeup
+    min_fill: AtomicUsize,
+}
+
+impl BlockNotifier {
+    /// Create new notifier
+    ///
+    /// # Arguments
+    /// * `min_fill` - Buffered samples required before waking the waiter
+    pub fn new(min_fill: usize) -> Self {
+        Self {
+            waiter: OnceLock::new(),
+            min_fill: AtomicUsize::new(min_fill.max(1)),
+        }
+    }
+
+    /// Register the calling thread as the waiter
+    ///
+    /// Must be called from the processing thread before its first `wait`.
+    pub fn register_current_thread(&self) {
+        let _ = self.waiter.set(std::thread::current());
+    }
+
+    /// Report the current fill level (called from the audio callback)
+    ///
+    /// Wait-free: wakes the waiter only when the fill level reaches `min_fill`.
+    #[inline]
+    pub fn notify(&self, available: usize) {
+        if available >= self.min_fill.load(Ordering::Relaxed) {
+            if let Some(thread) = self.waiter.get() {
+                thread.unpark();
+            }
+        }
+    }
+
+    /// Wake the waiter unconditionally (e.g. on shutdown)
+    pub fn wake(&self) {
+        if let Some(thread) = self.waiter.get() {
+            thread.unpark();
+        }
+    }
+
+    /// Park the calling thread until a block is ready or `timeout` elapses
+    ///
+    /// # Arguments
+    /// * `available` - Returns the number of samples currently buffered
+    /// * `timeout` - Upper bound on the time spent parked
+    ///
+    /// # Returns
+    /// True if at least `min_fill` samples are available
+    pub fn wait<F: Fn() -> usize>(&self, available: F, timeout: Duration) -> bool {
+        if available() >= self.min_fill() {
+            return true;
+        }
+
+        // An unpark issued between the check and here is not lost: it leaves
+        // a token that makes this park return immediately
+        std::thread::park_timeout(timeout);
+
+        available() >= self.min_fill()
+    }
+
+    /// Set minimum fill level
+    pub fn set_min_fill(&self, min_fill: usize) {
+        self.min_fill.store(min_fill.max(1), Ordering::Relaxed);
+    }
+
+    /// Get minimum fill level
+    pub fn min_fill(&self) -> usize {
+        self.min_fill.load(Ordering::Relaxed)
+    }
+}
+
+impl Default for BlockNotifier {
+    fn default() -> Self {
+        Self::new(DEFAULT_MIN_FILL)
+    }
+}
+
+/// Frame-published notification for any number of waiting consumers
+///
+/// The processing thread only touches the condition variable when a
+/// consumer is actually waiting; otherwise publishing is one atomic store.
+pub struct FrameSignal {
+    /// Sequence number of the newest published frame
+    sequence: AtomicU64,
+
+    /// Consumers currently blocked in `wait_after`
+    waiters: AtomicUsize,
+
+    /// Set when no more frames will be published (processing stopped)
+    closed: AtomicBool,
+
+    lock: Mutex<()>,
+    condvar: Condvar,
+}
+
+impl FrameSignal {
+    /// Create new signal (sequence 0 = nothing published)
+    pub fn new() -> Self {
+        Self {
+            sequence: AtomicU64::new(0),
+            waiters: AtomicUsize::new(0),
+            closed: AtomicBool::new(false),
+            lock: Mutex::new(()),
+            condvar: Condvar::new(),
+        }
+    }
+
+    /// Report a published frame (called from the processing thread)
+    pub fn publish(&self, sequence: u64) {
+        self.sequence.store(sequence, Ordering::SeqCst);
+        self.notify_waiters();
+    }
+
+    /// Wake all waiters for good (no more frames)
+    pub fn close(&self) {
+        self.closed.store(true, Ordering::SeqCst);
+        self.notify_waiters();
+    }
+
+    /// Re-open after `close` (sequence numbers continue)
+    pub fn reopen(&self) {
+        self.closed.store(false, Ordering::SeqCst);
+    }
+
+    fn notify_waiters(&self) {
+        if self.waiters.load(Ordering::SeqCst) > 0 {
+            // Taking the lock orders this notify after a waiter's check
+            let _guard = self.lock.lock().unwrap_or_else(|e| e.into_inner());
+            self.condvar.notify_all();
+        }
+    }
+
+    /// Wake all waiters without publishing, so they re-check their cancel flags
+    pub fn wake_all(&self) {
+        self.notify_waiters();
+    }
+
+    /// Block until a frame newer than `after` is published
+    ///
+    /// # Arguments
+    /// * `after` - Sequence number the caller has already seen
+    /// * `timeout` - Upper bound on the time spent waiting
+    ///
+    /// # Returns
+    /// The newest sequence number, or None on timeout or when closed
+    pub fn wait_after(&self, after: u64, timeout: Duration) -> Option<u64> {
+        self.wait_after_unless(after, timeout, &AtomicBool::new(false))
+    }
+
+    /// Like `wait_after`, but also gives up once `cancelled` is set
+    ///
+    /// Set the flag, then call `wake_all` to release a blocked waiter.
+    ///
+    /// # Arguments
+    /// * `after` - Sequence number the caller has already seen
+    /// * `timeout` - Upper bound on the time spent waiting
+    /// * `cancelled` - Per-consumer cancel flag
+    ///
+    /// # Returns
+    /// The newest sequence number, or None on timeout, close or cancel
+    pub fn wait_after_unless(&self, after: u64, timeout: Duration, cancelled: &AtomicBool) -> Option<u64> {
+        let ready = || {
+            let sequence = self.sequence.load(Ordering::SeqCst);
+            if cancelled.load(Ordering::SeqCst) {
+                Some(None)
+            } else if sequence > after {
+                Some(Some(sequence))
+            } else if self.closed.load(Ordering::SeqCst) {
+                Some(None)
+            } else {
+                None
+            }
+        };
+
+        if let Some(result) = ready() {
+            return result;
+        }
+
+        let deadline = Instant::now() + timeout;
+        self.waiters.fetch_add(1, Ordering::SeqCst);
+        let mut guard = self.lock.lock().unwrap_or_else(|e| e.into_inner());
+
+        let result = loop {
+            if let Some(result) = ready() {
+                break result;
+            }
+            let now = Instant::now();
+            if now >= deadline {
+                break None;
+            }
+            guard = match self.condvar.wait_timeout(guard, deadline - now) {
+                Ok((guard, _)) => guard,
+                Err(e) => e.into_inner().0,
+            };
+        };
+
+        drop(guard);
+        self.waiters.fetch_sub(1, Ordering::SeqCst);
+        result
+    }
+
+    /// Sequence number of the newest published frame
+    pub fn sequence(&self) -> u64 {
+        self.sequence.load(Ordering::SeqCst)
+    }
+}
+
+impl Default for FrameSignal {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::sync::Arc;
+    use std::time::Instant;
+
+    #[test]
+    fn test_notifier_ready_without_parking() {
+        let notifier = BlockNotifier::new(128);
+        notifier.register_current_thread();
+
+        let start = Instant::now();
+        assert!(notifier.wait(|| 256, Duration::from_secs(5)));
+        assert!(start.elapsed() < Duration::from_secs(1));
+    }
+
+    #[test]
+    fn test_notifier_times_out_below_min_fill() {
+        let notifier = BlockNotifier::new(128);
+        notifier.register_current_thread();
+
+        assert!(!notifier.wait(|| 10, Duration::from_millis(5)));
+    }
+
+    #[test]
+    fn test_notifier_wakes_waiter() {
+        let notifier = Arc::new(BlockNotifier::new(64));
+        let fill = Arc::new(AtomicUsize::new(0));
+
+        let waiter = {
+            let notifier = Arc::clone(&notifier);
+            let fill = Arc::clone(&fill);
+            std::thread::spawn(move || {
+                notifier.register_current_thread();
+                let start = Instant::now();
+                while !notifier.wait(|| fill.load(Ordering::SeqCst), Duration::from_secs(5)) {}
+                start.elapsed()
+            })
+        };
+
+        // Below threshold: no wakeup requested
+        fill.store(10, Ordering::SeqCst);
+        notifier.notify(10);
+        std::thread::sleep(Duration::from_millis(20));
+
+        fill.store(100, Ordering::SeqCst);
+        notifier.notify(100);
+
+        let elapsed = waiter.join().unwrap();
+        assert!(elapsed < Duration::from_secs(5));
+    }
+
+    #[test]
+    fn test_frame_signal_wakes_and_closes() {
+        let signal = Arc::new(FrameSignal::new());
+
+        // Already published: no wait
+        signal.publish(3);
+        assert_eq!(signal.wait_after(2, Duration::from_secs(5)), Some(3));
+        assert_eq!(signal.wait_after(3, Duration::from_millis(5)), None);
+
+        let waiter = {
+            let signal = Arc::clone(&signal);
+            std::thread::spawn(move || {
+                let first = signal.wait_after(3, Duration::from_secs(5));
+                let second = signal.wait_after(4, Duration::from_secs(5));
+                (first, second)
+            })
+        };
+
+        std::thread::sleep(Duration::from_millis(20));
+        signal.publish(4);
+        std::thread::sleep(Duration::from_millis(20));
+        signal.close();
+
+        assert_eq!(waiter.join().unwrap(), (Some(4), None));
+    }
+
+    #[test]
+    fn test_frame_signal_wait_cancels() {
+        let signal = Arc::new(FrameSignal::new());
+        let cancelled = Arc::new(AtomicBool::new(false));
+
+        let waiter = {
+            let (signal, cancelled) = (Arc::clone(&signal), Arc::clone(&cancelled));
+            std::thread::spawn(move || {
+                let start = Instant::now();
+                let result = signal.wait_after_unless(0, Duration::from_secs(5), &cancelled);
+                (result, start.elapsed())
+            })
+        };
+
+        std::thread::sleep(Duration::from_millis(20));
+        cancelled.store(true, Ordering::SeqCst);
+        signal.wake_all();
+
+        let (result, elapsed) = waiter.join().unwrap();
+        assert_eq!(result, None);
+        assert!(elapsed < Duration::from_secs(1));
+
+        // Other consumers are unaffected
+        signal.publish(1);
+        assert_eq!(signal.wait_after(0, Duration::from_millis(5)), Some(1));
+    }
+}
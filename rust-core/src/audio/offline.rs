@@ -0,0 +1,179 @@
+//! Offline processing through the production chain
+//!
+//! Runs recorded samples through the same stages as the live processing
+//! thread (noise gate → user filter → STFT analysis) without an audio
+//! device, as fast as the CPU allows. State is kept between calls, so a
+//! long recording can be fed in chunks with the same result as in one call.
+
+use crate::audio::chain::{FilterChain, FilterChainControl, Stage, GATE_STAGE, USER_FILTER_STAGE};
+use crate::spectrum::{SpectrumAnalyzer, StftHistory, AveragingMode};
+
+/// Filter chain and analyzer fed from memory instead of a capture stream
+pub struct OfflinePipeline {
+    /// Stage slots (filled once, before the first block)
+    control: FilterChainControl,
+
+    /// Chain applying the stages, exactly as on the processing thread
+    chain: FilterChain,
+
+    analyzer: SpectrumAnalyzer,
+
+    /// Rolling analysis history (one frame per hop)
+    stft: StftHistory,
+
+    /// Samples passed through the chain at a time
+    block_size: usize,
+
+    /// Reusable dB spectrum row
+    spectrum: Vec<f64>,
+}
+
+impl OfflinePipeline {
+    /// Create new pipeline
+    ///
+    /// # Arguments
+    /// * `gate` - Noise gate stage (None = pass-through)
+    /// * `filter` - User filter stage (None = pass-through)
+    /// * `analyzer` - Analyzer with the FFT size, window and averaging to use
+    /// * `hop` - Samples between analysis frames
+    /// * `block_size` - Samples per chain block (at least 1)
+    pub fn new(gate: Stage, filter: Stage, analyzer: SpectrumAnalyzer, hop: usize, block_size: usize) -> Self {
+        let block_size = block_size.max(1);
+
+        // Stages are in place before the first block, so nothing crossfades
+        let control = FilterChainControl::new();
+        control.set_crossfade_samples(0);
+        control.publish(GATE_STAGE, gate);
+        control.publish(USER_FILTER_STAGE, filter);
+
+        let fft_size = analyzer.config().fft_size;
+        let spectrum = vec![0.0; analyzer.num_bins()];
+
+        Self {
+            control,
+            chain: FilterChain::new(block_size),
+            analyzer,
+            stft: StftHistory::new(fft_size, hop),
+            block_size,
+            spectrum,
+        }
+    }
+
+    /// Run samples through the chain and the analyzer
+    ///
+    /// # Arguments
+    /// * `input` - Input samples (any length)
+    /// * `filtered` - Receives the chain output (at least `input.len()` values)
+    /// * `on_row` - Receives every dB spectrum row, oldest first
+    ///
+    /// # Returns
+    /// Number of spectrum rows emitted (`rows_for(input.len())`)
+    pub fn process<F: FnMut(&[f64])>(&mut self, input: &[f64], filtered: &mut [f64], mut on_row: F) -> usize {
+        let filtered = &mut filtered[..input.len()];
+        filtered.copy_from_slice(input);
+
+        let averaging = self.analyzer.averaging() != AveragingMode::None;
+        let frame_interval = self.stft.hop() as f64 / self.analyzer.config().sample_rate;
+        let analyzer = &mut self.analyzer;
+        let spectrum = &mut self.spectrum;
+        let mut rows = 0;
+
+        for block in filtered.chunks_mut(self.block_size) {
+            self.chain.process_block_inplace(&self.control, block);
+
+            rows += self.stft.push(block, |frame| {
+                let len = if averaging {
+                    analyzer.accumulate(frame, frame_interval);
+                    analyzer.averaged_db_into(1.0, spectrum)
+                } else {
+                    analyzer.analyze_db_into(frame, 1.0, spectrum)
+                };
+                on_row(&spectrum[..len]);
+            });
+        }
+
+        rows
+    }
+
+    /// Number of spectrum rows the next `process` of `samples` samples emits
+    pub fn rows_for(&self, samples: usize) -> usize {
+        self.stft.frames_for(samples)
+    }
+
+    /// Get number of frequency bins per spectrum row
+    pub fn num_bins(&self) -> usize {
+        self.analyzer.num_bins()
+    }
+
+    /// Get samples between spectrum rows
+    pub fn hop(&self) -> usize {
+        self.stft.hop()
+    }
+
+    /// Get sample rate the analyzer assumes
+    pub fn sample_rate(&self) -> f64 {
+        self.analyzer.config().sample_rate
+    }
+
+    /// Get frequency of each bin in Hz
+    pub fn frequency_axis_hz(&self) -> &[f64] {
+        self.analyzer.frequency_axis_hz()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::audio::chain::FilterTrait;
+    use crate::filters::FirFilter;
+    use crate::spectrum::analysis::AnalyzerConfig;
+
+    fn pipeline(block_size: usize) -> OfflinePipeline {
+        let filter: Box<dyn FilterTrait + Send> = Box::new(FirFilter::new(vec![0.25, 0.5, 0.25]));
+        let analyzer = SpectrumAnalyzer::new(AnalyzerConfig {
+            fft_size: 256,
+            ..AnalyzerConfig::default()
+        });
+        OfflinePipeline::new(None, Some(filter), analyzer, 64, block_size)
+    }
+
+    #[test]
+    fn test_offline_filters_and_analyzes() {
+        let signal: Vec<f64> = (0..1000).map(|i| ((i as f64) * 0.3).sin()).collect();
+        let mut pipeline = pipeline(100);
+        let mut filtered = vec![0.0; signal.len()];
+
+        let expected_rows = pipeline.rows_for(signal.len());
+        let mut rows = 0;
+        let count = pipeline.process(&signal, &mut filtered, |row| {
+            assert_eq!(row.len(), 129);
+            rows += 1;
+        });
+
+        assert_eq!((count, rows), (expected_rows, signal.len() / 64));
+        assert!((filtered[10] - (0.25 * signal[10] + 0.5 * signal[9] + 0.25 * signal[8])).abs() < 1e-12);
+    }
+
+    #[test]
+    fn test_offline_chunked_matches_single_call() {
+        let signal: Vec<f64> = (0..5000).map(|i| ((i as f64) * 0.05).sin() + 0.1 * ((i as f64) * 1.7).cos()).collect();
+
+        let mut whole = pipeline(256);
+        let mut filtered = vec![0.0; signal.len()];
+        let mut rows = Vec::new();
+        whole.process(&signal, &mut filtered, |row| rows.extend_from_slice(row));
+
+        let mut chunked = pipeline(256);
+        let mut chunk_filtered = Vec::new();
+        let mut chunk_rows = Vec::new();
+        for chunk in signal.chunks(777) {
+            let mut out = vec![0.0; chunk.len()];
+            chunked.process(chunk, &mut out, |row| chunk_rows.extend_from_slice(row));
+            chunk_filtered.extend_from_slice(&out);
+        }
+
+        assert_eq!(rows.len(), chunk_rows.len());
+        assert!(filtered.iter().zip(&chunk_filtered).all(|(a, b)| (a - b).abs() < 1e-9));
+        assert!(rows.iter().zip(&chunk_rows).all(|(a, b)| (a - b).abs() < 1e-6));
+    }
+}
@@ -5,13 +5,17 @@
 use cpal::traits::{DeviceTrait, HostTrait, StreamTrait};
 use cpal::{Device, Stream, StreamConfig};
 use super::buffer::AudioConsumer;
-use std::sync::{Arc, Mutex};
+use std::sync::Arc;
+use std::sync::atomic::{AtomicU64, Ordering};
 use super::input::{AudioError, AudioDeviceInfo};
 
 /// Audio output stream
 pub struct AudioOutput {
     stream: Stream,
     device_info: AudioDeviceInfo,
+    
+    /// Number of callbacks that ran out of buffered samples
+    underruns: Arc<AtomicU64>,
 }
 
 impl AudioOutput {
@@ -55,30 +59,23 @@ impl AudioOutput {
         
         let stream_config: StreamConfig = config.into();
         
-        // Wrap consumer in Arc<Mutex> for thread-safe access
-        let consumer = Arc::new(Mutex::new(consumer));
+        // The callback is the sole owner of the consumer: no lock, no allocation
+        let mut consumer = consumer;
+        let underruns = Arc::new(AtomicU64::new(0));
+        let underruns_clone = Arc::clone(&underruns);
         
         // Build audio output stream
-        let consumer_clone = Arc::clone(&consumer);
         let stream = device
             .build_output_stream(
                 &stream_config,
                 move |data: &mut [f32], _: &cpal::OutputCallbackInfo| {
-                    // Read samples from ring buffer and convert to f32
-                    let mut samples = vec![0.0; data.len()];
+                    // Convert f64 ring buffer samples straight into the output slice
+                    let read = consumer.read_into_f32(data);
                     
-                    if let Ok(mut cons) = consumer_clone.lock() {
-                        let read = cons.read(&mut samples);
-                        
-                        // Convert f64 to f32 and write to output
-                        for (i, &sample) in samples[..read].iter().enumerate() {
-                            data[i] = sample as f32;
-                        }
-                        
-                        // Zero remaining samples if not enough data
-                        for sample in data[read..].iter_mut() {
-                            *sample = 0.0;
-                        }
+                    // Zero remaining samples if not enough data
+                    if read < data.len() {
+                        data[read..].fill(0.0);
+                        underruns_clone.fetch_add(1, Ordering::Relaxed);
                     }
                 },
                 move |err| {
@@ -91,6 +88,7 @@ impl AudioOutput {
         Ok(Self {
             stream,
             device_info,
+            underruns,
         })
     }
     
@@ -112,6 +110,16 @@ impl AudioOutput {
     pub fn device_info(&self) -> &AudioDeviceInfo {
         &self.device_info
     }
+    
+    /// Get number of output callbacks that ran out of buffered samples
+    pub fn underrun_count(&self) -> u64 {
+        self.underruns.load(Ordering::Relaxed)
+    }
+
+    /// Get the shared underrun counter (readable after the stream moved away)
+    pub fn underrun_counter(&self) -> Arc<AtomicU64> {
+        Arc::clone(&self.underruns)
+    }
 }
 
 /// List available audio output devices
@@ -2,13 +2,22 @@
 //! 
 //! Eliminates Python/Rust boundary overhead by processing audio entirely in Rust
 
-use crate::filters::{FirFilter, FastFirFilter, FilterSpec, WindowType, design_bandpass_fir, design_lowpass_fir, design_highpass_fir};
-use crate::spectrum::{SpectrumAnalyzer, analysis::AnalyzerConfig};
+use crate::filters::{BlockFirFilter, FastFirFilter, PartitionedFirFilter, ConvolutionEngine, calibration_for, FilterSpec, WindowType, design_bandpass_fir, design_lowpass_fir, design_highpass_fir};
+use crate::spectrum::{SpectrumAnalyzer, StftHistory, SpectrogramRing, WaterfallRenderer, AveragingMode, analysis::AnalyzerConfig};
+use crate::spectrum::stft::{DEFAULT_OVERLAP, hop_for_overlap};
 use crate::audio::{AudioInput, AudioOutput, AudioRingBuffer, input::list_input_devices};
-use crate::audio::buffer::AudioProducer;
+use crate::audio::buffer::{AudioConsumer, AudioProducer};
 use crate::audio::gate::NoiseGate;
+use crate::audio::chain::{FilterChain, FilterChainControl, FilterTrait, Stage, GATE_STAGE, USER_FILTER_STAGE};
+use crate::audio::triple_buffer::{TripleBuffer, TripleBufferOutput};
+use crate::audio::frame_queue::{FrameQueue, FrameQueueOutput};
+use crate::audio::notify::{BlockNotifier, FrameSignal, DEFAULT_MIN_FILL};
+use crate::audio::trigger::{TriggerConfig, TriggerEngine};
+use crate::audio::stream_host::StreamHost;
+use crate::audio::offline::OfflinePipeline;
 use std::sync::{Arc, Mutex};
-use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::time::{Duration, Instant};
 
 /// Filter type enumeration
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
@@ -35,8 +44,11 @@ pub struct ProcessingResults {
     /// Spectrum magnitude in dB (fixed-size buffer)
     pub spectrum_magnitude: Box<[f64; MAX_SPECTRUM_SIZE]>,
 
-    /// Frequency bins in Hz (fixed-size buffer)
-    pub spectrum_frequencies: Box<[f64; MAX_SPECTRUM_SIZE]>,
+    /// Analyzer configuration generation the spectrum was computed with
+    ///
+    /// The frequency axis is not copied per frame; fetch it with
+    /// `AudioProcessor::frequency_axis` when this changes.
+    pub spectrum_generation: u64,
 
     /// Actual length of waveform data
     pub waveform_len: usize,
@@ -46,6 +58,26 @@ pub struct ProcessingResults {
 
     /// Sample rate
     pub sample_rate: f64,
+
+    /// Number of frames published since start (gaps mean frames were skipped)
+    pub sequence: u64,
+}
+
+impl ProcessingResults {
+    /// Copy another frame's valid data into this pre-allocated frame
+    pub fn copy_from(&mut self, other: &ProcessingResults) {
+        let waveform_len = other.waveform_len;
+        let spectrum_len = other.spectrum_len;
+
+        self.input_waveform[..waveform_len].copy_from_slice(&other.input_waveform[..waveform_len]);
+        self.filtered_waveform[..waveform_len].copy_from_slice(&other.filtered_waveform[..waveform_len]);
+        self.spectrum_magnitude[..spectrum_len].copy_from_slice(&other.spectrum_magnitude[..spectrum_len]);
+        self.spectrum_generation = other.spectrum_generation;
+        self.waveform_len = waveform_len;
+        self.spectrum_len = spectrum_len;
+        self.sample_rate = other.sample_rate;
+        self.sequence = other.sequence;
+    }
 }
 
 impl Default for ProcessingResults {
@@ -54,22 +86,218 @@ impl Default for ProcessingResults {
             input_waveform: Box::new([0.0; MAX_WAVEFORM_SIZE]),
             filtered_waveform: Box::new([0.0; MAX_WAVEFORM_SIZE]),
             spectrum_magnitude: Box::new([0.0; MAX_SPECTRUM_SIZE]),
-            spectrum_frequencies: Box::new([0.0; MAX_SPECTRUM_SIZE]),
+            spectrum_generation: 0,
             waveform_len: 0,
             spectrum_len: 0,
             sample_rate: 48000.0,
+            sequence: 0,
+        }
+    }
+}
+
+/// Triggered oscilloscope frame (published only when the trigger fires)
+#[derive(Clone)]
+pub struct ScopeFrame {
+    /// Input samples aligned on the trigger point (fixed-size buffer)
+    pub input_waveform: Box<[f64; MAX_WAVEFORM_SIZE]>,
+
+    /// Filtered samples with the same alignment (fixed-size buffer)
+    pub filtered_waveform: Box<[f64; MAX_WAVEFORM_SIZE]>,
+
+    /// Actual frame length
+    pub len: usize,
+
+    /// Index of the trigger point within the frame
+    pub trigger_index: usize,
+
+    /// False for auto-mode frames captured without a trigger
+    pub triggered: bool,
+
+    /// Number of frames captured since the trigger was configured
+    pub sequence: u64,
+
+    /// Sample rate
+    pub sample_rate: f64,
+}
+
+impl Default for ScopeFrame {
+    fn default() -> Self {
+        Self {
+            input_waveform: Box::new([0.0; MAX_WAVEFORM_SIZE]),
+            filtered_waveform: Box::new([0.0; MAX_WAVEFORM_SIZE]),
+            len: 0,
+            trigger_index: 0,
+            triggered: false,
+            sequence: 0,
+            sample_rate: 48000.0,
+        }
+    }
+}
+
+/// Signal the oscilloscope trigger watches
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum TriggerSource {
+    /// Raw input
+    Input,
+    /// Filter chain output
+    Filtered,
+}
+
+/// Partition size for long filters (latency in samples)
+const PARTITION_SIZE: usize = crate::filters::partitioned_fir::DEFAULT_PARTITION_SIZE;
+
+/// Default convolution latency budget of the user filter
+///
+/// One partition, so long kernels can use partitioned convolution
+pub const DEFAULT_MAX_FILTER_LATENCY: usize = PARTITION_SIZE;
+
+/// Upper bound on a single park of the processing thread
+///
+/// Only matters when no audio arrives (device stalled or stopping); normal
+/// wakeups come from the capture callback.
+const WAIT_TIMEOUT: Duration = Duration::from_millis(50);
+
+/// Default spectrum analysis rate (matches the GUI refresh rate)
+pub const DEFAULT_ANALYSIS_FPS: f64 = 60.0;
+
+/// How often the processing thread recomputes the spectrum
+///
+/// Filtering and monitoring always run at audio rate; only the windowed
+/// FFT and dB conversion are rate limited.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub enum AnalysisRate {
+    /// Analyze every STFT hop
+    EveryHop,
+    /// Analyze at most this many times per second
+    MaxFps(f64),
+    /// Analyze only after a reader fetched results since the last analysis
+    OnDemand,
+}
+
+impl AnalysisRate {
+    /// Encoded `EveryHop`
+    const EVERY_HOP: u64 = 0;
+
+    /// Encoded `OnDemand`
+    const ON_DEMAND: u64 = u64::MAX;
+
+    /// Encode as minimum interval in nanoseconds (for lock-free sharing)
+    fn encode(self) -> u64 {
+        match self {
+            AnalysisRate::EveryHop => Self::EVERY_HOP,
+            AnalysisRate::OnDemand => Self::ON_DEMAND,
+            AnalysisRate::MaxFps(fps) if fps.is_finite() && fps > 0.0 => {
+                ((1e9 / fps) as u64).clamp(1, Self::ON_DEMAND - 1)
+            }
+            AnalysisRate::MaxFps(_) => Self::EVERY_HOP,
+        }
+    }
+
+    fn decode(bits: u64) -> Self {
+        match bits {
+            Self::EVERY_HOP => AnalysisRate::EveryHop,
+            Self::ON_DEMAND => AnalysisRate::OnDemand,
+            interval_ns => AnalysisRate::MaxFps(1e9 / interval_ns as f64),
+        }
+    }
+}
+
+/// Processing thread counters (relaxed atomics, written by the processing thread)
+#[derive(Default)]
+struct ProcessingCounters {
+    wakeups: AtomicU64,
+    blocks: AtomicU64,
+    samples: AtomicU64,
+    analyses: AtomicU64,
+}
+
+impl ProcessingCounters {
+    fn reset(&self) {
+        self.wakeups.store(0, Ordering::Relaxed);
+        self.blocks.store(0, Ordering::Relaxed);
+        self.samples.store(0, Ordering::Relaxed);
+        self.analyses.store(0, Ordering::Relaxed);
+    }
+}
+
+/// Snapshot of processing thread statistics
+#[derive(Debug, Clone, Copy, Default)]
+pub struct ProcessingStats {
+    /// Processing thread wakeups per second since start
+    pub wakeups_per_second: f64,
+
+    /// Average number of samples processed per block
+    pub average_block_fill: f64,
+
+    /// Total wakeups since start
+    pub wakeups: u64,
+
+    /// Total blocks processed since start
+    pub blocks: u64,
+
+    /// Spectrum analyses per second since start
+    pub analyses_per_second: f64,
+
+    /// Seconds since start
+    pub elapsed_seconds: f64,
+}
+
+/// Capture stream opened by `AudioProcessor::open_input`
+pub struct OpenedInput {
+    host: StreamHost,
+    consumer: AudioConsumer,
+    notifier: Arc<BlockNotifier>,
+    device_name: String,
+    sample_rate: f64,
+}
+
+/// Processing thread and capture stream taken by `AudioProcessor::detach_capture`
+pub struct RunningCapture {
+    process_thread: Option<std::thread::JoinHandle<FilterChain>>,
+    audio_input: Option<StreamHost>,
+}
+
+impl RunningCapture {
+    /// Wait for the processing thread to exit and close the capture stream
+    ///
+    /// # Returns
+    /// The thread's filter chain (None if nothing was running)
+    pub fn shutdown(self) -> Option<FilterChain> {
+        let chain = self.process_thread.and_then(|handle| handle.join().ok());
+
+        if let Some(input) = &self.audio_input {
+            let _ = input.pause();
         }
+
+        chain
     }
 }
 
+/// User filter built by `AudioProcessor::prepare_filter`
+pub struct PreparedFilter {
+    coefficients: Vec<f64>,
+    filter: Box<dyn FilterTrait + Send>,
+    latency: usize,
+}
+
 /// High-performance audio processor
 /// 
 /// Runs audio capture, filtering, and FFT analysis in Rust thread
 /// Python only reads results (no per-sample boundary crossing)
 pub struct AudioProcessor {
-    /// Filter chain (applied in order: noise gate → user filter)
-    filter_chain: Arc<Mutex<Vec<Option<Box<dyn FilterTrait + Send>>>>>,
+    /// Filter chain control (applied in order: noise gate → user filter)
+    /// Stages are swapped lock-free and crossfaded by the processing thread
+    filter_chain: Arc<FilterChainControl>,
+
+    /// Chain state kept between runs (owned by the processing thread while running)
+    idle_chain: Option<FilterChain>,
     
+    /// Coefficients of the current user filter (rebuilt for offline runs)
+    filter_coefficients: Option<Vec<f64>>,
+
+    /// Largest convolution engine latency accepted for the user filter
+    max_filter_latency: usize,
+
     /// Noise gate enabled flag
     gate_enabled: Arc<AtomicBool>,
     
@@ -78,21 +306,72 @@ pub struct AudioProcessor {
     
     /// Spectrum analyzer
     analyzer: Arc<Mutex<SpectrumAnalyzer>>,
+
+    /// Overlap between consecutive analysis frames (f64 bits)
+    analysis_overlap: Arc<AtomicU64>,
+
+    /// Spectrum analysis rate (encoded `AnalysisRate`)
+    analysis_rate: Arc<AtomicU64>,
+
+    /// Waterfall history: one row per published spectrum
+    spectrogram: Arc<Mutex<SpectrogramRing>>,
+
+    /// Waterfall rows rendered to RGBA (colormap LUT, running levels)
+    waterfall: Arc<Mutex<WaterfallRenderer>>,
+
+    /// Render waterfall rows in the processing thread
+    waterfall_rendering: Arc<AtomicBool>,
+
+    /// Frames kept for batched retrieval (0 = queue disabled; applied on start)
+    result_queue_capacity: usize,
+
+    /// Reader end of the per-frame result queue (created on start)
+    result_queue: Option<FrameQueueOutput<ProcessingResults>>,
+
+    /// Wakes consumers blocked waiting for the next results frame
+    frame_signal: Arc<FrameSignal>,
+
+    /// Oscilloscope trigger settings (None = disabled)
+    trigger: Arc<Mutex<Option<(TriggerConfig, TriggerSource)>>>,
+
+    /// Bumped on every trigger change; the processing thread re-reads `trigger`
+    trigger_version: Arc<AtomicU64>,
+
+    /// Reader end of the triggered frame triple buffer (created on start)
+    scope: Option<TripleBufferOutput<ScopeFrame>>,
+
+    /// Set by `get_results`; lets `AnalysisRate::OnDemand` run the next analysis
+    analysis_requested: Arc<AtomicBool>,
     
-    /// Latest processing results
-    results: Arc<Mutex<Option<ProcessingResults>>>,
+    /// Reader end of the results triple buffer (created on start)
+    results: Option<TripleBufferOutput<ProcessingResults>>,
     
-    /// Audio input stream
-    audio_input: Option<AudioInput>,
+    /// Audio input stream (lives on its own thread, keeping the processor `Send`)
+    audio_input: Option<StreamHost>,
     
     /// Audio output stream (for monitoring)
-    audio_output: Option<AudioOutput>,
+    audio_output: Option<StreamHost>,
+
+    /// Underrun counter of the monitoring output
+    output_underruns: Option<Arc<AtomicU64>>,
     
     /// Output ring buffer producer (for sending audio to output)
     output_producer: Arc<Mutex<Option<AudioProducer>>>,
     
-    /// Processing thread handle
-    process_thread: Option<std::thread::JoinHandle<()>>,
+    /// Wakes the processing thread when the capture callback has a block ready
+    notifier: Option<Arc<BlockNotifier>>,
+
+    /// Minimum buffered samples before the processing thread is woken
+    min_block_fill: usize,
+
+    /// Processing thread counters
+    counters: Arc<ProcessingCounters>,
+
+    /// Time the current run started
+    started_at: Option<Instant>,
+
+    /// Processing thread handle (returns the filter chain when joined)
+    process_thread: Option<std::thread::JoinHandle<FilterChain>>,
     
     /// Running flag
     running: Arc<AtomicBool>,
@@ -107,44 +386,6 @@ pub struct AudioProcessor {
     sample_rate: f64,
 }
 
-/// Trait for polymorphic filter types with zero-allocation in-place processing
-trait FilterTrait {
-    /// Process block in-place (zero allocations)
-    fn process_block_inplace(&mut self, buffer: &mut [f64]);
-    #[allow(dead_code)]
-    fn reset(&mut self);
-}
-
-impl FilterTrait for FirFilter {
-    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
-        FirFilter::process_block_inplace(self, buffer)
-    }
-
-    fn reset(&mut self) {
-        FirFilter::reset(self)
-    }
-}
-
-impl FilterTrait for FastFirFilter {
-    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
-        FastFirFilter::process_block_inplace(self, buffer)
-    }
-
-    fn reset(&mut self) {
-        FastFirFilter::reset(self)
-    }
-}
-
-impl FilterTrait for NoiseGate {
-    fn process_block_inplace(&mut self, buffer: &mut [f64]) {
-        NoiseGate::process_block_inplace(self, buffer)
-    }
-
-    fn reset(&mut self) {
-        NoiseGate::reset(self)
-    }
-}
-
 impl AudioProcessor {
     /// Create new audio processor
     pub fn new() -> Self {
@@ -158,14 +399,34 @@ impl AudioProcessor {
         };
         
         Self {
-            filter_chain: Arc::new(Mutex::new(vec![None, None])),  // [0] = gate, [1] = user filter
+            filter_chain: Arc::new(FilterChainControl::new()),  // [0] = gate, [1] = user filter
+            idle_chain: None,
+            filter_coefficients: None,
+            max_filter_latency: DEFAULT_MAX_FILTER_LATENCY,
             gate_enabled: Arc::new(AtomicBool::new(false)),
             gate_params: Arc::new(Mutex::new((-40.0, 10.0, 100.0))),  // Default: -40dB, 10ms attack, 100ms release
             analyzer: Arc::new(Mutex::new(SpectrumAnalyzer::new(analyzer_config))),
-            results: Arc::new(Mutex::new(None)),
+            analysis_overlap: Arc::new(AtomicU64::new(DEFAULT_OVERLAP.to_bits())),
+            analysis_rate: Arc::new(AtomicU64::new(AnalysisRate::MaxFps(DEFAULT_ANALYSIS_FPS).encode())),
+            analysis_requested: Arc::new(AtomicBool::new(true)),
+            spectrogram: Arc::new(Mutex::new(SpectrogramRing::default())),
+            waterfall: Arc::new(Mutex::new(WaterfallRenderer::default())),
+            waterfall_rendering: Arc::new(AtomicBool::new(false)),
+            result_queue_capacity: 0,
+            result_queue: None,
+            frame_signal: Arc::new(FrameSignal::new()),
+            trigger: Arc::new(Mutex::new(None)),
+            trigger_version: Arc::new(AtomicU64::new(0)),
+            scope: None,
+            results: None,
             audio_input: None,
             audio_output: None,
+            output_underruns: None,
             output_producer: Arc::new(Mutex::new(None)),
+            notifier: None,
+            min_block_fill: DEFAULT_MIN_FILL,
+            counters: Arc::new(ProcessingCounters::default()),
+            started_at: None,
             process_thread: None,
             running: Arc::new(AtomicBool::new(false)),
             bypass: Arc::new(AtomicBool::new(false)),
@@ -176,16 +437,52 @@ impl AudioProcessor {
     
     /// Start audio capture and processing
     pub fn start(&mut self) -> Result<String, String> {
+        let input = Self::open_input(self.min_block_fill)?;
+        Ok(self.start_with(input))
+    }
+
+    /// Open and start the default capture device
+    ///
+    /// The blocking half of `start`. Needs no processor, so bindings can run
+    /// it without holding one.
+    ///
+    /// # Arguments
+    /// * `min_block_fill` - Buffered samples before the processing thread is woken
+    pub fn open_input(min_block_fill: usize) -> Result<OpenedInput, String> {
         // Create ring buffer
         let rb = AudioRingBuffer::new(96000);
         let (producer, consumer) = rb.split();
         
+        // Capture callback wakes the processing thread once a block is buffered
+        let notifier = Arc::new(BlockNotifier::new(min_block_fill));
+
         // Start audio input
-        let input = AudioInput::from_default_device(producer)
-            .map_err(|e| format!("Failed to start audio: {}", e))?;
-        
-        let device_name = input.device_info().name.clone();
-        self.sample_rate = input.device_info().sample_rate as f64;
+        let stream_notifier = Arc::clone(&notifier);
+        let (host, info) = StreamHost::spawn("audio-input", move || {
+            let input = AudioInput::from_default_device(producer, Some(stream_notifier))?;
+            let info = input.device_info().clone();
+            Ok((input, info))
+        })
+        .map_err(|e| format!("Failed to start audio: {}", e))?;
+
+        host.start().map_err(|e| format!("Failed to start stream: {}", e))?;
+
+        Ok(OpenedInput {
+            host,
+            consumer,
+            notifier,
+            device_name: info.name,
+            sample_rate: info.sample_rate as f64,
+        })
+    }
+
+    /// Start processing an input opened by `open_input`
+    ///
+    /// # Returns
+    /// Device name
+    pub fn start_with(&mut self, input: OpenedInput) -> String {
+        let OpenedInput { host, consumer, notifier, device_name, sample_rate } = input;
+        self.sample_rate = sample_rate;
         
         // Update analyzer sample rate
         if let Ok(mut analyzer) = self.analyzer.lock() {
@@ -198,38 +495,99 @@ impl AudioProcessor {
             });
         }
         
-        input.start().map_err(|e| format!("Failed to start stream: {}", e))?;
-        
-        self.audio_input = Some(input);
+        self.audio_input = Some(host);
         
         // Start processing thread (hot loop stays in Rust!)
-        self.running.store(true, Ordering::SeqCst);
+        // Fresh flag per run: a previous thread still being joined keeps
+        // seeing its own cleared flag
+        self.running = Arc::new(AtomicBool::new(true));
         
         let filter_chain = Arc::clone(&self.filter_chain);
+        let mut chain = self
+            .idle_chain
+            .take()
+            .unwrap_or_else(|| FilterChain::new(MAX_WAVEFORM_SIZE));
 
         let analyzer = Arc::clone(&self.analyzer);
-        let results = Arc::clone(&self.results);
+        let analysis_overlap = Arc::clone(&self.analysis_overlap);
+        let analysis_rate = Arc::clone(&self.analysis_rate);
+        let analysis_requested = Arc::clone(&self.analysis_requested);
+        let spectrogram = Arc::clone(&self.spectrogram);
+        let waterfall = Arc::clone(&self.waterfall);
+        let waterfall_rendering = Arc::clone(&self.waterfall_rendering);
+
+        // Results are published through a wait-free triple buffer: the
+        // processing thread never blocks on (or allocates for) the reader
+        let (results_input, results_output) = TripleBuffer::new(ProcessingResults::default()).split();
+        self.results = Some(results_output);
+        let (scope_input, scope_output) = TripleBuffer::new(ScopeFrame::default()).split();
+
+        // Optional queue keeping every frame (slots allocated here, not per frame)
+        let mut queue_input = None;
+        self.result_queue = None;
+        if self.result_queue_capacity > 0 {
+            let (input, output) = FrameQueue::new(ProcessingResults::default(), self.result_queue_capacity).split();
+            queue_input = Some(input);
+            self.result_queue = Some(output);
+        }
+        self.scope = Some(scope_output);
+        let trigger = Arc::clone(&self.trigger);
+        let frame_signal = Arc::clone(&self.frame_signal);
+        frame_signal.reopen();
+        let trigger_version = Arc::clone(&self.trigger_version);
+
         let running = Arc::clone(&self.running);
         let bypass = Arc::clone(&self.bypass);
         let monitoring = Arc::clone(&self.monitoring);
         let output_producer = Arc::clone(&self.output_producer);
         let sample_rate = self.sample_rate;
+
+        self.counters.reset();
+        self.started_at = Some(Instant::now());
+        let counters = Arc::clone(&self.counters);
+        self.notifier = Some(Arc::clone(&notifier));
         
         let handle = std::thread::spawn(move || {
-            let mut temp_buffer = vec![0.0; 2048];
-            let mut waveform_buffer = vec![0.0; 2048];
+            notifier.register_current_thread();
+
+            // Sized for the largest min_block_fill, so one read drains a full block
+            let mut temp_buffer = vec![0.0; MAX_WAVEFORM_SIZE];
+            let mut waveform_buffer = vec![0.0; MAX_WAVEFORM_SIZE];
             let mut filtered_buffer = vec![0.0; MAX_WAVEFORM_SIZE];
-            let mut padded_signal = vec![0.0; 8192]; // Max FFT size
             let mut consumer = consumer;
+            let mut results_input = results_input;
+            let mut scope_input = scope_input;
+
+            // Trigger engine owned by this thread; rebuilt only on config changes
+            let mut trigger_engine: Option<(TriggerEngine, TriggerSource)> = None;
+            let mut trigger_seen = u64::MAX;
+            let mut scope_sequence = 0;
+            // Sequence numbers continue across runs so waiters never go backwards
+            let mut results_sequence = frame_signal.sequence();
 
-            // Pre-allocate results buffer (reused each frame - no hot-path allocations)
-            let mut result_buffer = ProcessingResults::default();
+            // Rolling analysis history: frames of fft_size samples every hop,
+            // independent of how many samples each wakeup delivers
+            let mut stft = StftHistory::new(MAX_WAVEFORM_SIZE, MAX_WAVEFORM_SIZE);
+            let mut spectrum = vec![0.0; MAX_SPECTRUM_SIZE];
+            let mut spectrum_len = 0;
+            let mut spectrum_generation = 0;
+            let mut last_analysis: Option<Instant> = None;
 
             while running.load(Ordering::SeqCst) {
-                // Read audio samples (blocks if not available)
+                // Park until the capture callback reports a full block
+                let ready = notifier.wait(|| consumer.len(), WAIT_TIMEOUT);
+                counters.wakeups.fetch_add(1, Ordering::Relaxed);
+
+                if !ready {
+                    continue;
+                }
+
                 let n = consumer.read(&mut temp_buffer);
 
                 if n > 0 {
+                    counters.blocks.fetch_add(1, Ordering::Relaxed);
+                    counters.samples.fetch_add(n as u64, Ordering::Relaxed);
+
                     let n = n.min(MAX_WAVEFORM_SIZE); // Clamp to max size
                     // Store input waveform
                     waveform_buffer[..n].copy_from_slice(&temp_buffer[..n]);
@@ -241,36 +599,113 @@ impl AudioProcessor {
                     let filtered_len = if bypass.load(Ordering::SeqCst) {
                         n
                     } else {
-                        // Process through filter chain IN-PLACE (no allocations)
-                        if let Ok(mut chain_guard) = filter_chain.lock() {
-                            for filter_opt in chain_guard.iter_mut() {
-                                if let Some(filter) = filter_opt {
-                                    filter.process_block_inplace(&mut filtered_buffer[..n]);
-                                }
-                            }
+                        // Process through filter chain IN-PLACE (no allocations, no locks)
+                        // Pending stage swaps are picked up and crossfaded here.
+                        // Fixed-size blocks: the engines were calibrated at this size
+                        let block = notifier.min_fill();
+                        for chunk in filtered_buffer[..n].chunks_mut(block) {
+                            chain.process_block_inplace(&filter_chain, chunk);
                         }
                         n
                     };
 
-                    // Analyze spectrum (use fixed-size buffer for consistent output)
-                    let spectrum_len = if let Ok(mut analyzer) = analyzer.lock() {
+                    // Oscilloscope trigger: publish aligned frames only when it fires
+                    let version = trigger_version.load(Ordering::Acquire);
+                    if version != trigger_seen {
+                        if let Ok(settings) = trigger.lock() {
+                            trigger_engine = (*settings).map(|(config, source)| (TriggerEngine::new(config), source));
+                            trigger_seen = version;
+                            scope_sequence = 0;
+                        }
+                    }
+                    if let Some((engine, source)) = trigger_engine.as_mut() {
+                        let (signal, companion) = match source {
+                            TriggerSource::Input => (&waveform_buffer[..n], &filtered_buffer[..filtered_len]),
+                            TriggerSource::Filtered => (&filtered_buffer[..filtered_len], &waveform_buffer[..n]),
+                        };
+                        let trigger_index = engine.config().pre_trigger;
+                        let source = *source;
+
+                        engine.push(signal, companion, |frame, companion_frame, triggered| {
+                            let (input, filtered) = match source {
+                                TriggerSource::Input => (frame, companion_frame),
+                                TriggerSource::Filtered => (companion_frame, frame),
+                            };
+                            let len = input.len();
+
+                            let slot = scope_input.write_slot();
+                            slot.input_waveform[..len].copy_from_slice(input);
+                            slot.filtered_waveform[..len].copy_from_slice(filtered);
+                            slot.len = len;
+                            slot.trigger_index = trigger_index;
+                            slot.triggered = triggered;
+                            scope_sequence += 1;
+                            slot.sequence = scope_sequence;
+                            slot.sample_rate = sample_rate;
+                            scope_input.publish();
+                        });
+                    }
+
+                    // Fill the slot owned by this thread (pre-allocated, reused)
+                    let result_buffer = results_input.write_slot();
+
+                    // Feed the analysis history. Without averaging the FFT runs
+                    // at most once per hop and is skipped when the analysis
+                    // rate limit says so; averaging needs every hop's power
+                    // spectrum, but still converts to dB only when due
+                    if let Ok(mut analyzer) = analyzer.lock() {
                         let fft_size = analyzer.config().fft_size;
-                        let copy_len = filtered_len.min(fft_size);
+                        let overlap = f64::from_bits(analysis_overlap.load(Ordering::Relaxed));
+                        stft.configure(fft_size, hop_for_overlap(fft_size, overlap));
+                        let frame_interval = stft.hop() as f64 / analyzer.config().sample_rate;
+                        let averaging = analyzer.averaging() != AveragingMode::None;
+                        let rate = analysis_rate.load(Ordering::Relaxed);
 
-                        // Clear and fill padded signal buffer
-                        padded_signal[..fft_size].fill(0.0);
-                        padded_signal[..copy_len].copy_from_slice(&filtered_buffer[..copy_len]);
+                        stft.push(&filtered_buffer[..filtered_len], |frame| {
+                            if averaging {
+                                analyzer.accumulate(frame, frame_interval);
+                            }
 
-                        let mag = analyzer.analyze_db(&padded_signal[..fft_size], 1.0);
-                        let freq = analyzer.frequency_bins_hz();
+                            let due = match rate {
+                                AnalysisRate::EVERY_HOP => true,
+                                AnalysisRate::ON_DEMAND => analysis_requested.swap(false, Ordering::Relaxed),
+                                interval_ns => last_analysis
+                                    .map_or(true, |t| t.elapsed() >= Duration::from_nanos(interval_ns)),
+                            };
 
-                        let spec_len = mag.len().min(MAX_SPECTRUM_SIZE);
-                        result_buffer.spectrum_magnitude[..spec_len].copy_from_slice(&mag[..spec_len]);
-                        result_buffer.spectrum_frequencies[..spec_len].copy_from_slice(&freq[..spec_len]);
-                        spec_len
-                    } else {
-                        0
-                    };
+                            // A configuration change invalidates the old spectrum
+                            if !due && spectrum_generation == analyzer.generation() {
+                                return;
+                            }
+
+                            // dB conversion (plus window and FFT if not averaging)
+                            // with no allocations
+                            spectrum_len = if averaging {
+                                analyzer.averaged_db_into(1.0, &mut spectrum)
+                            } else {
+                                analyzer.analyze_db_into(frame, 1.0, &mut spectrum)
+                            };
+                            spectrum_generation = analyzer.generation();
+                            last_analysis = Some(Instant::now());
+                            counters.analyses.fetch_add(1, Ordering::Relaxed);
+
+                            // Append to the waterfall (copy into a preallocated row)
+                            if let Ok(mut ring) = spectrogram.lock() {
+                                ring.push_row(&spectrum[..spectrum_len]);
+                            }
+
+                            // Quantize and colormap the new row only
+                            if waterfall_rendering.load(Ordering::Relaxed) {
+                                if let Ok(mut renderer) = waterfall.lock() {
+                                    renderer.push_row(&spectrum[..spectrum_len]);
+                                }
+                            }
+                        });
+                    }
+
+                    // Latest spectrum goes into every published frame
+                    result_buffer.spectrum_magnitude[..spectrum_len].copy_from_slice(&spectrum[..spectrum_len]);
+                    result_buffer.spectrum_generation = spectrum_generation;
 
                     // Copy waveform data to result buffer
                     result_buffer.input_waveform[..n].copy_from_slice(&waveform_buffer[..n]);
@@ -278,12 +713,18 @@ impl AudioProcessor {
                     result_buffer.waveform_len = n;
                     result_buffer.spectrum_len = spectrum_len;
                     result_buffer.sample_rate = sample_rate;
+                    results_sequence += 1;
+                    result_buffer.sequence = results_sequence;
 
-                    // Store results for Python to read (clone the pre-allocated buffer)
-                    if let Ok(mut results_guard) = results.lock() {
-                        *results_guard = Some(result_buffer.clone());
+                    // Queue a copy for batched readers (dropped and counted when full)
+                    if let Some(queue) = queue_input.as_mut() {
+                        queue.push_with(|slot| slot.copy_from(result_buffer));
                     }
 
+                    // Publish results for Python to read (atomic index swap, no copy)
+                    results_input.publish();
+                    frame_signal.publish(results_sequence);
+
                     // Send filtered audio to output if monitoring is enabled
                     if monitoring.load(Ordering::SeqCst) {
                         if let Ok(mut producer_guard) = output_producer.lock() {
@@ -292,32 +733,52 @@ impl AudioProcessor {
                             }
                         }
                     }
-                } else {
-                    // No data available, sleep briefly to avoid busy-wait CPU burn
-                    // 100µs is short enough to maintain low latency but prevents spin-wait
-                    std::thread::sleep(std::time::Duration::from_micros(100));
                 }
             }
+
+            chain
         });
         
         self.process_thread = Some(handle);
         
-        Ok(device_name)
+        device_name
     }
     
     /// Stop audio capture
     pub fn stop(&mut self) {
+        let capture = self.detach_capture();
+        let chain = capture.shutdown();
+        self.finish_stop(chain);
+    }
+
+    /// Signal the processing thread to stop and take the running capture
+    ///
+    /// The non-blocking half of `stop`; the returned capture is shut down
+    /// (joined) separately, then its chain handed to `finish_stop`.
+    pub fn detach_capture(&mut self) -> RunningCapture {
         self.running.store(false, Ordering::SeqCst);
-        
-        if let Some(handle) = self.process_thread.take() {
-            let _ = handle.join();
+        self.frame_signal.close();
+
+        // Wake the processing thread so it notices the stop immediately
+        if let Some(notifier) = self.notifier.take() {
+            notifier.wake();
         }
-        
-        if let Some(input) = &self.audio_input {
-            let _ = input.pause();
+
+        RunningCapture {
+            process_thread: self.process_thread.take(),
+            audio_input: self.audio_input.take(),
         }
-        
-        self.audio_input = None;
+    }
+
+    /// Keep the chain of a shut down capture for the next run
+    ///
+    /// # Arguments
+    /// * `chain` - Chain returned by `RunningCapture::shutdown`
+    pub fn finish_stop(&mut self, chain: Option<FilterChain>) {
+        if chain.is_some() {
+            self.idle_chain = chain;
+        }
+        self.filter_chain.collect_retired();
     }
     
     /// Design and update filter
@@ -329,6 +790,36 @@ impl AudioProcessor {
         window_type: WindowType,
         filter_type: FilterType,
     ) -> Result<(usize, f64), String> {
+        let prepared = Self::prepare_filter(
+            omega_c1,
+            omega_c2,
+            delta_omega,
+            window_type,
+            filter_type,
+            self.min_block_fill,
+            self.max_filter_latency,
+        );
+        Ok(self.install_filter(prepared))
+    }
+
+    /// Design filter coefficients and build the user filter stage
+    ///
+    /// The blocking half of `design_filter` (the first call benchmarks the
+    /// convolution engines). Needs no processor, so bindings can run it
+    /// without holding one.
+    ///
+    /// # Arguments
+    /// * `block_size` - Chain block size (`min_block_fill`)
+    /// * `max_latency` - Largest accepted engine latency (`max_filter_latency`)
+    pub fn prepare_filter(
+        omega_c1: f64,
+        omega_c2: f64,
+        delta_omega: f64,
+        window_type: WindowType,
+        filter_type: FilterType,
+        block_size: usize,
+        max_latency: usize,
+    ) -> PreparedFilter {
         // Design filter coefficients based on type
         let coeffs = match filter_type {
             FilterType::Bandpass => {
@@ -342,27 +833,168 @@ impl AudioProcessor {
                 design_highpass_fir(omega_c1, delta_omega, window_type)
             },
         };
+
+        let (filter, latency) = Self::build_user_filter(coeffs.clone(), block_size, max_latency);
+        PreparedFilter { coefficients: coeffs, filter, latency }
+    }
+
+    /// Publish a filter built by `prepare_filter`
+    ///
+    /// # Returns
+    /// Tuple of (filter_length, group_delay)
+    pub fn install_filter(&mut self, prepared: PreparedFilter) -> (usize, f64) {
+        let PreparedFilter { coefficients, filter, latency } = prepared;
+        let filter_length = coefficients.len();
+        self.filter_coefficients = Some(coefficients);
+
+        // Linear-phase delay plus any block delay of the chosen engine
+        let group_delay = (filter_length - 1) as f64 / 2.0 + latency as f64;
         
-        let filter_length = coeffs.len();
-        let group_delay = (filter_length - 1) as f64 / 2.0;
+        // Update filter chain: position 1 is user filter (after gate)
+        // Picked up by the processing thread at the next block boundary
+        self.filter_chain.publish(USER_FILTER_STAGE, Some(filter));
         
-        // Choose implementation based on filter length
-        let new_filter: Box<dyn FilterTrait + Send> = if filter_length > 128 {
-            // Use FFT-based convolution for long filters
-            Box::new(FastFirFilter::new(coeffs, 2048))
+        (filter_length, group_delay)
+    }
+
+    /// Build the user filter stage for the given coefficients
+    ///
+    /// # Arguments
+    /// * `coeffs` - Filter coefficients
+    /// * `block_size` - Chain block size the engines are calibrated at
+    /// * `max_latency` - Largest accepted engine latency in samples
+    ///
+    /// # Returns
+    /// Filter stage and the latency its convolution engine adds in samples
+    fn build_user_filter(coeffs: Vec<f64>, block_size: usize, max_latency: usize) -> (Box<dyn FilterTrait + Send>, usize) {
+        // Choose the implementation measured fastest on this CPU at the
+        // chain block size (benchmarked once, then cached on disk), within
+        // the latency budget
+        let calibration = calibration_for(block_size);
+        let engine = calibration.select(coeffs.len(), max_latency);
+        let filter: Box<dyn FilterTrait + Send> = match engine {
+            // Partitioned convolution: latency and per-block cost stay flat
+            // regardless of length
+            ConvolutionEngine::Partitioned => Box::new(PartitionedFirFilter::new(coeffs, PARTITION_SIZE)),
+            // FFT overlap-add sized for the blocks the thread actually sees
+            ConvolutionEngine::FastFft => Box::new(FastFirFilter::new(coeffs, calibration.block_size)),
+            // SIMD direct convolution (switches to the folded kernel
+            // automatically for symmetric, linear-phase designs)
+            ConvolutionEngine::Direct => Box::new(BlockFirFilter::new(coeffs)),
+        };
+        (filter, engine.latency())
+    }
+
+    /// Set the largest convolution latency accepted for the user filter
+    ///
+    /// The default (`DEFAULT_MAX_FILTER_LATENCY`, one partition) lets long
+    /// filters use partitioned convolution at the cost of that many samples
+    /// of delay, which the reported group delay includes. 0 restricts the
+    /// choice to engines without block delay. Applies to the next
+    /// `design_filter`.
+    pub fn set_max_filter_latency(&mut self, samples: usize) {
+        self.max_filter_latency = samples;
+    }
+
+    /// Get the largest convolution latency accepted for the user filter
+    pub fn max_filter_latency(&self) -> usize {
+        self.max_filter_latency
+    }
+
+    /// Build an offline pipeline with the current live settings
+    ///
+    /// Fresh instances of the noise gate, user filter (same convolution
+    /// engine), analyzer configuration, averaging and overlap; bypass is
+    /// honoured. Does not touch the live stream.
+    ///
+    /// # Arguments
+    /// * `block_size` - Samples per chain block
+    /// * `sample_rate` - Sample rate of the recording (None = current rate)
+    pub fn offline_pipeline(&self, block_size: usize, sample_rate: Option<f64>) -> OfflinePipeline {
+        let sample_rate = sample_rate.unwrap_or(self.sample_rate);
+        let bypassed = self.bypass.load(Ordering::SeqCst);
+
+        let gate: Stage = if self.gate_enabled.load(Ordering::SeqCst) && !bypassed {
+            let (threshold_db, attack_ms, release_ms) = self
+                .gate_params
+                .lock()
+                .map(|params| *params)
+                .unwrap_or((-40.0, 10.0, 100.0));
+            Some(Box::new(NoiseGate::new(threshold_db, attack_ms, release_ms, sample_rate)))
         } else {
-            // Use direct convolution for short filters
-            Box::new(FirFilter::new(coeffs))
+            None
         };
-        
-        // Update filter chain: position 1 is user filter (after gate)
-        if let Ok(mut chain_guard) = self.filter_chain.lock() {
-            chain_guard[1] = Some(new_filter);
-        }
-        
-        Ok((filter_length, group_delay))
+
+        let filter: Stage = match &self.filter_coefficients {
+            Some(coeffs) if !bypassed => {
+                Some(Self::build_user_filter(coeffs.clone(), self.min_block_fill, self.max_filter_latency).0)
+            },
+            _ => None,
+        };
+
+        let (config, averaging) = self
+            .analyzer
+            .lock()
+            .map(|analyzer| (analyzer.config().clone(), analyzer.averaging()))
+            .unwrap_or_default();
+        let hop = hop_for_overlap(config.fft_size, self.analysis_overlap());
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig { sample_rate, ..config });
+        analyzer.set_averaging(averaging);
+
+        OfflinePipeline::new(gate, filter, analyzer, hop, block_size)
     }
     
+    /// Set crossfade length used when filters are swapped
+    ///
+    /// # Arguments
+    /// * `samples` - Crossfade length in samples (0 = hard switch)
+    pub fn set_crossfade_samples(&self, samples: usize) {
+        self.filter_chain.set_crossfade_samples(samples);
+    }
+
+    /// Get crossfade length in samples
+    pub fn crossfade_samples(&self) -> usize {
+        self.filter_chain.crossfade_samples()
+    }
+
+    /// Set minimum buffered samples before the processing thread is woken
+    ///
+    /// Larger values mean fewer wakeups (lower CPU) at the cost of latency.
+    pub fn set_min_block_fill(&mut self, samples: usize) {
+        self.min_block_fill = samples.clamp(1, MAX_WAVEFORM_SIZE);
+
+        if let Some(notifier) = &self.notifier {
+            notifier.set_min_fill(self.min_block_fill);
+        }
+    }
+
+    /// Get minimum buffered samples before the processing thread is woken
+    pub fn min_block_fill(&self) -> usize {
+        self.min_block_fill
+    }
+
+    /// Get processing thread statistics for the current run
+    pub fn get_stats(&self) -> ProcessingStats {
+        let elapsed_seconds = self
+            .started_at
+            .map(|t| t.elapsed().as_secs_f64())
+            .unwrap_or(0.0);
+
+        let wakeups = self.counters.wakeups.load(Ordering::Relaxed);
+        let blocks = self.counters.blocks.load(Ordering::Relaxed);
+        let samples = self.counters.samples.load(Ordering::Relaxed);
+        let analyses = self.counters.analyses.load(Ordering::Relaxed);
+
+        ProcessingStats {
+            wakeups_per_second: if elapsed_seconds > 0.0 { wakeups as f64 / elapsed_seconds } else { 0.0 },
+            average_block_fill: if blocks > 0 { samples as f64 / blocks as f64 } else { 0.0 },
+            wakeups,
+            blocks,
+            analyses_per_second: if elapsed_seconds > 0.0 { analyses as f64 / elapsed_seconds } else { 0.0 },
+            elapsed_seconds,
+        }
+    }
+
     /// Set bypass state
     pub fn set_bypass(&self, bypass: bool) {
         self.bypass.store(bypass, Ordering::SeqCst);
@@ -387,12 +1019,17 @@ impl AudioProcessor {
         }
         
         // Start audio output
-        let output = AudioOutput::from_default_device(consumer)
-            .map_err(|e| format!("Failed to start audio output: {}", e))?;
+        let (output, underruns) = StreamHost::spawn("audio-output", move || {
+            let output = AudioOutput::from_default_device(consumer)?;
+            let underruns = output.underrun_counter();
+            Ok((output, underruns))
+        })
+        .map_err(|e| format!("Failed to start audio output: {}", e))?;
         
         output.start().map_err(|e| format!("Failed to start output stream: {}", e))?;
         
         self.audio_output = Some(output);
+        self.output_underruns = Some(underruns);
         self.monitoring.store(true, Ordering::SeqCst);
         
         Ok(())
@@ -407,6 +1044,7 @@ impl AudioProcessor {
         }
         
         self.audio_output = None;
+        self.output_underruns = None;
         
         // Clear output producer
         if let Ok(mut producer_guard) = self.output_producer.lock() {
@@ -418,6 +1056,14 @@ impl AudioProcessor {
     pub fn is_monitoring(&self) -> bool {
         self.monitoring.load(Ordering::SeqCst)
     }
+
+    /// Get number of monitoring output underruns (0 if monitoring is off)
+    pub fn monitoring_underruns(&self) -> u64 {
+        self.output_underruns
+            .as_ref()
+            .map(|underruns| underruns.load(Ordering::Relaxed))
+            .unwrap_or(0)
+    }
     
     /// Update FFT configuration
     pub fn update_fft_config(&self, fft_size: usize, window_type: WindowType) {
@@ -431,14 +1077,187 @@ impl AudioProcessor {
         }
     }
     
-    /// Get latest processing results (called from Python at 60 Hz)
-    pub fn get_results(&self) -> Option<ProcessingResults> {
-        if let Ok(mut results_guard) = self.results.lock() {
-            results_guard.take()
-        } else {
-            None
+    /// Set overlap between consecutive analysis frames
+    ///
+    /// The spectrum is recomputed every `fft_size * (1 - overlap)` samples
+    /// over the last `fft_size` samples, whatever the capture block size.
+    ///
+    /// # Arguments
+    /// * `overlap` - Overlap fraction (0.0 = none, 0.5 = 50%, 0.75 = 75%)
+    pub fn set_analysis_overlap(&self, overlap: f64) {
+        let overlap = if overlap.is_finite() { overlap.clamp(0.0, 0.99) } else { DEFAULT_OVERLAP };
+        self.analysis_overlap.store(overlap.to_bits(), Ordering::Relaxed);
+    }
+
+    /// Get overlap between consecutive analysis frames
+    pub fn analysis_overlap(&self) -> f64 {
+        f64::from_bits(self.analysis_overlap.load(Ordering::Relaxed))
+    }
+
+    /// Set spectrum analysis rate
+    ///
+    /// Filtering and monitoring keep running at audio rate; only the
+    /// spectrum computation is skipped between analyses.
+    pub fn set_analysis_rate(&self, rate: AnalysisRate) {
+        self.analysis_rate.store(rate.encode(), Ordering::Relaxed);
+        self.analysis_requested.store(true, Ordering::Relaxed);
+    }
+
+    /// Get spectrum analysis rate
+    pub fn analysis_rate(&self) -> AnalysisRate {
+        AnalysisRate::decode(self.analysis_rate.load(Ordering::Relaxed))
+    }
+
+    /// Set spectrum averaging mode
+    ///
+    /// Averages accumulate in the power domain inside the analyzer over every
+    /// STFT frame; dB conversion happens only when a spectrum is published.
+    pub fn set_averaging(&self, mode: AveragingMode) {
+        if let Ok(mut analyzer) = self.analyzer.lock() {
+            analyzer.set_averaging(mode);
+        }
+    }
+
+    /// Get spectrum averaging mode
+    pub fn averaging(&self) -> AveragingMode {
+        self.analyzer
+            .lock()
+            .map(|analyzer| analyzer.averaging())
+            .unwrap_or_default()
+    }
+
+    /// Access the spectrogram (waterfall) history
+    ///
+    /// Holds the ring lock for the duration of `f`; the processing thread
+    /// waits for it only when appending a row.
+    pub fn with_spectrogram<R>(&self, f: impl FnOnce(&SpectrogramRing) -> R) -> Option<R> {
+        self.spectrogram.lock().ok().map(|ring| f(&ring))
+    }
+
+    /// Discard all spectrogram rows
+    pub fn clear_spectrogram(&self) {
+        if let Ok(mut ring) = self.spectrogram.lock() {
+            ring.clear();
+        }
+        if let Ok(mut renderer) = self.waterfall.lock() {
+            renderer.clear();
+        }
+    }
+
+    /// Enable or disable RGBA waterfall rendering
+    ///
+    /// When enabled, every spectrogram row is also quantized to 8 bits and
+    /// mapped through the colormap LUT in the processing thread.
+    pub fn set_waterfall_rendering(&self, enabled: bool) {
+        self.waterfall_rendering.store(enabled, Ordering::Relaxed);
+    }
+
+    /// Check whether RGBA waterfall rendering is enabled
+    pub fn waterfall_rendering(&self) -> bool {
+        self.waterfall_rendering.load(Ordering::Relaxed)
+    }
+
+    /// Set the waterfall colormap
+    ///
+    /// # Arguments
+    /// * `stops` - RGB colors from lowest to highest level, evenly spaced
+    pub fn set_waterfall_colormap(&self, stops: &[[u8; 3]]) {
+        if let Ok(mut renderer) = self.waterfall.lock() {
+            renderer.set_colormap(stops);
         }
     }
+
+    /// Access the rendered waterfall image rows (`bins * 4` bytes each)
+    pub fn with_waterfall_image<R>(&self, f: impl FnOnce(&SpectrogramRing<u8>) -> R) -> Option<R> {
+        self.waterfall.lock().ok().map(|renderer| f(renderer.image()))
+    }
+
+    /// Get the frame notification shared with the processing thread
+    ///
+    /// `FrameSignal::wait_after` blocks until a newer results frame is
+    /// published (or the processor stops), without polling.
+    pub fn frame_signal(&self) -> Arc<FrameSignal> {
+        Arc::clone(&self.frame_signal)
+    }
+
+    /// Set how many frames the batched result queue holds
+    ///
+    /// Takes effect on the next `start`. With a queue, every published frame
+    /// is also kept until read with `result_queue`, so readers polling slower
+    /// than the block rate see all frames; 0 disables the queue.
+    pub fn set_result_queue_capacity(&mut self, capacity: usize) {
+        self.result_queue_capacity = capacity;
+    }
+
+    /// Get the batched result queue capacity (0 = disabled)
+    pub fn result_queue_capacity(&self) -> usize {
+        self.result_queue_capacity
+    }
+
+    /// Reader end of the batched result queue (None if disabled or not started)
+    pub fn result_queue(&mut self) -> Option<&mut FrameQueueOutput<ProcessingResults>> {
+        self.result_queue.as_mut()
+    }
+
+    /// Configure the oscilloscope trigger
+    ///
+    /// Frames are captured in the processing thread from a rolling history
+    /// and published only when the trigger fires (or, in auto mode, after the
+    /// timeout). `frame_len` is clamped to `MAX_WAVEFORM_SIZE`.
+    ///
+    /// # Arguments
+    /// * `config` - Trigger parameters, or None to disable the trigger
+    /// * `source` - Signal the trigger watches
+    pub fn set_trigger(&self, config: Option<TriggerConfig>, source: TriggerSource) {
+        let config = config.map(|mut config| {
+            config.frame_len = config.frame_len.clamp(1, MAX_WAVEFORM_SIZE);
+            config
+        });
+
+        if let Ok(mut trigger) = self.trigger.lock() {
+            *trigger = config.map(|config| (config, source));
+        }
+        self.trigger_version.fetch_add(1, Ordering::Release);
+    }
+
+    /// Get the oscilloscope trigger configuration (None = disabled)
+    pub fn trigger(&self) -> Option<(TriggerConfig, TriggerSource)> {
+        self.trigger.lock().ok().and_then(|trigger| *trigger)
+    }
+
+    /// Get the latest triggered frame
+    ///
+    /// # Returns
+    /// The newest frame published since the previous call, or None
+    pub fn get_scope_frame(&mut self) -> Option<&ScopeFrame> {
+        self.scope.as_mut().and_then(|output| output.read())
+    }
+
+    /// Get the spectrum frequency axis in Hz
+    ///
+    /// # Returns
+    /// (configuration generation, bin frequencies); compare the generation
+    /// with `ProcessingResults::spectrum_generation` to tell whether a
+    /// frame's spectrum matches this axis
+    pub fn frequency_axis(&self) -> Option<(u64, Vec<f64>)> {
+        self.analyzer
+            .lock()
+            .ok()
+            .map(|analyzer| (analyzer.generation(), analyzer.frequency_axis_hz().to_vec()))
+    }
+    
+    /// Get latest processing results (called from Python at 60 Hz)
+    ///
+    /// Returns the newest complete frame, or None if no frame was published
+    /// since the previous call. Never blocks the processing thread.
+    pub fn get_results(&mut self) -> Option<&ProcessingResults> {
+        // A reader is polling: allow the next on-demand analysis
+        self.analysis_requested.store(true, Ordering::Relaxed);
+
+        // Free stages the processing thread replaced (never freed there)
+        self.filter_chain.collect_retired();
+        self.results.as_mut().and_then(|output| output.read())
+    }
     
     /// List available audio devices
     pub fn list_devices() -> Result<Vec<String>, String> {
@@ -473,14 +1292,10 @@ impl AudioProcessor {
                 self.sample_rate,
             ));
             
-            if let Ok(mut chain_guard) = self.filter_chain.lock() {
-                chain_guard[0] = Some(gate);
-            }
+            self.filter_chain.publish(GATE_STAGE, Some(gate));
         } else {
             // Remove gate (position 0)
-            if let Ok(mut chain_guard) = self.filter_chain.lock() {
-                chain_guard[0] = None;
-            }
+            self.filter_chain.publish(GATE_STAGE, None);
         }
     }
     
@@ -495,3 +1310,38 @@ impl Drop for AudioProcessor {
         self.stop();
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_processor_is_send() {
+        fn assert_send<T: Send>() {}
+        assert_send::<AudioProcessor>();
+
+        // Handed across threads by bindings that release the GIL
+        assert_send::<OpenedInput>();
+        assert_send::<RunningCapture>();
+        assert_send::<PreparedFilter>();
+    }
+
+    #[test]
+    fn test_long_filter_uses_partitioned_engine_by_default() {
+        let processor = AudioProcessor::new();
+
+        // Narrow transition: a few thousand taps
+        let prepared = AudioProcessor::prepare_filter(
+            0.1,
+            0.3,
+            0.008,
+            WindowType::Hamming,
+            FilterType::Bandpass,
+            processor.min_block_fill(),
+            processor.max_filter_latency(),
+        );
+
+        assert!(prepared.coefficients.len() > 2048);
+        assert_eq!(prepared.latency, ConvolutionEngine::Partitioned.latency());
+    }
+}
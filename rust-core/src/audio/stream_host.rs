@@ -0,0 +1,210 @@
+//! Dedicated threads owning cpal streams
+//!
+//! cpal streams are `!Send` on several hosts (WASAPI, CoreAudio), which would
+//! pin `AudioProcessor` to the thread that created it. Instead, each stream
+//! is built, played and dropped on its own small thread; the handle only
+//! holds a command channel, so it can move freely between threads.
+
+use super::input::{AudioError, AudioInput};
+use super::output::AudioOutput;
+use std::sync::mpsc::{self, Sender};
+use std::thread::JoinHandle;
+
+/// Stream controls available through a `StreamHost`
+pub trait HostedStream {
+    /// Start or resume the stream
+    fn start(&self) -> Result<(), AudioError>;
+
+    /// Pause the stream
+    fn pause(&self) -> Result<(), AudioError>;
+}
+
+impl HostedStream for AudioInput {
+    fn start(&self) -> Result<(), AudioError> {
+        AudioInput::start(self)
+    }
+
+    fn pause(&self) -> Result<(), AudioError> {
+        AudioInput::pause(self)
+    }
+}
+
+impl HostedStream for AudioOutput {
+    fn start(&self) -> Result<(), AudioError> {
+        AudioOutput::start(self)
+    }
+
+    fn pause(&self) -> Result<(), AudioError> {
+        AudioOutput::pause(self)
+    }
+}
+
+/// Request sent to the stream thread (with a reply channel)
+enum StreamCommand {
+    Start(Sender<Result<(), AudioError>>),
+    Pause(Sender<Result<(), AudioError>>),
+}
+
+/// Handle to a stream living on its own thread
+///
+/// Dropping the handle closes the command channel; the thread then drops
+/// the stream (stopping it) and exits, and the drop waits for it.
+pub struct StreamHost {
+    commands: Option<Sender<StreamCommand>>,
+    thread: Option<JoinHandle<()>>,
+}
+
+impl StreamHost {
+    /// Build a stream on a new thread
+    ///
+    /// # Arguments
+    /// * `name` - Thread name
+    /// * `build` - Creates the stream (runs on the new thread) and returns
+    ///   it with any `Send` information the caller needs
+    ///
+    /// # Returns
+    /// Host handle and the information returned by `build`
+    pub fn spawn<S, T, F>(name: &str, build: F) -> Result<(Self, T), AudioError>
+    where
+        S: HostedStream + 'static,
+        T: Send + 'static,
+        F: FnOnce() -> Result<(S, T), AudioError> + Send + 'static,
+    {
+        let (ready_tx, ready_rx) = mpsc::channel();
+        let (commands, command_rx) = mpsc::channel::<StreamCommand>();
+
+        let thread = std::thread::Builder::new()
+            .name(name.to_string())
+            .spawn(move || {
+                let stream = match build() {
+                    Ok((stream, info)) => {
+                        let _ = ready_tx.send(Ok(info));
+                        stream
+                    }
+                    Err(e) => {
+                        let _ = ready_tx.send(Err(e));
+                        return;
+                    }
+                };
+
+                for command in command_rx {
+                    match command {
+                        StreamCommand::Start(reply) => {
+                            let _ = reply.send(stream.start());
+                        }
+                        StreamCommand::Pause(reply) => {
+                            let _ = reply.send(stream.pause());
+                        }
+                    }
+                }
+            })
+            .map_err(|e| AudioError::StreamThread(e.to_string()))?;
+
+        match ready_rx.recv() {
+            Ok(Ok(info)) => Ok((
+                Self {
+                    commands: Some(commands),
+                    thread: Some(thread),
+                },
+                info,
+            )),
+            Ok(Err(e)) => {
+                let _ = thread.join();
+                Err(e)
+            }
+            Err(_) => {
+                let _ = thread.join();
+                Err(AudioError::StreamThread("stream thread exited during setup".to_string()))
+            }
+        }
+    }
+
+    /// Start or resume the stream
+    pub fn start(&self) -> Result<(), AudioError> {
+        self.request(StreamCommand::Start)
+    }
+
+    /// Pause the stream
+    pub fn pause(&self) -> Result<(), AudioError> {
+        self.request(StreamCommand::Pause)
+    }
+
+    /// Send a command and wait for the stream thread's reply
+    fn request(&self, command: fn(Sender<Result<(), AudioError>>) -> StreamCommand) -> Result<(), AudioError> {
+        let stopped = || AudioError::StreamThread("stream thread stopped".to_string());
+        let (reply_tx, reply_rx) = mpsc::channel();
+
+        self.commands
+            .as_ref()
+            .ok_or_else(stopped)?
+            .send(command(reply_tx))
+            .map_err(|_| stopped())?;
+        reply_rx.recv().map_err(|_| stopped())?
+    }
+}
+
+impl Drop for StreamHost {
+    fn drop(&mut self) {
+        // Closing the channel ends the command loop and drops the stream
+        self.commands.take();
+        if let Some(thread) = self.thread.take() {
+            let _ = thread.join();
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::sync::Arc;
+    use std::sync::atomic::{AtomicBool, Ordering};
+
+    /// Stand-in stream that is deliberately `!Send` (like cpal's)
+    struct FakeStream {
+        playing: Arc<AtomicBool>,
+        _not_send: std::marker::PhantomData<*const ()>,
+    }
+
+    impl HostedStream for FakeStream {
+        fn start(&self) -> Result<(), AudioError> {
+            self.playing.store(true, Ordering::SeqCst);
+            Ok(())
+        }
+
+        fn pause(&self) -> Result<(), AudioError> {
+            self.playing.store(false, Ordering::SeqCst);
+            Ok(())
+        }
+    }
+
+    #[test]
+    fn test_stream_host_controls_stream_on_its_thread() {
+        let playing = Arc::new(AtomicBool::new(false));
+        let flag = Arc::clone(&playing);
+
+        let (host, info) = StreamHost::spawn("test-stream", move || {
+            Ok((FakeStream { playing: flag, _not_send: std::marker::PhantomData }, 42))
+        })
+        .unwrap();
+        assert_eq!(info, 42);
+
+        // The handle can move to another thread
+        let host = std::thread::spawn(move || {
+            host.start().unwrap();
+            host
+        })
+        .join()
+        .unwrap();
+        assert!(playing.load(Ordering::SeqCst));
+
+        host.pause().unwrap();
+        assert!(!playing.load(Ordering::SeqCst));
+        drop(host);
+    }
+
+    #[test]
+    fn test_stream_host_reports_build_errors() {
+        let result = StreamHost::spawn::<FakeStream, (), _>("test-stream", || Err(AudioError::NoDevice));
+        assert!(matches!(result, Err(AudioError::NoDevice)));
+    }
+}
@@ -0,0 +1,302 @@
+//! Oscilloscope trigger engine
+//!
+//! Watches a signal for level crossings and captures frames aligned on the
+//! trigger point from a rolling history, so successive frames line up on
+//! screen. A companion channel (e.g. the unfiltered input) is captured with
+//! the same alignment.
+
+/// Edge that fires the trigger
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum TriggerSlope {
+    /// Signal crosses the level going up
+    Rising,
+    /// Signal crosses the level going down
+    Falling,
+}
+
+/// What happens when no trigger occurs
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum TriggerMode {
+    /// Emit an untriggered frame after `auto_timeout` samples without a trigger
+    Auto,
+    /// Emit frames only when the trigger fires
+    Normal,
+}
+
+/// Trigger parameters (all lengths in samples)
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct TriggerConfig {
+    /// Trigger level
+    pub level: f64,
+
+    /// Edge direction
+    pub slope: TriggerSlope,
+
+    /// Captured frame length
+    pub frame_len: usize,
+
+    /// Samples before the trigger point included in the frame
+    pub pre_trigger: usize,
+
+    /// Minimum distance between trigger points
+    pub holdoff: usize,
+
+    /// Auto or normal mode
+    pub mode: TriggerMode,
+
+    /// Samples without a trigger before auto mode free-runs
+    pub auto_timeout: usize,
+}
+
+impl Default for TriggerConfig {
+    fn default() -> Self {
+        Self {
+            level: 0.0,
+            slope: TriggerSlope::Rising,
+            frame_len: 2048,
+            pre_trigger: 512,
+            holdoff: 0,
+            mode: TriggerMode::Auto,
+            auto_timeout: 4800,  // 100 ms at 48 kHz
+        }
+    }
+}
+
+/// Capture state
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum TriggerState {
+    /// Looking for a crossing
+    Armed,
+    /// Triggered; waiting for the remaining post-trigger samples
+    Capturing { remaining: usize },
+}
+
+/// Level/slope trigger with pre-trigger history
+pub struct TriggerEngine {
+    config: TriggerConfig,
+
+    /// Rolling history of the trigger channel (`frame_len`, circular)
+    history: Vec<f64>,
+
+    /// Rolling history of the companion channel
+    companion_history: Vec<f64>,
+
+    /// Next write position in both histories
+    write_pos: usize,
+
+    /// Unrolled frames handed to the caller
+    frame: Vec<f64>,
+    companion_frame: Vec<f64>,
+
+    /// Last sample seen (crossing detection across blocks)
+    previous: f64,
+
+    state: TriggerState,
+
+    /// Samples since the last trigger point
+    since_trigger: usize,
+
+    /// Samples since the last emitted frame
+    since_frame: usize,
+}
+
+impl TriggerEngine {
+    /// Create new trigger engine
+    ///
+    /// `frame_len` is clamped to at least 1 and `pre_trigger` to the frame.
+    pub fn new(config: TriggerConfig) -> Self {
+        let config = Self::clamp_config(config);
+
+        Self {
+            history: vec![0.0; config.frame_len],
+            companion_history: vec![0.0; config.frame_len],
+            write_pos: 0,
+            frame: vec![0.0; config.frame_len],
+            companion_frame: vec![0.0; config.frame_len],
+            previous: 0.0,
+            state: TriggerState::Armed,
+            since_trigger: usize::MAX,
+            since_frame: 0,
+            config,
+        }
+    }
+
+    fn clamp_config(mut config: TriggerConfig) -> TriggerConfig {
+        config.frame_len = config.frame_len.max(1);
+        config.pre_trigger = config.pre_trigger.min(config.frame_len - 1);
+        config
+    }
+
+    /// Feed samples, calling `on_frame` for every captured frame
+    ///
+    /// # Arguments
+    /// * `signal` - Trigger channel
+    /// * `companion` - Second channel captured with the same alignment
+    /// * `on_frame` - Receives (signal frame, companion frame, triggered);
+    ///   `triggered` is false for auto-mode free-run frames, otherwise the
+    ///   trigger point is at index `pre_trigger`
+    ///
+    /// # Returns
+    /// Number of frames emitted
+    pub fn push<F: FnMut(&[f64], &[f64], bool)>(&mut self, signal: &[f64], companion: &[f64], mut on_frame: F) -> usize {
+        let level = self.config.level;
+        let post_trigger = self.config.frame_len - self.config.pre_trigger - 1;
+        let mut frames = 0;
+
+        for (&x, &y) in signal.iter().zip(companion) {
+            self.history[self.write_pos] = x;
+            self.companion_history[self.write_pos] = y;
+            self.write_pos = (self.write_pos + 1) % self.config.frame_len;
+            self.since_trigger = self.since_trigger.saturating_add(1);
+            self.since_frame = self.since_frame.saturating_add(1);
+
+            match self.state {
+                TriggerState::Armed => {
+                    let crossed = match self.config.slope {
+                        TriggerSlope::Rising => self.previous < level && x >= level,
+                        TriggerSlope::Falling => self.previous > level && x <= level,
+                    };
+
+                    if crossed && self.since_trigger > self.config.holdoff {
+                        self.since_trigger = 0;
+                        if post_trigger == 0 {
+                            self.emit(true, &mut on_frame);
+                            frames += 1;
+                        } else {
+                            self.state = TriggerState::Capturing { remaining: post_trigger };
+                        }
+                    } else if self.config.mode == TriggerMode::Auto && self.since_frame >= self.config.auto_timeout {
+                        self.emit(false, &mut on_frame);
+                        frames += 1;
+                    }
+                }
+                TriggerState::Capturing { remaining } => {
+                    if remaining <= 1 {
+                        self.emit(true, &mut on_frame);
+                        frames += 1;
+                    } else {
+                        self.state = TriggerState::Capturing { remaining: remaining - 1 };
+                    }
+                }
+            }
+
+            self.previous = x;
+        }
+
+        frames
+    }
+
+    /// Hand the latest `frame_len` samples of both channels to `on_frame`
+    fn emit<F: FnMut(&[f64], &[f64], bool)>(&mut self, triggered: bool, on_frame: &mut F) {
+        let tail = self.config.frame_len - self.write_pos;
+        self.frame[..tail].copy_from_slice(&self.history[self.write_pos..]);
+        self.frame[tail..].copy_from_slice(&self.history[..self.write_pos]);
+        self.companion_frame[..tail].copy_from_slice(&self.companion_history[self.write_pos..]);
+        self.companion_frame[tail..].copy_from_slice(&self.companion_history[..self.write_pos]);
+
+        on_frame(&self.frame, &self.companion_frame, triggered);
+        self.state = TriggerState::Armed;
+        self.since_frame = 0;
+    }
+
+    /// Get trigger configuration
+    pub fn config(&self) -> &TriggerConfig {
+        &self.config
+    }
+
+    /// Clear history and re-arm
+    pub fn reset(&mut self) {
+        self.history.fill(0.0);
+        self.companion_history.fill(0.0);
+        self.write_pos = 0;
+        self.previous = 0.0;
+        self.state = TriggerState::Armed;
+        self.since_trigger = usize::MAX;
+        self.since_frame = 0;
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sine(len: usize, period: usize) -> Vec<f64> {
+        (0..len)
+            .map(|i| (2.0 * std::f64::consts::PI * (i as f64 + 0.5) / period as f64).sin())
+            .collect()
+    }
+
+    #[test]
+    fn test_frames_aligned_on_trigger_point() {
+        let config = TriggerConfig {
+            frame_len: 256,
+            pre_trigger: 64,
+            mode: TriggerMode::Normal,
+            ..TriggerConfig::default()
+        };
+        let mut engine = TriggerEngine::new(config);
+        let signal = sine(10000, 100);
+
+        let mut frames = Vec::new();
+        for chunk in signal.chunks(333) {
+            engine.push(chunk, chunk, |frame, companion, triggered| {
+                assert!(triggered);
+                assert_eq!(frame, companion);
+                frames.push(frame.to_vec());
+            });
+        }
+
+        assert!(frames.len() > 10);
+        for frame in &frames {
+            // Rising crossing of 0.0 exactly at the pre-trigger index
+            assert!(frame[63] < 0.0 && frame[64] >= 0.0);
+            assert!(frame.iter().zip(&frames[0]).all(|(a, b)| (a - b).abs() < 1e-9));
+        }
+    }
+
+    #[test]
+    fn test_holdoff_and_slope() {
+        let config = TriggerConfig {
+            frame_len: 10,
+            pre_trigger: 2,
+            holdoff: 250,
+            slope: TriggerSlope::Falling,
+            mode: TriggerMode::Normal,
+            ..TriggerConfig::default()
+        };
+        let mut engine = TriggerEngine::new(config);
+        let signal = sine(1000, 100);
+
+        let mut count = 0;
+        engine.push(&signal, &signal, |frame, _, _| {
+            assert!(frame[1] > 0.0 && frame[2] <= 0.0);
+            count += 1;
+        });
+
+        // Falling crossings every 100 samples, holdoff skips two of three
+        assert_eq!(count, 4);
+    }
+
+    #[test]
+    fn test_auto_mode_free_runs_without_trigger() {
+        let config = TriggerConfig {
+            frame_len: 64,
+            level: 2.0,
+            auto_timeout: 100,
+            ..TriggerConfig::default()
+        };
+        let mut engine = TriggerEngine::new(config);
+        let signal = sine(1000, 50);
+
+        let mut untriggered = 0;
+        engine.push(&signal, &signal, |_, _, triggered| {
+            assert!(!triggered);
+            untriggered += 1;
+        });
+        assert_eq!(untriggered, 10);
+
+        // Normal mode stays silent
+        let mut engine = TriggerEngine::new(TriggerConfig { mode: TriggerMode::Normal, ..config });
+        assert_eq!(engine.push(&signal, &signal, |_, _, _| {}), 0);
+    }
+}
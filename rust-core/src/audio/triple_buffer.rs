@@ -0,0 +1,180 @@
+//! Wait-free triple buffer for publishing processing results
+//!
+//! The writer always owns one slot, the reader owns another, and the third
+//! ("back") slot is exchanged through a single atomic index. Publishing is a
+//! single atomic swap (no lock, no allocation, no copy) and the reader always
+//! observes the newest complete frame.
+
+use std::cell::UnsafeCell;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+/// Set in the shared back index when the back slot holds an unread frame
+const DIRTY_BIT: usize = 0b100;
+
+/// Mask extracting the slot index from the shared back index
+const INDEX_MASK: usize = 0b011;
+
+/// Storage shared by the writer and reader ends
+struct Shared<T> {
+    slots: [UnsafeCell<T>; 3],
+    back: AtomicUsize,
+}
+
+// Each slot is only ever accessed by the end that currently owns its index,
+// and ownership is transferred through `back` with acquire/release ordering.
+unsafe impl<T: Send> Sync for Shared<T> {}
+
+/// Triple buffer holding three pre-allocated instances of `T`
+pub struct TripleBuffer<T> {
+    shared: Arc<Shared<T>>,
+}
+
+impl<T: Clone> TripleBuffer<T> {
+    /// Create new triple buffer with every slot initialised to `initial`
+    pub fn new(initial: T) -> Self {
+        Self {
+            shared: Arc::new(Shared {
+                slots: [
+                    UnsafeCell::new(initial.clone()),
+                    UnsafeCell::new(initial.clone()),
+                    UnsafeCell::new(initial),
+                ],
+                back: AtomicUsize::new(1),
+            }),
+        }
+    }
+}
+
+impl<T> TripleBuffer<T> {
+    /// Split into writer and reader ends
+    pub fn split(self) -> (TripleBufferInput<T>, TripleBufferOutput<T>) {
+        (
+            TripleBufferInput {
+                shared: Arc::clone(&self.shared),
+                write_index: 0,
+            },
+            TripleBufferOutput {
+                shared: self.shared,
+                read_index: 2,
+            },
+        )
+    }
+}
+
+/// Writer end of a triple buffer (owned by the processing thread)
+pub struct TripleBufferInput<T> {
+    shared: Arc<Shared<T>>,
+    write_index: usize,
+}
+
+impl<T> TripleBufferInput<T> {
+    /// Get the slot currently owned by the writer
+    ///
+    /// The slot holds a stale frame from an earlier publish, so every field
+    /// that the reader relies on must be rewritten before calling `publish`.
+    pub fn write_slot(&mut self) -> &mut T {
+        unsafe { &mut *self.shared.slots[self.write_index].get() }
+    }
+
+    /// Publish the write slot as the newest frame (wait-free)
+    pub fn publish(&mut self) {
+        let previous = self
+            .shared
+            .back
+            .swap(self.write_index | DIRTY_BIT, Ordering::AcqRel);
+        self.write_index = previous & INDEX_MASK;
+    }
+}
+
+/// Reader end of a triple buffer
+pub struct TripleBufferOutput<T> {
+    shared: Arc<Shared<T>>,
+    read_index: usize,
+}
+
+impl<T> TripleBufferOutput<T> {
+    /// Check whether a frame has been published since the last `read`
+    pub fn has_update(&self) -> bool {
+        self.shared.back.load(Ordering::Acquire) & DIRTY_BIT != 0
+    }
+
+    /// Acquire the newest published frame
+    ///
+    /// # Returns
+    /// The newest frame, or None if nothing was published since the last call
+    pub fn read(&mut self) -> Option<&T> {
+        if !self.has_update() {
+            return None;
+        }
+
+        let previous = self.shared.back.swap(self.read_index, Ordering::AcqRel);
+        self.read_index = previous & INDEX_MASK;
+
+        Some(unsafe { &*self.shared.slots[self.read_index].get() })
+    }
+
+    /// Get the most recently acquired frame without checking for updates
+    pub fn latest(&self) -> &T {
+        unsafe { &*self.shared.slots[self.read_index].get() }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_triple_buffer_publish_read() {
+        let (mut input, mut output) = TripleBuffer::new(0u32).split();
+
+        // Nothing published yet
+        assert!(output.read().is_none());
+
+        *input.write_slot() = 7;
+        input.publish();
+
+        assert_eq!(output.read(), Some(&7));
+
+        // Same frame is not returned twice
+        assert!(output.read().is_none());
+        assert_eq!(*output.latest(), 7);
+    }
+
+    #[test]
+    fn test_triple_buffer_newest_wins() {
+        let (mut input, mut output) = TripleBuffer::new(0u32).split();
+
+        for value in 1..=5 {
+            *input.write_slot() = value;
+            input.publish();
+        }
+
+        // Reader skips straight to the newest complete frame
+        assert_eq!(output.read(), Some(&5));
+    }
+
+    #[test]
+    fn test_triple_buffer_concurrent() {
+        let (mut input, mut output) = TripleBuffer::new([0u64; 64]).split();
+
+        let writer = std::thread::spawn(move || {
+            for value in 1..=20_000u64 {
+                input.write_slot().fill(value);
+                input.publish();
+            }
+        });
+
+        let mut last = 0;
+        while last < 20_000 {
+            if let Some(frame) = output.read() {
+                // Frames are never torn and never go backwards
+                assert!(frame.iter().all(|&v| v == frame[0]));
+                assert!(frame[0] >= last);
+                last = frame[0];
+            }
+        }
+
+        writer.join().unwrap();
+    }
+}
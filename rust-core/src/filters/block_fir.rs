@@ -0,0 +1,217 @@
+//! Block-oriented direct-form FIR filter
+//!
+//! Keeps the delay line as one contiguous buffer (`[M-1 past samples | block]`)
+//! so every output sample is a plain dot product against the reversed
+//! coefficients: no per-tap modulo, and the inner loop runs on the SIMD
+//! kernels in `filters::simd`. Symmetric (linear-phase) coefficients are
+//! detected at construction and run on a folded kernel that pre-adds
+//! mirrored samples, halving the multiplies.
+
+use super::simd;
+
+/// Maximum samples filtered per kernel call (bounds the history buffer size)
+const MAX_CHUNK: usize = 512;
+
+/// Relative tolerance for treating coefficients as symmetric
+const SYMMETRY_TOLERANCE: f64 = 1e-12;
+
+/// Check whether coefficients are symmetric (h[k] == h[M-1-k]) within tolerance
+///
+/// All filters from `design_lowpass_fir`, `design_highpass_fir` and
+/// `design_bandpass_fir` are linear-phase and pass this check.
+pub fn is_symmetric(coefficients: &[f64]) -> bool {
+    let peak = coefficients.iter().fold(0.0_f64, |m, &h| m.max(h.abs()));
+    let tolerance = SYMMETRY_TOLERANCE * peak.max(f64::MIN_POSITIVE);
+
+    coefficients
+        .iter()
+        .zip(coefficients.iter().rev())
+        .take(coefficients.len() / 2)
+        .all(|(&a, &b)| (a - b).abs() <= tolerance)
+}
+
+/// Direct-form FIR filter processing whole blocks with SIMD dot products
+///
+/// Produces the same output as `FirFilter` (within floating-point rounding).
+pub struct BlockFirFilter {
+    /// Filter coefficients h[n]
+    coefficients: Vec<f64>,
+
+    /// Coefficients in reverse order (h[M-1], ..., h[0])
+    taps_reversed: Vec<f64>,
+
+    /// First ceil(M/2) coefficients when the filter is symmetric
+    symmetric_half: Option<Vec<f64>>,
+
+    /// Linear history: last M-1 input samples followed by the current chunk
+    history: Vec<f64>,
+
+    /// Filter length
+    length: usize,
+}
+
+impl BlockFirFilter {
+    /// Create a new block FIR filter
+    ///
+    /// # Arguments
+    /// * `coefficients` - Filter coefficients h[n] for n = 0..M-1
+    pub fn new(coefficients: Vec<f64>) -> Self {
+        let coefficients = if coefficients.is_empty() { vec![0.0] } else { coefficients };
+        let length = coefficients.len();
+        let taps_reversed: Vec<f64> = coefficients.iter().rev().copied().collect();
+        let symmetric_half = is_symmetric(&coefficients)
+            .then(|| coefficients[..(length + 1) / 2].to_vec());
+
+        Self {
+            coefficients,
+            taps_reversed,
+            symmetric_half,
+            history: vec![0.0; length - 1 + MAX_CHUNK],
+            length,
+        }
+    }
+
+    /// Process a block in-place (zero allocations)
+    ///
+    /// # Arguments
+    /// * `buffer` - Input/output buffer (modified in-place)
+    pub fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        let past = self.length - 1;
+
+        for chunk in buffer.chunks_mut(MAX_CHUNK) {
+            let n = chunk.len();
+
+            // Append the new samples behind the stored history
+            self.history[past..past + n].copy_from_slice(chunk);
+            let input = &self.history[..past + n];
+            match &self.symmetric_half {
+                Some(half) => simd::fir_block_symmetric(input, half, self.length, chunk),
+                None => simd::fir_block(input, &self.taps_reversed, chunk),
+            }
+
+            // Keep the newest M-1 samples at the front for the next chunk
+            self.history.copy_within(n..n + past, 0);
+        }
+    }
+
+    /// Process a block of samples
+    ///
+    /// # Arguments
+    /// * `input` - Input samples
+    ///
+    /// # Returns
+    /// Filtered output samples (same length as input)
+    pub fn process_block(&mut self, input: &[f64]) -> Vec<f64> {
+        let mut output = input.to_vec();
+        self.process_block_inplace(&mut output);
+        output
+    }
+
+    /// Reset filter state (clear delay line)
+    pub fn reset(&mut self) {
+        self.history.fill(0.0);
+    }
+
+    /// Get filter coefficients
+    pub fn coefficients(&self) -> &[f64] {
+        &self.coefficients
+    }
+
+    /// Get filter length
+    pub fn length(&self) -> usize {
+        self.length
+    }
+
+    /// Check whether the folded symmetric kernel is in use
+    pub fn is_symmetric(&self) -> bool {
+        self.symmetric_half.is_some()
+    }
+
+    /// Get group delay (for linear phase Type I FIR)
+    pub fn group_delay_samples(&self) -> f64 {
+        (self.length - 1) as f64 / 2.0
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::filters::design::design_lowpass_fir;
+    use crate::filters::fir::FirFilter;
+    use crate::filters::windows::WindowType;
+
+    #[test]
+    fn test_block_fir_basic() {
+        let mut filter = BlockFirFilter::new(vec![0.5, 0.5]);
+        let output = filter.process_block(&[1.0, 2.0, 3.0, 4.0]);
+
+        let expected = [0.5, 1.5, 2.5, 3.5];
+        for (y, e) in output.iter().zip(&expected) {
+            assert!((y - e).abs() < 1e-12);
+        }
+    }
+
+    #[test]
+    fn test_block_fir_matches_fir_filter() {
+        // Odd tap count and block sizes both below and above MAX_CHUNK
+        let coeffs: Vec<f64> = (0..301).map(|i| ((i as f64) * 0.05).sin() / (1.0 + i as f64)).collect();
+        let mut block = BlockFirFilter::new(coeffs.clone());
+        let mut reference = FirFilter::new(coeffs);
+
+        let input: Vec<f64> = (0..5000).map(|i| (i as f64 * 0.021).sin() + 0.3 * (i as f64 * 0.9).cos()).collect();
+        let expected = reference.process_block(&input);
+
+        let mut output = Vec::with_capacity(input.len());
+        let mut pos = 0;
+        for size in [1, 97, 1300, 256, 7].iter().cycle() {
+            if pos >= input.len() {
+                break;
+            }
+            let end = (pos + size).min(input.len());
+            output.extend(block.process_block(&input[pos..end]));
+            pos = end;
+        }
+
+        for (i, (y, e)) in output.iter().zip(&expected).enumerate() {
+            assert!((y - e).abs() < 1e-12, "Mismatch at {}: {} vs {}", i, y, e);
+        }
+    }
+
+    #[test]
+    fn test_block_fir_symmetric_matches_fir_filter() {
+        let coeffs = design_lowpass_fir(0.25, 0.05 * std::f64::consts::PI, WindowType::Blackman);
+        let mut block = BlockFirFilter::new(coeffs.clone());
+        let mut reference = FirFilter::new(coeffs);
+        assert!(block.is_symmetric());
+
+        let input: Vec<f64> = (0..3000).map(|i| (i as f64 * 0.017).sin() - 0.5 * (i as f64 * 1.3).cos()).collect();
+        let expected = reference.process_block(&input);
+
+        let mut output = Vec::with_capacity(input.len());
+        for chunk in input.chunks(700) {
+            output.extend(block.process_block(chunk));
+        }
+
+        for (i, (y, e)) in output.iter().zip(&expected).enumerate() {
+            assert!((y - e).abs() < 1e-10, "Mismatch at {}: {} vs {}", i, y, e);
+        }
+    }
+
+    #[test]
+    fn test_is_symmetric() {
+        assert!(is_symmetric(&[0.25, 0.5, 0.25]));
+        assert!(is_symmetric(&[0.1, 0.2, 0.2, 0.1]));
+        assert!(!is_symmetric(&[1.0, 0.0]));
+        assert!(is_symmetric(&[]));
+    }
+
+    #[test]
+    fn test_block_fir_reset() {
+        let mut filter = BlockFirFilter::new(vec![1.0, 1.0]);
+        filter.process_block(&[1.0, 2.0]);
+        filter.reset();
+
+        let output = filter.process_block(&[1.0]);
+        assert!((output[0] - 1.0).abs() < 1e-12);
+    }
+}
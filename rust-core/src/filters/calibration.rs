@@ -0,0 +1,346 @@
+//! Host calibration of convolution engines
+//!
+//! The crossover between direct-form, FFT overlap-add and partitioned
+//! convolution depends on the CPU (SIMD width, cache sizes) and on the block
+//! size the processing thread actually sees. Instead of fixed thresholds, the
+//! engines are micro-benchmarked once per block size at a set of filter
+//! lengths. Results are cached in memory and on disk, so later runs start
+//! without re-measuring.
+//!
+//! Speed is not the only difference: partitioned convolution delays the
+//! output by one partition. Selection therefore takes a latency budget, and
+//! the caller adds the chosen engine's latency to the filter's group delay.
+
+use super::{BlockFirFilter, FastFirFilter, PartitionedFirFilter};
+use super::partitioned_fir::DEFAULT_PARTITION_SIZE;
+use std::path::PathBuf;
+use std::sync::{Mutex, OnceLock};
+use std::time::{Duration, Instant};
+
+/// Environment variable overriding the calibration cache file location
+pub const CACHE_PATH_ENV: &str = "SPECTRAL_WORKBENCH_CALIBRATION";
+
+/// Filter lengths at which the engines are compared
+const CANDIDATE_LENGTHS: [usize; 13] = [16, 32, 64, 128, 192, 256, 384, 512, 768, 1024, 1536, 2048, 4096];
+
+/// Minimum blocks processed per timing run
+const BENCH_BLOCKS: usize = 8;
+
+/// Timing runs per engine (the fastest is kept)
+const BENCH_RUNS: usize = 3;
+
+/// Cache file format version (bump when the format or engines change)
+const CACHE_VERSION: &str = "v2";
+
+/// Convolution implementation
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ConvolutionEngine {
+    /// SIMD direct form (`BlockFirFilter`)
+    Direct,
+    /// FFT overlap-add (`FastFirFilter`)
+    FastFft,
+    /// Uniformly partitioned overlap-save (`PartitionedFirFilter`)
+    Partitioned,
+}
+
+impl ConvolutionEngine {
+    /// All engines, in benchmark order
+    pub const ALL: [ConvolutionEngine; 3] = [
+        ConvolutionEngine::Direct,
+        ConvolutionEngine::FastFft,
+        ConvolutionEngine::Partitioned,
+    ];
+
+    /// Extra output delay in samples on top of the filter's group delay
+    pub fn latency(&self) -> usize {
+        match self {
+            ConvolutionEngine::Direct | ConvolutionEngine::FastFft => 0,
+            ConvolutionEngine::Partitioned => DEFAULT_PARTITION_SIZE,
+        }
+    }
+
+    fn as_str(&self) -> &'static str {
+        match self {
+            ConvolutionEngine::Direct => "direct",
+            ConvolutionEngine::FastFft => "fft",
+            ConvolutionEngine::Partitioned => "partitioned",
+        }
+    }
+
+    fn parse(s: &str) -> Option<Self> {
+        match s {
+            "direct" => Some(ConvolutionEngine::Direct),
+            "fft" => Some(ConvolutionEngine::FastFft),
+            "partitioned" => Some(ConvolutionEngine::Partitioned),
+            _ => None,
+        }
+    }
+}
+
+/// Engines ranked by speed per filter length for one block size
+#[derive(Debug, Clone, PartialEq)]
+pub struct Calibration {
+    /// Block size the engines were measured at
+    pub block_size: usize,
+
+    /// (filter length, engines fastest first), sorted by length
+    pub table: Vec<(usize, Vec<ConvolutionEngine>)>,
+}
+
+impl Calibration {
+    /// Micro-benchmark all engines at `block_size` on this CPU
+    ///
+    /// Takes in the order of 100 ms; prefer `calibration_for`, which caches.
+    pub fn measure(block_size: usize) -> Self {
+        Self::measure_with(block_size, time_engine)
+    }
+
+    /// Rank the engines at every candidate length with a timing function
+    ///
+    /// # Arguments
+    /// * `block_size` - Samples per processed block
+    /// * `time` - Times (engine, coefficients, input block, scratch buffer)
+    fn measure_with<F>(block_size: usize, mut time: F) -> Self
+    where
+        F: FnMut(ConvolutionEngine, &[f64], &[f64], &mut [f64]) -> Duration,
+    {
+        let block_size = block_size.max(1);
+        let input: Vec<f64> = (0..block_size).map(|i| (i as f64 * 0.1).sin()).collect();
+        let mut buffer = vec![0.0; block_size];
+
+        let table = CANDIDATE_LENGTHS
+            .iter()
+            .map(|&length| {
+                let coeffs = test_coefficients(length);
+
+                let mut timings: Vec<(ConvolutionEngine, Duration)> = ConvolutionEngine::ALL
+                    .iter()
+                    .map(|&engine| (engine, time(engine, &coeffs, &input, &mut buffer)))
+                    .collect();
+                timings.sort_by_key(|&(_, elapsed)| elapsed);
+
+                (length, timings.into_iter().map(|(engine, _)| engine).collect())
+            })
+            .collect();
+
+        Self { block_size, table }
+    }
+
+    /// Select the fastest engine for a filter length within a latency budget
+    ///
+    /// Uses the measurement at the nearest candidate length at or above
+    /// `filter_length` (the longest one for filters beyond the table).
+    ///
+    /// # Arguments
+    /// * `filter_length` - Number of taps
+    /// * `max_latency` - Largest acceptable `ConvolutionEngine::latency`
+    ///   (0 = only engines that keep the filter's own group delay)
+    pub fn select(&self, filter_length: usize, max_latency: usize) -> ConvolutionEngine {
+        self.table
+            .iter()
+            .find(|(length, _)| *length >= filter_length)
+            .or_else(|| self.table.last())
+            .and_then(|(_, ranked)| ranked.iter().copied().find(|engine| engine.latency() <= max_latency))
+            .unwrap_or(ConvolutionEngine::Direct)
+    }
+
+    /// Serialize as one cache line
+    fn to_line(&self) -> String {
+        let entries: Vec<String> = self
+            .table
+            .iter()
+            .map(|(length, ranked)| {
+                let names: Vec<&str> = ranked.iter().map(|engine| engine.as_str()).collect();
+                format!("{}:{}", length, names.join("/"))
+            })
+            .collect();
+        format!("{} {} {} {}", CACHE_VERSION, host_signature(), self.block_size, entries.join(","))
+    }
+
+    /// Parse a cache line written by `to_line` on this host
+    fn from_line(line: &str) -> Option<Self> {
+        let mut fields = line.split_whitespace();
+        if fields.next()? != CACHE_VERSION || fields.next()? != host_signature() {
+            return None;
+        }
+
+        let block_size = fields.next()?.parse().ok()?;
+        let table = fields
+            .next()?
+            .split(',')
+            .map(|entry| {
+                let (length, ranked) = entry.split_once(':')?;
+                let ranked = ranked.split('/').map(ConvolutionEngine::parse).collect::<Option<Vec<_>>>()?;
+                Some((length.parse().ok()?, ranked))
+            })
+            .collect::<Option<Vec<_>>>()?;
+
+        Some(Self { block_size, table })
+    }
+}
+
+/// Get the calibration for a block size (memory cache, then disk, then measure)
+pub fn calibration_for(block_size: usize) -> Calibration {
+    static CACHE: OnceLock<Mutex<Vec<Calibration>>> = OnceLock::new();
+
+    let block_size = block_size.max(1);
+    let mut cache = CACHE
+        .get_or_init(|| Mutex::new(load_cache_file()))
+        .lock()
+        .unwrap_or_else(|e| e.into_inner());
+
+    if let Some(calibration) = cache.iter().find(|c| c.block_size == block_size) {
+        return calibration.clone();
+    }
+
+    let calibration = Calibration::measure(block_size);
+    cache.push(calibration.clone());
+    save_cache_file(&cache);
+    calibration
+}
+
+/// Symmetric (linear-phase) taps, like every filter from the design functions
+fn test_coefficients(length: usize) -> Vec<f64> {
+    (0..length)
+        .map(|k| {
+            let x = (k as f64 + 1.0) / (length as f64 + 1.0);
+            (std::f64::consts::PI * x).sin() / length as f64
+        })
+        .collect()
+}
+
+/// Time one engine on blocks of `input.len()` samples
+fn time_engine(engine: ConvolutionEngine, coeffs: &[f64], input: &[f64], buffer: &mut [f64]) -> Duration {
+    let block_size = input.len();
+
+    // Cover at least two partitions so the partitioned engine's FFT work is
+    // counted even for blocks smaller than a partition
+    let blocks = BENCH_BLOCKS.max(2 * DEFAULT_PARTITION_SIZE / block_size + 1);
+
+    match engine {
+        ConvolutionEngine::Direct => {
+            let mut filter = BlockFirFilter::new(coeffs.to_vec());
+            time_blocks(|b| filter.process_block_inplace(b), input, buffer, blocks)
+        }
+        ConvolutionEngine::FastFft => {
+            let mut filter = FastFirFilter::new(coeffs.to_vec(), block_size);
+            time_blocks(|b| filter.process_block_inplace(b), input, buffer, blocks)
+        }
+        ConvolutionEngine::Partitioned => {
+            let mut filter = PartitionedFirFilter::new(coeffs.to_vec(), DEFAULT_PARTITION_SIZE);
+            time_blocks(|b| filter.process_block_inplace(b), input, buffer, blocks)
+        }
+    }
+}
+
+/// Best-of-N time to filter `blocks` blocks
+fn time_blocks<F: FnMut(&mut [f64])>(mut process: F, input: &[f64], buffer: &mut [f64], blocks: usize) -> Duration {
+    // Warm up caches and any lazily initialized state
+    buffer.copy_from_slice(input);
+    process(buffer);
+
+    (0..BENCH_RUNS)
+        .map(|_| {
+            let start = Instant::now();
+            for _ in 0..blocks {
+                buffer.copy_from_slice(input);
+                process(buffer);
+            }
+            start.elapsed()
+        })
+        .min()
+        .unwrap_or_default()
+}
+
+/// Identify the CPU features the measurements depend on
+fn host_signature() -> &'static str {
+    #[cfg(target_arch = "x86_64")]
+    {
+        if super::simd::has_avx2_fma() {
+            return "x86_64-avx2fma";
+        }
+        return "x86_64";
+    }
+
+    #[allow(unreachable_code)]
+    std::env::consts::ARCH
+}
+
+fn cache_path() -> PathBuf {
+    std::env::var_os(CACHE_PATH_ENV)
+        .map(PathBuf::from)
+        .unwrap_or_else(|| std::env::temp_dir().join("spectral_workbench_calibration.txt"))
+}
+
+/// Read cached calibrations (missing or unreadable file = empty cache)
+fn load_cache_file() -> Vec<Calibration> {
+    std::fs::read_to_string(cache_path())
+        .map(|text| text.lines().filter_map(Calibration::from_line).collect())
+        .unwrap_or_default()
+}
+
+/// Write calibrations back (best effort: failures only cost a re-measure)
+fn save_cache_file(calibrations: &[Calibration]) {
+    let text: String = calibrations.iter().map(|c| c.to_line() + "\n").collect();
+    let _ = std::fs::write(cache_path(), text);
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    use ConvolutionEngine::{Direct, FastFft, Partitioned};
+
+    #[test]
+    fn test_select_uses_next_calibrated_length() {
+        let calibration = Calibration {
+            block_size: 256,
+            table: vec![
+                (64, vec![Direct, FastFft, Partitioned]),
+                (512, vec![FastFft, Direct, Partitioned]),
+                (2048, vec![Partitioned, FastFft, Direct]),
+            ],
+        };
+
+        let any = usize::MAX;
+        assert_eq!(calibration.select(33, any), Direct);
+        assert_eq!(calibration.select(64, any), Direct);
+        assert_eq!(calibration.select(65, any), FastFft);
+        assert_eq!(calibration.select(1500, any), Partitioned);
+        assert_eq!(calibration.select(10000, any), Partitioned);
+
+        // Without a latency budget the fastest zero-latency engine wins
+        assert_eq!(calibration.select(1500, 0), FastFft);
+        assert_eq!(calibration.select(1500, Partitioned.latency()), Partitioned);
+    }
+
+    #[test]
+    fn test_cache_line_roundtrip() {
+        let calibration = Calibration {
+            block_size: 128,
+            table: vec![(16, vec![Direct, FastFft, Partitioned]), (4096, vec![Partitioned, FastFft, Direct])],
+        };
+
+        let parsed = Calibration::from_line(&calibration.to_line());
+        assert_eq!(parsed, Some(calibration));
+        assert_eq!(Calibration::from_line("v0 other 128 16:direct"), None);
+    }
+
+    #[test]
+    fn test_measure_covers_all_lengths() {
+        // Deterministic stand-in timings: direct cost grows with length,
+        // the FFT engines stay flat
+        let calibration = Calibration::measure_with(64, |engine, coeffs, _, _| match engine {
+            Direct => Duration::from_nanos(coeffs.len() as u64 * 10),
+            FastFft => Duration::from_nanos(5_000),
+            Partitioned => Duration::from_nanos(4_000),
+        });
+
+        assert_eq!(calibration.table.len(), CANDIDATE_LENGTHS.len());
+        assert!(calibration.table.windows(2).all(|w| w[0].0 < w[1].0));
+        assert!(calibration.table.iter().all(|(_, ranked)| ranked.len() == ConvolutionEngine::ALL.len()));
+        assert_eq!(calibration.select(16, 0), Direct);
+        assert_eq!(calibration.select(4096, 0), FastFft);
+        assert_eq!(calibration.select(4096, usize::MAX), Partitioned);
+    }
+}
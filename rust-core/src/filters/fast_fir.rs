@@ -2,13 +2,19 @@
 //! 
 //! Implements overlap-add method with frequency-domain multiplication
 //! Complexity: O(N log N) vs O(N*M) for time-domain
+//! 
+//! Uses real-to-complex FFTs: only the N/2+1 non-redundant bins are
+//! transformed and multiplied, halving FLOPs and memory traffic compared to
+//! full complex FFTs.
 
-use rustfft::{FftPlanner, num_complex::Complex};
+use realfft::{RealFftPlanner, RealToComplex, ComplexToReal};
+use num_complex::Complex;
+use std::sync::Arc;
 
 /// FFT-based FIR filter for long impulse responses
 /// Uses overlap-add with FFT convolution: O(N log N) instead of O(N*M)
 pub struct FastFirFilter {
-    /// Filter coefficients in frequency domain
+    /// Filter coefficients in frequency domain (half spectrum, fft_size/2 + 1 bins)
     h_fft: Vec<Complex<f64>>,
     
     /// FFT size (must be power of 2, >= 2*max(N,M))
@@ -23,15 +29,18 @@ pub struct FastFirFilter {
     /// Overlap buffer from previous block
     overlap: Vec<f64>,
     
-    /// FFT planner (forward)
-    fft: std::sync::Arc<dyn rustfft::Fft<f64>>,
+    /// Real FFT (forward)
+    r2c: Arc<dyn RealToComplex<f64>>,
     
-    /// IFFT planner (inverse)
-    ifft: std::sync::Arc<dyn rustfft::Fft<f64>>,
+    /// Real IFFT (inverse)
+    c2r: Arc<dyn ComplexToReal<f64>>,
     
     /// Reusable buffers
-    input_buffer: Vec<Complex<f64>>,
-    output_buffer: Vec<Complex<f64>>,
+    input_buffer: Vec<f64>,
+    spectrum: Vec<Complex<f64>>,
+    output_buffer: Vec<f64>,
+    r2c_scratch: Vec<Complex<f64>>,
+    c2r_scratch: Vec<Complex<f64>>,
 }
 
 impl FastFirFilter {
@@ -45,28 +54,32 @@ impl FastFirFilter {
     /// FFT size is chosen as next power of 2 >= (block_size + filter_length - 1)
     pub fn new(coefficients: Vec<f64>, block_size: usize) -> Self {
         let filter_length = coefficients.len();
+        let block_size = block_size.max(1);
         
         // FFT size must be at least block_size + filter_length - 1
         let min_fft_size = block_size + filter_length - 1;
         let fft_size = min_fft_size.next_power_of_two();
         
-        // Create FFT planners
-        let mut planner = FftPlanner::new();
-        let fft = planner.plan_fft_forward(fft_size);
-        let ifft = planner.plan_fft_inverse(fft_size);
+        // Create real FFT planners
+        let mut planner = RealFftPlanner::<f64>::new();
+        let r2c = planner.plan_fft_forward(fft_size);
+        let c2r = planner.plan_fft_inverse(fft_size);
+        
+        let mut r2c_scratch = r2c.make_scratch_vec();
+        let c2r_scratch = c2r.make_scratch_vec();
         
         // Transform filter coefficients to frequency domain
-        let mut h_time = vec![Complex::new(0.0, 0.0); fft_size];
-        for (i, &coeff) in coefficients.iter().enumerate() {
-            h_time[i] = Complex::new(coeff, 0.0);
-        }
+        let mut h_time = vec![0.0; fft_size];
+        h_time[..filter_length].copy_from_slice(&coefficients);
         
-        let mut h_fft = h_time.clone();
-        fft.process(&mut h_fft);
+        let mut h_fft = r2c.make_output_vec();
+        r2c.process_with_scratch(&mut h_time, &mut h_fft, &mut r2c_scratch)
+            .expect("FFT processing failed");
         
         // Allocate buffers
-        let input_buffer = vec![Complex::new(0.0, 0.0); fft_size];
-        let output_buffer = vec![Complex::new(0.0, 0.0); fft_size];
+        let input_buffer = vec![0.0; fft_size];
+        let spectrum = r2c.make_output_vec();
+        let output_buffer = vec![0.0; fft_size];
         let overlap = vec![0.0; filter_length - 1];
         
         Self {
@@ -75,49 +88,54 @@ impl FastFirFilter {
             block_size,
             filter_length,
             overlap,
-            fft,
-            ifft,
+            r2c,
+            c2r,
             input_buffer,
+            spectrum,
             output_buffer,
+            r2c_scratch,
+            c2r_scratch,
         }
     }
     
-    /// Process block using FFT-based overlap-add
-    /// 
-    /// # Arguments
-    /// * `input` - Input block (length should be <= block_size)
+    /// Convolve the first `n` samples of `input_buffer` into `output_buffer`
     /// 
-    /// # Returns
-    /// Filtered output block (same length as input)
-    pub fn process_block(&mut self, input: &[f64]) -> Vec<f64> {
-        let n = input.len().min(self.block_size);
+    /// Output is left unscaled (caller multiplies by 1/fft_size)
+    fn convolve(&mut self, n: usize) {
+        // 1. Zero-pad input
+        self.input_buffer[n..].fill(0.0);
         
-        // 1. Copy input to complex buffer and zero-pad
-        for i in 0..n {
-            self.input_buffer[i] = Complex::new(input[i], 0.0);
-        }
-        for i in n..self.fft_size {
-            self.input_buffer[i] = Complex::new(0.0, 0.0);
-        }
-        
-        // 2. Forward FFT of input
-        self.fft.process(&mut self.input_buffer);
+        // 2. Forward real FFT of input (half spectrum)
+        self.r2c
+            .process_with_scratch(&mut self.input_buffer, &mut self.spectrum, &mut self.r2c_scratch)
+            .expect("FFT processing failed");
         
         // 3. Multiply in frequency domain (convolution in time domain)
-        for i in 0..self.fft_size {
-            self.output_buffer[i] = self.input_buffer[i] * self.h_fft[i];
+        for (x, &h) in self.spectrum.iter_mut().zip(self.h_fft.iter()) {
+            *x *= h;
         }
         
-        // 4. Inverse FFT
-        self.ifft.process(&mut self.output_buffer);
+        // DC and Nyquist bins of a real signal have no imaginary part
+        let last = self.spectrum.len() - 1;
+        self.spectrum[0].im = 0.0;
+        self.spectrum[last].im = 0.0;
+        
+        // 4. Inverse real FFT
+        self.c2r
+            .process_with_scratch(&mut self.spectrum, &mut self.output_buffer, &mut self.c2r_scratch)
+            .expect("IFFT processing failed");
+    }
+    
+    /// Overlap-add the convolution result into `output` and save the new tail
+    fn overlap_add(&mut self, output: &mut [f64]) {
+        let n = output.len();
         
         // 5. Scale by 1/N (IFFT normalization)
         let scale = 1.0 / self.fft_size as f64;
         
         // 6. Overlap-add: combine with tail from previous block
-        let mut output = vec![0.0; n];
         for i in 0..n {
-            output[i] = self.output_buffer[i].re * scale;
+            output[i] = self.output_buffer[i] * scale;
             
             // Add overlap from previous block
             if i < self.overlap.len() {
@@ -125,64 +143,40 @@ impl FastFirFilter {
             }
         }
         
-        // 7. Save tail for next block
+        // 7. Save tail for next block (plus any old tail not yet emitted)
         for i in 0..(self.filter_length - 1) {
-            if n + i < self.fft_size {
-                self.overlap[i] = self.output_buffer[n + i].re * scale;
-            } else {
-                self.overlap[i] = 0.0;
-            }
+            let carried = if n + i < self.overlap.len() { self.overlap[n + i] } else { 0.0 };
+            let fresh = if n + i < self.fft_size { self.output_buffer[n + i] * scale } else { 0.0 };
+            self.overlap[i] = carried + fresh;
         }
-        
+    }
+    
+    /// Process block using FFT-based overlap-add
+    /// 
+    /// # Arguments
+    /// * `input` - Input block (any length; processed in `block_size` chunks)
+    /// 
+    /// # Returns
+    /// Filtered output block (same length as input)
+    pub fn process_block(&mut self, input: &[f64]) -> Vec<f64> {
+        let mut output = input.to_vec();
+        self.process_block_inplace(&mut output);
         output
     }
     
     /// Process block in-place using FFT-based overlap-add
     ///
     /// # Arguments
-    /// * `buffer` - Input/output buffer (modified in-place)
+    /// * `buffer` - Input/output buffer (any length; processed in `block_size` chunks)
     pub fn process_block_inplace(&mut self, buffer: &mut [f64]) {
-        let n = buffer.len().min(self.block_size);
-
-        // 1. Copy input to complex buffer and zero-pad
-        for i in 0..n {
-            self.input_buffer[i] = Complex::new(buffer[i], 0.0);
-        }
-        for i in n..self.fft_size {
-            self.input_buffer[i] = Complex::new(0.0, 0.0);
-        }
-
-        // 2. Forward FFT of input
-        self.fft.process(&mut self.input_buffer);
-
-        // 3. Multiply in frequency domain (convolution in time domain)
-        for i in 0..self.fft_size {
-            self.output_buffer[i] = self.input_buffer[i] * self.h_fft[i];
-        }
-
-        // 4. Inverse FFT
-        self.ifft.process(&mut self.output_buffer);
-
-        // 5. Scale by 1/N (IFFT normalization)
-        let scale = 1.0 / self.fft_size as f64;
-
-        // 6. Overlap-add: combine with tail from previous block, write directly to buffer
-        for i in 0..n {
-            buffer[i] = self.output_buffer[i].re * scale;
-
-            // Add overlap from previous block
-            if i < self.overlap.len() {
-                buffer[i] += self.overlap[i];
-            }
-        }
-
-        // 7. Save tail for next block
-        for i in 0..(self.filter_length - 1) {
-            if n + i < self.fft_size {
-                self.overlap[i] = self.output_buffer[n + i].re * scale;
-            } else {
-                self.overlap[i] = 0.0;
-            }
+        for chunk in buffer.chunks_mut(self.block_size) {
+            let n = chunk.len();
+            
+            self.input_buffer[..n].copy_from_slice(chunk);
+            self.convolve(n);
+            
+            // Write directly to buffer
+            self.overlap_add(chunk);
         }
     }
 
@@ -249,4 +243,47 @@ mod tests {
             assert!(diff < 1e-6, "Mismatch at {}: diff = {}", i, diff);
         }
     }
+    
+    #[test]
+    fn test_fast_fir_blocks_shorter_than_filter() {
+        // Blocks much shorter than the filter: the tail must carry across blocks
+        let spec = FilterSpec::from_part_a(WindowType::Blackman);
+        let coeffs = design_bandpass_fir(&spec);
+        
+        let mut fast_filter = FastFirFilter::new(coeffs.clone(), 2048);
+        let mut direct_filter = FirFilter::new(coeffs);
+        
+        let input: Vec<f64> = (0..1500).map(|i| (i as f64 * 0.21).sin()).collect();
+        let direct_output = direct_filter.process_block(&input);
+        
+        let mut fast_output = Vec::with_capacity(input.len());
+        for block in input.chunks(64) {
+            fast_output.extend(fast_filter.process_block(block));
+        }
+        
+        for i in 0..input.len() {
+            let diff = (fast_output[i] - direct_output[i]).abs();
+            assert!(diff < 1e-6, "Mismatch at {}: diff = {}", i, diff);
+        }
+    }
+    
+    #[test]
+    fn test_fast_fir_blocks_longer_than_block_size() {
+        // Buffers longer than block_size are processed in block_size chunks
+        let spec = FilterSpec::from_part_a(WindowType::Hamming);
+        let coeffs = design_bandpass_fir(&spec);
+        
+        let mut fast_filter = FastFirFilter::new(coeffs.clone(), 128);
+        let mut direct_filter = FirFilter::new(coeffs);
+        
+        let input: Vec<f64> = (0..2000).map(|i| (i as f64 * 0.07).sin()).collect();
+        let fast_output = fast_filter.process_block(&input);
+        let direct_output = direct_filter.process_block(&input);
+        
+        assert_eq!(fast_output.len(), input.len());
+        for i in 0..input.len() {
+            let diff = (fast_output[i] - direct_output[i]).abs();
+            assert!(diff < 1e-6, "Mismatch at {}: diff = {}", i, diff);
+        }
+    }
 }
@@ -3,9 +3,16 @@
 pub mod windows;
 pub mod design;
 pub mod fir;
+pub mod simd;
+pub mod block_fir;
 pub mod fast_fir;
+pub mod partitioned_fir;
+pub mod calibration;
 
 pub use windows::{WindowType, generate_window};
 pub use design::{FilterSpec, design_bandpass_fir, design_lowpass_fir, design_highpass_fir};
 pub use fir::FirFilter;
+pub use block_fir::BlockFirFilter;
 pub use fast_fir::FastFirFilter;
+pub use partitioned_fir::PartitionedFirFilter;
+pub use calibration::{Calibration, ConvolutionEngine, calibration_for};
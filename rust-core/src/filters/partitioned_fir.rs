@@ -0,0 +1,284 @@
+//! Uniformly partitioned convolution for very long FIR filters
+//!
+//! Splits the impulse response into equal partitions of `partition_size` taps
+//! and convolves them through a frequency-domain delay line (overlap-save).
+//! Latency and per-sample cost depend only on the partition size, so filters
+//! with thousands of taps stay cheap and low-latency.
+
+use realfft::{RealFftPlanner, RealToComplex, ComplexToReal};
+use num_complex::Complex;
+use std::sync::Arc;
+
+/// Default partition size (samples of latency, ~5.3 ms at 48 kHz)
+pub const DEFAULT_PARTITION_SIZE: usize = 256;
+
+/// Uniformly partitioned overlap-save FIR filter
+///
+/// Output is delayed by exactly `partition_size` samples relative to direct
+/// convolution; the delay is independent of the filter length.
+pub struct PartitionedFirFilter {
+    /// Partition size B (samples per partition)
+    partition_size: usize,
+
+    /// FFT size (2B)
+    fft_size: usize,
+
+    /// Number of frequency bins per spectrum (B + 1)
+    num_bins: usize,
+
+    /// Filter length
+    filter_length: usize,
+
+    /// Number of partitions P = ceil(M / B)
+    num_partitions: usize,
+
+    /// Filter partitions in frequency domain (P spectra, contiguous)
+    h_partitions: Vec<Complex<f64>>,
+
+    /// Frequency-domain delay line: spectra of the last P input frames
+    fdl: Vec<Complex<f64>>,
+
+    /// FDL slot holding the newest input spectrum
+    fdl_head: usize,
+
+    /// Sliding input frame: previous B samples followed by current B samples
+    input_frame: Vec<f64>,
+
+    /// Samples of the current partition collected so far
+    fill: usize,
+
+    /// Output of the last computed partition (played back during collection)
+    output_frame: Vec<f64>,
+
+    /// Real FFT (forward)
+    r2c: Arc<dyn RealToComplex<f64>>,
+
+    /// Real IFFT (inverse)
+    c2r: Arc<dyn ComplexToReal<f64>>,
+
+    /// Reusable buffers
+    fft_input: Vec<f64>,
+    fft_output: Vec<f64>,
+    accumulator: Vec<Complex<f64>>,
+    r2c_scratch: Vec<Complex<f64>>,
+    c2r_scratch: Vec<Complex<f64>>,
+}
+
+impl PartitionedFirFilter {
+    /// Create new partitioned filter
+    ///
+    /// # Arguments
+    /// * `coefficients` - Filter coefficients h[n]
+    /// * `partition_size` - Partition size B (e.g., 64-256); also the latency
+    pub fn new(coefficients: Vec<f64>, partition_size: usize) -> Self {
+        let partition_size = partition_size.max(1);
+        let filter_length = coefficients.len();
+        let fft_size = 2 * partition_size;
+        let num_bins = partition_size + 1;
+        let num_partitions = ((filter_length + partition_size - 1) / partition_size).max(1);
+
+        let mut planner = RealFftPlanner::<f64>::new();
+        let r2c = planner.plan_fft_forward(fft_size);
+        let c2r = planner.plan_fft_inverse(fft_size);
+
+        let mut r2c_scratch = r2c.make_scratch_vec();
+        let c2r_scratch = c2r.make_scratch_vec();
+
+        // Transform each zero-padded partition of h to frequency domain
+        let mut h_partitions = vec![Complex::new(0.0, 0.0); num_partitions * num_bins];
+        let mut fft_input = vec![0.0; fft_size];
+
+        for (p, spectrum) in h_partitions.chunks_mut(num_bins).enumerate() {
+            let start = (p * partition_size).min(filter_length);
+            let end = ((p + 1) * partition_size).min(filter_length);
+
+            fft_input.fill(0.0);
+            fft_input[..end - start].copy_from_slice(&coefficients[start..end]);
+
+            r2c.process_with_scratch(&mut fft_input, spectrum, &mut r2c_scratch)
+                .expect("FFT processing failed");
+        }
+
+        Self {
+            partition_size,
+            fft_size,
+            num_bins,
+            filter_length,
+            num_partitions,
+            h_partitions,
+            fdl: vec![Complex::new(0.0, 0.0); num_partitions * num_bins],
+            fdl_head: 0,
+            input_frame: vec![0.0; fft_size],
+            fill: 0,
+            output_frame: vec![0.0; partition_size],
+            r2c,
+            c2r,
+            fft_input,
+            fft_output: vec![0.0; fft_size],
+            accumulator: vec![Complex::new(0.0, 0.0); num_bins],
+            r2c_scratch,
+            c2r_scratch,
+        }
+    }
+
+    /// Convolve the completed input partition with every filter partition
+    fn process_partition(&mut self) {
+        let b = self.partition_size;
+        let bins = self.num_bins;
+        let head = self.fdl_head;
+
+        // 1. Forward FFT of the sliding 2B input frame into the newest FDL slot
+        self.fft_input.copy_from_slice(&self.input_frame);
+        let newest = &mut self.fdl[head * bins..(head + 1) * bins];
+        self.r2c
+            .process_with_scratch(&mut self.fft_input, newest, &mut self.r2c_scratch)
+            .expect("FFT processing failed");
+
+        // 2. Multiply-accumulate: Y = sum_p X[head - p] * H[p]
+        self.accumulator.fill(Complex::new(0.0, 0.0));
+        for p in 0..self.num_partitions {
+            let slot = (head + self.num_partitions - p) % self.num_partitions;
+            let x = &self.fdl[slot * bins..(slot + 1) * bins];
+            let h = &self.h_partitions[p * bins..(p + 1) * bins];
+
+            for ((acc, &xk), &hk) in self.accumulator.iter_mut().zip(x).zip(h) {
+                *acc += xk * hk;
+            }
+        }
+
+        // 3. Inverse FFT (DC and Nyquist bins of a real signal are real)
+        self.accumulator[0].im = 0.0;
+        self.accumulator[bins - 1].im = 0.0;
+        self.c2r
+            .process_with_scratch(&mut self.accumulator, &mut self.fft_output, &mut self.c2r_scratch)
+            .expect("IFFT processing failed");
+
+        // 4. Overlap-save: keep the last B samples, scaled by 1/N
+        let scale = 1.0 / self.fft_size as f64;
+        for (out, &y) in self.output_frame.iter_mut().zip(&self.fft_output[b..]) {
+            *out = y * scale;
+        }
+
+        // 5. Slide input frame and advance the delay line
+        self.input_frame.copy_within(b.., 0);
+        self.fdl_head = (head + 1) % self.num_partitions;
+    }
+
+    /// Process block in-place (any block length, zero allocations)
+    ///
+    /// # Arguments
+    /// * `buffer` - Input/output buffer (modified in-place)
+    pub fn process_block_inplace(&mut self, buffer: &mut [f64]) {
+        let b = self.partition_size;
+        let mut pos = 0;
+
+        while pos < buffer.len() {
+            let take = (b - self.fill).min(buffer.len() - pos);
+            let chunk = &mut buffer[pos..pos + take];
+
+            // Collect input, play back output of the previous partition
+            self.input_frame[b + self.fill..b + self.fill + take].copy_from_slice(chunk);
+            chunk.copy_from_slice(&self.output_frame[self.fill..self.fill + take]);
+
+            self.fill += take;
+            pos += take;
+
+            if self.fill == b {
+                self.process_partition();
+                self.fill = 0;
+            }
+        }
+    }
+
+    /// Process block
+    ///
+    /// # Arguments
+    /// * `input` - Input block (any length)
+    ///
+    /// # Returns
+    /// Filtered output block (same length as input, delayed by `latency()`)
+    pub fn process_block(&mut self, input: &[f64]) -> Vec<f64> {
+        let mut output = input.to_vec();
+        self.process_block_inplace(&mut output);
+        output
+    }
+
+    /// Reset filter state
+    pub fn reset(&mut self) {
+        self.fdl.fill(Complex::new(0.0, 0.0));
+        self.fdl_head = 0;
+        self.input_frame.fill(0.0);
+        self.output_frame.fill(0.0);
+        self.fill = 0;
+    }
+
+    /// Get filter length
+    pub fn filter_length(&self) -> usize {
+        self.filter_length
+    }
+
+    /// Get partition size
+    pub fn partition_size(&self) -> usize {
+        self.partition_size
+    }
+
+    /// Get number of partitions
+    pub fn num_partitions(&self) -> usize {
+        self.num_partitions
+    }
+
+    /// Get processing latency in samples (added on top of the filter's group delay)
+    pub fn latency(&self) -> usize {
+        self.partition_size
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::filters::design::*;
+    use crate::filters::fir::FirFilter;
+    use crate::filters::windows::WindowType;
+
+    #[test]
+    fn test_partitioned_impulse() {
+        // 10-tap filter split into 3 partitions of 4
+        let h: Vec<f64> = (1..=10).map(|i| i as f64 * 0.1).collect();
+        let mut filter = PartitionedFirFilter::new(h.clone(), 4);
+        assert_eq!(filter.num_partitions(), 3);
+
+        let mut input = vec![0.0; 32];
+        input[0] = 1.0;
+        let output = filter.process_block(&input);
+
+        // Impulse response appears after `latency` samples
+        let latency = filter.latency();
+        for (i, &expected) in h.iter().enumerate() {
+            assert!((output[latency + i] - expected).abs() < 1e-10,
+                    "Mismatch at {}: {} vs {}", i, output[latency + i], expected);
+        }
+        assert!(output[..latency].iter().all(|&x| x.abs() < 1e-10));
+    }
+
+    #[test]
+    fn test_partitioned_vs_direct() {
+        // Long filter, irregular block sizes
+        let coeffs = design_lowpass_fir(0.3, 0.01 * std::f64::consts::PI, WindowType::Hamming);
+        let mut partitioned = PartitionedFirFilter::new(coeffs.clone(), 64);
+        let mut direct = FirFilter::new(coeffs);
+
+        let input: Vec<f64> = (0..4000).map(|i| (i as f64 * 0.013).sin() + (i as f64 * 0.37).cos()).collect();
+        let expected = direct.process_block(&input);
+
+        let mut output = Vec::with_capacity(input.len());
+        for block in input.chunks(173) {
+            output.extend(partitioned.process_block(block));
+        }
+
+        let latency = partitioned.latency();
+        for i in 0..input.len() - latency {
+            let diff = (output[i + latency] - expected[i]).abs();
+            assert!(diff < 1e-9, "Mismatch at {}: diff = {}", i, diff);
+        }
+    }
+}
@@ -0,0 +1,297 @@
+//! SIMD kernels for direct-form FIR convolution
+//!
+//! Kernels are selected at runtime: AVX2 + FMA on x86_64 CPUs that support
+//! it, otherwise a portable scalar version with independent accumulators that
+//! the compiler can auto-vectorize.
+
+/// Dot product of two slices (over the shorter length)
+#[inline]
+pub fn dot(a: &[f64], b: &[f64]) -> f64 {
+    #[cfg(target_arch = "x86_64")]
+    {
+        if has_avx2_fma() {
+            return unsafe { dot_avx2_fma(a, b) };
+        }
+    }
+
+    dot_scalar(a, b)
+}
+
+/// Direct-form FIR over a contiguous history buffer
+///
+/// Computes `output[n] = Σ_k taps_reversed[k] * input[n + k]` for every
+/// output sample, i.e. a correlation with the time-reversed impulse response.
+///
+/// # Arguments
+/// * `input` - History followed by new samples (len >= output.len() + taps - 1)
+/// * `taps_reversed` - Filter coefficients in reverse order
+/// * `output` - Output block
+pub fn fir_block(input: &[f64], taps_reversed: &[f64], output: &mut [f64]) {
+    assert!(input.len() + 1 >= output.len() + taps_reversed.len());
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if has_avx2_fma() {
+            unsafe { fir_block_avx2_fma(input, taps_reversed, output) };
+            return;
+        }
+    }
+
+    fir_block_scalar(input, taps_reversed, output);
+}
+
+/// Direct-form FIR with symmetric (linear-phase) coefficients
+///
+/// Pre-adds mirrored samples so each output needs only ceil(M/2) multiplies:
+/// `output[n] = Σ_k half[k] * (input[n + k] + input[n + M - 1 - k])`, with
+/// the centre tap counted once when M is odd.
+///
+/// # Arguments
+/// * `input` - History followed by new samples (len >= output.len() + M - 1)
+/// * `half` - First ceil(M/2) coefficients (h[0..=M/2])
+/// * `length` - Full filter length M
+/// * `output` - Output block
+pub fn fir_block_symmetric(input: &[f64], half: &[f64], length: usize, output: &mut [f64]) {
+    assert!(length > 0 && half.len() == (length + 1) / 2);
+    assert!(input.len() + 1 >= output.len() + length);
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if has_avx2_fma() {
+            unsafe { fir_block_symmetric_avx2_fma(input, half, length, output) };
+            return;
+        }
+    }
+
+    for (n, out) in output.iter_mut().enumerate() {
+        *out = dot_symmetric_scalar(&input[n..n + length], half);
+    }
+}
+
+/// Check (cached by std) whether AVX2 and FMA are available
+#[cfg(target_arch = "x86_64")]
+#[inline]
+pub fn has_avx2_fma() -> bool {
+    is_x86_feature_detected!("avx2") && is_x86_feature_detected!("fma")
+}
+
+/// Portable dot product with four independent accumulators
+#[inline]
+pub fn dot_scalar(a: &[f64], b: &[f64]) -> f64 {
+    let n = a.len().min(b.len());
+    let (a, b) = (&a[..n], &b[..n]);
+
+    let mut acc = [0.0; 4];
+    let a_chunks = a.chunks_exact(4);
+    let b_chunks = b.chunks_exact(4);
+    let a_tail = a_chunks.remainder();
+    let b_tail = b_chunks.remainder();
+
+    for (ca, cb) in a_chunks.zip(b_chunks) {
+        acc[0] += ca[0] * cb[0];
+        acc[1] += ca[1] * cb[1];
+        acc[2] += ca[2] * cb[2];
+        acc[3] += ca[3] * cb[3];
+    }
+
+    let mut sum = (acc[0] + acc[1]) + (acc[2] + acc[3]);
+    for (&x, &y) in a_tail.iter().zip(b_tail) {
+        sum += x * y;
+    }
+    sum
+}
+
+/// Portable folded dot product over a window of M samples
+#[inline]
+pub fn dot_symmetric_scalar(window: &[f64], half: &[f64]) -> f64 {
+    let m = window.len();
+    let pairs = m / 2;
+
+    let mut acc = [0.0; 4];
+    let mut i = 0;
+    while i + 4 <= pairs {
+        for lane in 0..4 {
+            let k = i + lane;
+            acc[lane] += half[k] * (window[k] + window[m - 1 - k]);
+        }
+        i += 4;
+    }
+
+    let mut sum = (acc[0] + acc[1]) + (acc[2] + acc[3]);
+    while i < pairs {
+        sum += half[i] * (window[i] + window[m - 1 - i]);
+        i += 1;
+    }
+    if m % 2 == 1 {
+        sum += half[pairs] * window[pairs];
+    }
+    sum
+}
+
+fn fir_block_scalar(input: &[f64], taps_reversed: &[f64], output: &mut [f64]) {
+    let m = taps_reversed.len();
+    for (n, out) in output.iter_mut().enumerate() {
+        *out = dot_scalar(&input[n..n + m], taps_reversed);
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn dot_avx2_fma(a: &[f64], b: &[f64]) -> f64 {
+    use std::arch::x86_64::*;
+
+    let n = a.len().min(b.len());
+    let pa = a.as_ptr();
+    let pb = b.as_ptr();
+
+    // Four independent accumulators hide FMA latency
+    let mut acc0 = _mm256_setzero_pd();
+    let mut acc1 = _mm256_setzero_pd();
+    let mut acc2 = _mm256_setzero_pd();
+    let mut acc3 = _mm256_setzero_pd();
+
+    let mut i = 0;
+    while i + 16 <= n {
+        acc0 = _mm256_fmadd_pd(_mm256_loadu_pd(pa.add(i)), _mm256_loadu_pd(pb.add(i)), acc0);
+        acc1 = _mm256_fmadd_pd(_mm256_loadu_pd(pa.add(i + 4)), _mm256_loadu_pd(pb.add(i + 4)), acc1);
+        acc2 = _mm256_fmadd_pd(_mm256_loadu_pd(pa.add(i + 8)), _mm256_loadu_pd(pb.add(i + 8)), acc2);
+        acc3 = _mm256_fmadd_pd(_mm256_loadu_pd(pa.add(i + 12)), _mm256_loadu_pd(pb.add(i + 12)), acc3);
+        i += 16;
+    }
+    while i + 4 <= n {
+        acc0 = _mm256_fmadd_pd(_mm256_loadu_pd(pa.add(i)), _mm256_loadu_pd(pb.add(i)), acc0);
+        i += 4;
+    }
+
+    // Horizontal sum
+    let acc = _mm256_add_pd(_mm256_add_pd(acc0, acc1), _mm256_add_pd(acc2, acc3));
+    let mut lanes = [0.0; 4];
+    _mm256_storeu_pd(lanes.as_mut_ptr(), acc);
+    let mut sum = (lanes[0] + lanes[1]) + (lanes[2] + lanes[3]);
+
+    while i < n {
+        sum += *pa.add(i) * *pb.add(i);
+        i += 1;
+    }
+    sum
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn fir_block_avx2_fma(input: &[f64], taps_reversed: &[f64], output: &mut [f64]) {
+    let m = taps_reversed.len();
+    for (n, out) in output.iter_mut().enumerate() {
+        *out = dot_avx2_fma(&input[n..n + m], taps_reversed);
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn dot_symmetric_avx2_fma(window: &[f64], half: &[f64]) -> f64 {
+    use std::arch::x86_64::*;
+
+    let m = window.len();
+    let pairs = m / 2;
+    let pw = window.as_ptr();
+    let ph = half.as_ptr();
+
+    let mut acc0 = _mm256_setzero_pd();
+    let mut acc1 = _mm256_setzero_pd();
+
+    // Load the mirrored samples as one vector and reverse its lanes
+    let mut i = 0;
+    while i + 8 <= pairs {
+        let back0 = _mm256_permute4x64_pd::<0x1B>(_mm256_loadu_pd(pw.add(m - 4 - i)));
+        let back1 = _mm256_permute4x64_pd::<0x1B>(_mm256_loadu_pd(pw.add(m - 8 - i)));
+        let sum0 = _mm256_add_pd(_mm256_loadu_pd(pw.add(i)), back0);
+        let sum1 = _mm256_add_pd(_mm256_loadu_pd(pw.add(i + 4)), back1);
+        acc0 = _mm256_fmadd_pd(_mm256_loadu_pd(ph.add(i)), sum0, acc0);
+        acc1 = _mm256_fmadd_pd(_mm256_loadu_pd(ph.add(i + 4)), sum1, acc1);
+        i += 8;
+    }
+    while i + 4 <= pairs {
+        let back = _mm256_permute4x64_pd::<0x1B>(_mm256_loadu_pd(pw.add(m - 4 - i)));
+        let sum = _mm256_add_pd(_mm256_loadu_pd(pw.add(i)), back);
+        acc0 = _mm256_fmadd_pd(_mm256_loadu_pd(ph.add(i)), sum, acc0);
+        i += 4;
+    }
+
+    let acc = _mm256_add_pd(acc0, acc1);
+    let mut lanes = [0.0; 4];
+    _mm256_storeu_pd(lanes.as_mut_ptr(), acc);
+    let mut sum = (lanes[0] + lanes[1]) + (lanes[2] + lanes[3]);
+
+    while i < pairs {
+        sum += *ph.add(i) * (*pw.add(i) + *pw.add(m - 1 - i));
+        i += 1;
+    }
+    if m % 2 == 1 {
+        sum += *ph.add(pairs) * *pw.add(pairs);
+    }
+    sum
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn fir_block_symmetric_avx2_fma(input: &[f64], half: &[f64], length: usize, output: &mut [f64]) {
+    for (n, out) in output.iter_mut().enumerate() {
+        *out = dot_symmetric_avx2_fma(&input[n..n + length], half);
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn dot_reference(a: &[f64], b: &[f64]) -> f64 {
+        a.iter().zip(b).map(|(x, y)| x * y).sum()
+    }
+
+    #[test]
+    fn test_dot_matches_reference() {
+        // Cover every remainder length of the unrolled loops
+        for n in 0..40 {
+            let a: Vec<f64> = (0..n).map(|i| (i as f64 * 0.7).sin()).collect();
+            let b: Vec<f64> = (0..n).map(|i| (i as f64 * 0.3).cos()).collect();
+
+            let expected = dot_reference(&a, &b);
+            assert!((dot(&a, &b) - expected).abs() < 1e-12);
+            assert!((dot_scalar(&a, &b) - expected).abs() < 1e-12);
+        }
+    }
+
+    #[test]
+    fn test_fir_block_symmetric_matches_full() {
+        // Even and odd lengths, including ones shorter than a vector
+        for length in 1..40 {
+            let taps: Vec<f64> = (0..length)
+                .map(|k| {
+                    let mirrored = k.min(length - 1 - k) as f64;
+                    1.0 / (1.0 + mirrored)
+                })
+                .collect();
+            let half = &taps[..(length + 1) / 2];
+
+            let input: Vec<f64> = (0..length + 20).map(|i| (i as f64 * 0.41).sin()).collect();
+            let mut expected = vec![0.0; 21];
+            let mut output = vec![0.0; 21];
+
+            fir_block(&input, &taps, &mut expected);
+            fir_block_symmetric(&input, half, length, &mut output);
+
+            for (y, e) in output.iter().zip(&expected) {
+                assert!((y - e).abs() < 1e-12, "length {}: {} vs {}", length, y, e);
+            }
+        }
+    }
+
+    #[test]
+    fn test_fir_block_moving_sum() {
+        let input = [1.0, 2.0, 3.0, 4.0, 5.0];
+        let taps = [1.0, 1.0, 1.0];
+        let mut output = [0.0; 3];
+
+        fir_block(&input, &taps, &mut output);
+        assert_eq!(output, [6.0, 9.0, 12.0]);
+    }
+}
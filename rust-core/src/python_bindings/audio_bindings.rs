@@ -74,7 +74,7 @@ impl PyAudioEngine {
         let (producer, mut consumer) = rb.split();
         
         // Start audio input
-        let input = AudioInput::from_default_device(producer)
+        let input = AudioInput::from_default_device(producer, None)
             .map_err(|e| {
                 PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(
                     format!("Failed to create audio input: {}", e),
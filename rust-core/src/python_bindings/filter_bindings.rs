@@ -87,7 +87,7 @@ impl PyFirFilter {
         })
     }
     
-    /// Process a block of samples
+    /// Process a block of samples (releases the GIL while filtering)
     /// 
     /// Args:
     ///     input_signal: Input samples as numpy array
@@ -100,7 +100,8 @@ impl PyFirFilter {
         input_signal: PyReadonlyArray1<f64>,
     ) -> PyResult<&'py PyArray1<f64>> {
         let input = input_signal.as_slice().unwrap();
-        let output = self.filter.process_block(input);
+        let filter = &mut self.filter;
+        let output = py.allow_threads(move || filter.process_block(input));
         
         Ok(PyArray1::from_vec(py, output))
     }
@@ -14,12 +14,22 @@ fn spectral_workbench(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_class::<spectrum_bindings::PySpectrumAnalyzer>()?;
     m.add_class::<audio_bindings::PyAudioEngine>()?;
     m.add_class::<processor_bindings::PyAudioProcessor>()?;
+    m.add_class::<processor_bindings::PyFrameIterator>()?;
+    m.add_class::<processor_bindings::PyFrameWaiter>()?;
+    m.add_class::<processor_bindings::PyOfflineProcessor>()?;
     
     // Add WindowType enum
     m.add_class::<filter_bindings::PyWindowType>()?;
     
     // Add FilterType enum
     m.add_class::<processor_bindings::PyFilterType>()?;
+
+    // Batch STFT of whole signals
+    m.add_function(wrap_pyfunction!(spectrum_bindings::stft, m)?)?;
+
+    // Buffer sizes for get_results_into
+    m.add("MAX_WAVEFORM_SIZE", crate::audio::processor::MAX_WAVEFORM_SIZE)?;
+    m.add("MAX_SPECTRUM_SIZE", crate::audio::processor::MAX_SPECTRUM_SIZE)?;
     
     Ok(())
 }
@@ -1,8 +1,16 @@
 //! Python bindings for unified audio processor
 
 use pyo3::prelude::*;
-use numpy::PyArray1;
-use crate::audio::{AudioProcessor, processor::FilterType};
+use numpy::{PyArray1, PyArray2, PyArray3, PyReadonlyArray1, PyReadwriteArray1};
+use crate::audio::{AudioProcessor, processor::{AnalysisRate, FilterType, TriggerSource, MAX_WAVEFORM_SIZE, MAX_SPECTRUM_SIZE}};
+use crate::audio::trigger::{TriggerConfig, TriggerMode, TriggerSlope};
+use crate::audio::envelope::{envelope_columns, min_max_envelope_into};
+use crate::audio::notify::FrameSignal;
+use crate::audio::offline::OfflinePipeline;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::Duration;
+use crate::spectrum::{AveragingMode, waterfall::RGBA_CHANNELS};
 use super::filter_bindings::PyWindowType;
 
 /// Filter type for Python
@@ -26,10 +34,21 @@ impl From<PyFilterType> for FilterType {
 
 /// Unified audio processor exposed to Python
 /// 
-/// Eliminates Python/Rust boundary overhead - all processing happens in Rust thread
-#[pyclass(name = "AudioProcessor", unsendable)]
+/// Eliminates Python/Rust boundary overhead - all processing happens in Rust thread.
+/// Blocking calls (start, stop, filter design) release the GIL and do not
+/// hold the processor meanwhile, so other threads can keep calling it.
+#[pyclass(name = "AudioProcessor")]
 pub struct PyAudioProcessor {
     processor: AudioProcessor,
+
+    /// Frequency-axis generation last sent to Python
+    sent_generation: Option<u64>,
+
+    /// Sequence number of the next spectrogram row not yet returned
+    spectrogram_seq: u64,
+
+    /// Sequence number of the next rendered waterfall row not yet returned
+    waterfall_seq: u64,
 }
 
 #[pymethods]
@@ -39,6 +58,9 @@ impl PyAudioProcessor {
     fn new() -> Self {
         Self {
             processor: AudioProcessor::new(),
+            sent_generation: None,
+            spectrogram_seq: 0,
+            waterfall_seq: 0,
         }
     }
     
@@ -46,14 +68,22 @@ impl PyAudioProcessor {
     /// 
     /// Returns:
     ///     Device name as string
-    fn start(&mut self) -> PyResult<String> {
-        self.processor.start()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e))
+    fn start(slf: &PyCell<Self>, py: Python<'_>) -> PyResult<String> {
+        // Open the device without holding the processor, so other threads
+        // (e.g. a timer polling get_results) can keep using it meanwhile
+        let min_block_fill = slf.try_borrow()?.processor.min_block_fill();
+        let input = py
+            .allow_threads(move || AudioProcessor::open_input(min_block_fill))
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e))?;
+        Ok(slf.try_borrow_mut()?.processor.start_with(input))
     }
     
     /// Stop audio processing
-    fn stop(&mut self) {
-        self.processor.stop();
+    fn stop(slf: &PyCell<Self>, py: Python<'_>) -> PyResult<()> {
+        let capture = slf.try_borrow_mut()?.processor.detach_capture();
+        let chain = py.allow_threads(move || capture.shutdown());
+        slf.try_borrow_mut()?.processor.finish_stop(chain);
+        Ok(())
     }
     
     /// Design and apply new filter
@@ -68,17 +98,231 @@ impl PyAudioProcessor {
     /// Returns:
     ///     Tuple of (filter_length, group_delay)
     fn design_filter(
-        &mut self,
+        slf: &PyCell<Self>,
+        py: Python<'_>,
         omega_c1: f64,
         omega_c2: f64,
         delta_omega: f64,
         window_type: PyWindowType,
         filter_type: PyFilterType,
     ) -> PyResult<(usize, f64)> {
-        self.processor.design_filter(omega_c1, omega_c2, delta_omega, window_type.into(), filter_type.into())
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e))
+        let (window_type, filter_type) = (window_type.into(), filter_type.into());
+        let (block_size, max_latency) = {
+            let this = slf.try_borrow()?;
+            (this.processor.min_block_fill(), this.processor.max_filter_latency())
+        };
+
+        // Design and build (possibly benchmarking) without holding the processor
+        let prepared = py.allow_threads(move || {
+            AudioProcessor::prepare_filter(omega_c1, omega_c2, delta_omega, window_type, filter_type, block_size, max_latency)
+        });
+        Ok(slf.try_borrow_mut()?.processor.install_filter(prepared))
     }
     
+    /// Set crossfade length used when filters are swapped
+    ///
+    /// Args:
+    ///     samples: Crossfade length in samples (0 = hard switch)
+    fn set_crossfade_samples(&self, samples: usize) {
+        self.processor.set_crossfade_samples(samples);
+    }
+
+    /// Get crossfade length in samples
+    fn crossfade_samples(&self) -> usize {
+        self.processor.crossfade_samples()
+    }
+
+    /// Set overlap between consecutive analysis frames
+    ///
+    /// Args:
+    ///     overlap: Overlap fraction (0.0 = none, 0.5 = 50%, 0.75 = 75%)
+    fn set_analysis_overlap(&self, overlap: f64) {
+        self.processor.set_analysis_overlap(overlap);
+    }
+
+    /// Get overlap between consecutive analysis frames
+    fn analysis_overlap(&self) -> f64 {
+        self.processor.analysis_overlap()
+    }
+
+    /// Limit how often the spectrum is recomputed
+    ///
+    /// Filtering and monitoring keep running at audio rate.
+    ///
+    /// Args:
+    ///     fps: Maximum spectra per second (0 = analyze every STFT hop)
+    fn set_analysis_rate(&self, fps: f64) {
+        let rate = if fps > 0.0 { AnalysisRate::MaxFps(fps) } else { AnalysisRate::EveryHop };
+        self.processor.set_analysis_rate(rate);
+    }
+
+    /// Recompute the spectrum only after results were fetched
+    ///
+    /// Analysis then follows the reader's polling rate exactly.
+    fn set_analysis_on_demand(&self) {
+        self.processor.set_analysis_rate(AnalysisRate::OnDemand);
+    }
+
+    /// Set spectrum averaging mode
+    ///
+    /// Args:
+    ///     mode: 'none', 'welch', 'exponential' or 'peak_hold'
+    ///     parameter: Frames for 'welch', time constant in seconds for
+    ///         'exponential', decay in dB/s for 'peak_hold' (ignored for 'none')
+    #[pyo3(signature = (mode, parameter=0.0))]
+    fn set_averaging(&self, mode: &str, parameter: f64) -> PyResult<()> {
+        let mode = match mode {
+            "none" => AveragingMode::None,
+            "welch" => AveragingMode::Welch { frames: parameter.max(1.0) as usize },
+            "exponential" => AveragingMode::Exponential { time_constant: parameter },
+            "peak_hold" => AveragingMode::PeakHold { decay_db_per_second: parameter },
+            other => {
+                return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                    format!("Unknown averaging mode: {}", other),
+                ))
+            }
+        };
+        self.processor.set_averaging(mode);
+        Ok(())
+    }
+
+    /// Configure the oscilloscope trigger
+    ///
+    /// Aligned frames are then available from get_scope_frame(), published
+    /// only when the trigger fires.
+    ///
+    /// Args:
+    ///     level: Trigger level
+    ///     slope: 'rising' or 'falling'
+    ///     frame_len: Captured frame length in samples (at most 4096)
+    ///     pre_trigger: Samples before the trigger point in each frame
+    ///     holdoff: Minimum samples between trigger points
+    ///     mode: 'auto' (free-run after auto_timeout samples) or 'normal'
+    ///     auto_timeout: Samples without a trigger before auto mode free-runs
+    ///     source: 'input' or 'filtered'
+    #[pyo3(signature = (
+        level=0.0,
+        slope="rising",
+        frame_len=2048,
+        pre_trigger=512,
+        holdoff=0,
+        mode="auto",
+        auto_timeout=4800,
+        source="filtered"
+    ))]
+    fn set_trigger(
+        &self,
+        level: f64,
+        slope: &str,
+        frame_len: usize,
+        pre_trigger: usize,
+        holdoff: usize,
+        mode: &str,
+        auto_timeout: usize,
+        source: &str,
+    ) -> PyResult<()> {
+        let invalid = |what: &str, value: &str| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Unknown trigger {}: {}", what, value))
+        };
+
+        let slope = match slope {
+            "rising" => TriggerSlope::Rising,
+            "falling" => TriggerSlope::Falling,
+            other => return Err(invalid("slope", other)),
+        };
+        let mode = match mode {
+            "auto" => TriggerMode::Auto,
+            "normal" => TriggerMode::Normal,
+            other => return Err(invalid("mode", other)),
+        };
+        let source = match source {
+            "input" => TriggerSource::Input,
+            "filtered" => TriggerSource::Filtered,
+            other => return Err(invalid("source", other)),
+        };
+
+        let config = TriggerConfig {
+            level,
+            slope,
+            frame_len,
+            pre_trigger,
+            holdoff,
+            mode,
+            auto_timeout,
+        };
+        self.processor.set_trigger(Some(config), source);
+        Ok(())
+    }
+
+    /// Disable the oscilloscope trigger
+    fn disable_trigger(&self) {
+        self.processor.set_trigger(None, TriggerSource::Filtered);
+    }
+
+    /// Get the latest triggered oscilloscope frame
+    ///
+    /// Returns:
+    ///     Dictionary with keys: 'input_waveform', 'filtered_waveform',
+    ///     'trigger_index', 'triggered', 'sequence', 'sample_rate'
+    ///     or None if no frame was captured since the last call
+    fn get_scope_frame<'py>(&mut self, py: Python<'py>) -> Option<PyObject> {
+        let frame = self.processor.get_scope_frame()?;
+        let dict = pyo3::types::PyDict::new(py);
+
+        dict.set_item("input_waveform", PyArray1::from_slice(py, &frame.input_waveform[..frame.len])).ok();
+        dict.set_item("filtered_waveform", PyArray1::from_slice(py, &frame.filtered_waveform[..frame.len])).ok();
+        dict.set_item("trigger_index", frame.trigger_index).ok();
+        dict.set_item("triggered", frame.triggered).ok();
+        dict.set_item("sequence", frame.sequence).ok();
+        dict.set_item("sample_rate", frame.sample_rate).ok();
+
+        Some(dict.into())
+    }
+
+    /// Set minimum buffered samples before the processing thread is woken
+    ///
+    /// Args:
+    ///     samples: Minimum fill level in samples (larger = fewer wakeups)
+    fn set_min_block_fill(&mut self, samples: usize) {
+        self.processor.set_min_block_fill(samples);
+    }
+
+    /// Set the largest convolution latency accepted for the user filter
+    ///
+    /// 256 (default) allows partitioned convolution for long filters; 0
+    /// keeps only engines without block delay. Applies to the next
+    /// design_filter, whose group delay includes the engine latency.
+    ///
+    /// Args:
+    ///     samples: Latency budget in samples
+    fn set_max_filter_latency(&mut self, samples: usize) {
+        self.processor.set_max_filter_latency(samples);
+    }
+
+    /// Get the largest convolution latency accepted for the user filter
+    fn max_filter_latency(&self) -> usize {
+        self.processor.max_filter_latency()
+    }
+
+    /// Get processing thread statistics
+    ///
+    /// Returns:
+    ///     Dictionary with keys: 'wakeups_per_second', 'average_block_fill',
+    ///     'wakeups', 'blocks', 'analyses_per_second', 'elapsed_seconds'
+    fn get_stats<'py>(&self, py: Python<'py>) -> PyObject {
+        let stats = self.processor.get_stats();
+        let dict = pyo3::types::PyDict::new(py);
+
+        dict.set_item("wakeups_per_second", stats.wakeups_per_second).ok();
+        dict.set_item("average_block_fill", stats.average_block_fill).ok();
+        dict.set_item("wakeups", stats.wakeups).ok();
+        dict.set_item("blocks", stats.blocks).ok();
+        dict.set_item("analyses_per_second", stats.analyses_per_second).ok();
+        dict.set_item("elapsed_seconds", stats.elapsed_seconds).ok();
+
+        dict.into()
+    }
+
     /// Set filter bypass state
     fn set_bypass(&self, bypass: bool) {
         self.processor.set_bypass(bypass);
@@ -102,6 +346,11 @@ impl PyAudioProcessor {
     fn is_monitoring(&self) -> bool {
         self.processor.is_monitoring()
     }
+
+    /// Get number of monitoring output underruns (0 if monitoring is off)
+    fn monitoring_underruns(&self) -> u64 {
+        self.processor.monitoring_underruns()
+    }
     
     /// Update FFT configuration
     fn update_fft_config(&self, fft_size: usize, window_type: PyWindowType) {
@@ -110,42 +359,389 @@ impl PyAudioProcessor {
     
     /// Get latest processing results
     ///
+    /// The frequency axis is only included when it changed since the last
+    /// call (FFT size or sample rate update); cache it on the Python side.
+    ///
+    /// With a display width, waveforms are sent as min/max envelopes (one
+    /// pair per pixel column) instead of every sample.
+    ///
+    /// Args:
+    ///     display_width: Plot width in columns (0 = full-resolution waveforms)
+    ///     detail: Optional (start, stop) sample range also sent at full resolution
+    ///
     /// Returns:
-    ///     Dictionary with keys: 'input_waveform', 'filtered_waveform',
-    ///     'spectrum_magnitude', 'spectrum_frequencies', 'sample_rate'
+    ///     Dictionary with keys: 'waveform_len', 'spectrum_magnitude',
+    ///     'spectrum_generation', 'sample_rate', and either
+    ///     'input_waveform'/'filtered_waveform' or, with a display width,
+    ///     'input_envelope'/'filtered_envelope' (interleaved min, max per
+    ///     column); 'input_detail'/'filtered_detail'/'detail_start' when a
+    ///     detail range is given; 'spectrum_frequencies' when the axis changed
     ///     or None if no new data
-    fn get_results<'py>(&self, py: Python<'py>) -> Option<PyObject> {
-        self.processor.get_results().map(|results| {
-            let dict = pyo3::types::PyDict::new(py);
-
-            // Slice fixed-size arrays to actual data length
-            let waveform_len = results.waveform_len;
-            let spectrum_len = results.spectrum_len;
-
-            dict.set_item(
-                "input_waveform",
-                PyArray1::from_slice(py, &results.input_waveform[..waveform_len]),
-            )
-            .ok();
-            dict.set_item(
-                "filtered_waveform",
-                PyArray1::from_slice(py, &results.filtered_waveform[..waveform_len]),
-            )
-            .ok();
-            dict.set_item(
-                "spectrum_magnitude",
-                PyArray1::from_slice(py, &results.spectrum_magnitude[..spectrum_len]),
-            )
-            .ok();
-            dict.set_item(
-                "spectrum_frequencies",
-                PyArray1::from_slice(py, &results.spectrum_frequencies[..spectrum_len]),
-            )
-            .ok();
-            dict.set_item("sample_rate", results.sample_rate).ok();
-
-            dict.into()
-        })
+    #[pyo3(signature = (display_width=0, detail=None))]
+    fn get_results<'py>(
+        &mut self,
+        py: Python<'py>,
+        display_width: usize,
+        detail: Option<(usize, usize)>,
+    ) -> Option<PyObject> {
+        let results = self.processor.get_results()?;
+        let dict = pyo3::types::PyDict::new(py);
+
+        // Slice fixed-size arrays to actual data length
+        let waveform_len = results.waveform_len;
+        let spectrum_len = results.spectrum_len;
+        let generation = results.spectrum_generation;
+        let input = &results.input_waveform[..waveform_len];
+        let filtered = &results.filtered_waveform[..waveform_len];
+
+        dict.set_item("waveform_len", waveform_len).ok();
+
+        if display_width == 0 {
+            dict.set_item("input_waveform", PyArray1::from_slice(py, input)).ok();
+            dict.set_item("filtered_waveform", PyArray1::from_slice(py, filtered)).ok();
+        } else {
+            let columns = envelope_columns(waveform_len, display_width);
+            for (key, waveform) in [("input_envelope", input), ("filtered_envelope", filtered)] {
+                let envelope = PyArray1::<f64>::zeros(py, 2 * columns, false);
+                // Freshly created array: no other view can alias it
+                if let Ok(out) = unsafe { envelope.as_slice_mut() } {
+                    min_max_envelope_into(waveform, display_width, out);
+                }
+                dict.set_item(key, envelope).ok();
+            }
+        }
+
+        if let Some((start, stop)) = detail {
+            let stop = stop.min(waveform_len);
+            let start = start.min(stop);
+            dict.set_item("input_detail", PyArray1::from_slice(py, &input[start..stop])).ok();
+            dict.set_item("filtered_detail", PyArray1::from_slice(py, &filtered[start..stop])).ok();
+            dict.set_item("detail_start", start).ok();
+        }
+
+        dict.set_item(
+            "spectrum_magnitude",
+            PyArray1::from_slice(py, &results.spectrum_magnitude[..spectrum_len]),
+        )
+        .ok();
+        dict.set_item("spectrum_generation", generation).ok();
+        dict.set_item("sample_rate", results.sample_rate).ok();
+        dict.set_item("sequence", results.sequence).ok();
+
+        // Send the axis only for a new generation, and only if it matches
+        // this frame (the config may have changed after the frame was made)
+        if self.sent_generation != Some(generation) {
+            if let Some((current, frequencies)) = self.processor.frequency_axis() {
+                if current == generation {
+                    dict.set_item("spectrum_frequencies", PyArray1::from_slice(py, &frequencies)).ok();
+                    self.sent_generation = Some(generation);
+                }
+            }
+        }
+
+        Some(dict.into())
+    }
+    
+    /// Copy the latest results into caller-provided arrays
+    ///
+    /// Writes into preallocated, writable, contiguous float64 arrays, so no
+    /// Python objects are created per frame apart from the returned tuple.
+    /// The arrays must hold at least MAX_WAVEFORM_SIZE / MAX_SPECTRUM_SIZE
+    /// values; they are checked before a frame is taken, so a ValueError
+    /// never loses a frame. Envelopes have at most MAX_WAVEFORM_SIZE / 2
+    /// columns.
+    ///
+    /// Args:
+    ///     input: Destination for the input waveform (or its envelope)
+    ///     filtered: Destination for the filtered waveform (or its envelope)
+    ///     magnitude: Destination for the spectrum magnitude in dB
+    ///     display_width: Write min/max envelopes with this many columns
+    ///         instead of every sample (0 = full resolution)
+    ///
+    /// Returns:
+    ///     (waveform_len, envelope_columns, spectrum_len, spectrum_generation,
+    ///     sequence, sample_rate), or None if no new data. Waveform arrays hold
+    ///     waveform_len samples, or 2 * envelope_columns interleaved min/max
+    ///     values when envelope_columns > 0
+    #[pyo3(signature = (input, filtered, magnitude, display_width=0))]
+    fn get_results_into(
+        &mut self,
+        mut input: PyReadwriteArray1<f64>,
+        mut filtered: PyReadwriteArray1<f64>,
+        mut magnitude: PyReadwriteArray1<f64>,
+        display_width: usize,
+    ) -> PyResult<Option<(usize, usize, usize, u64, u64, f64)>> {
+        // Validate every destination before consuming the frame
+        let input_out = writable_prefix("input", &mut input, MAX_WAVEFORM_SIZE)?;
+        let filtered_out = writable_prefix("filtered", &mut filtered, MAX_WAVEFORM_SIZE)?;
+        let magnitude_out = writable_prefix("magnitude", &mut magnitude, MAX_SPECTRUM_SIZE)?;
+
+        let results = match self.processor.get_results() {
+            Some(results) => results,
+            None => return Ok(None),
+        };
+
+        let waveform_len = results.waveform_len;
+        let spectrum_len = results.spectrum_len;
+        let display_width = display_width.min(MAX_WAVEFORM_SIZE / 2);
+        let columns = if display_width == 0 { 0 } else { envelope_columns(waveform_len, display_width) };
+
+        for (out, waveform) in [
+            (input_out, &results.input_waveform[..waveform_len]),
+            (filtered_out, &results.filtered_waveform[..waveform_len]),
+        ] {
+            if columns == 0 {
+                out[..waveform_len].copy_from_slice(waveform);
+            } else {
+                min_max_envelope_into(waveform, display_width, &mut out[..2 * columns]);
+            }
+        }
+
+        magnitude_out[..spectrum_len].copy_from_slice(&results.spectrum_magnitude[..spectrum_len]);
+
+        Ok(Some((
+            waveform_len,
+            columns,
+            spectrum_len,
+            results.spectrum_generation,
+            results.sequence,
+            results.sample_rate,
+        )))
+    }
+
+    /// Set how many frames the batched result queue holds (applied on start)
+    ///
+    /// Args:
+    ///     capacity: Maximum pending frames (0 disables the queue)
+    fn set_result_queue_capacity(&mut self, capacity: usize) {
+        self.processor.set_result_queue_capacity(capacity);
+    }
+
+    /// Get all pending frames from the result queue
+    ///
+    /// Requires set_result_queue_capacity(n > 0) before start(). Frames are
+    /// stacked row-wise; rows shorter than the widest frame are zero padded.
+    ///
+    /// Args:
+    ///     max_frames: Maximum frames to return (None = all pending)
+    ///
+    /// Returns:
+    ///     Dictionary with 2D arrays 'input_waveform', 'filtered_waveform',
+    ///     'spectrum_magnitude' (one row per frame), 1D arrays 'waveform_len',
+    ///     'spectrum_len', 'spectrum_generation', 'sequence', plus 'dropped'
+    ///     (frames lost to a full queue since start) and 'sample_rate'
+    #[pyo3(signature = (max_frames=None))]
+    fn get_results_batch<'py>(&mut self, py: Python<'py>, max_frames: Option<usize>) -> PyResult<PyObject> {
+        let queue = self.processor.result_queue().ok_or_else(|| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>("Result queue not enabled (set_result_queue_capacity before start)")
+        })?;
+
+        let count = queue.pending().min(max_frames.unwrap_or(usize::MAX));
+        let frames: Vec<_> = (0..count).map(|i| queue.get(i)).collect();
+        let waveform_width = frames.iter().map(|f| f.waveform_len).max().unwrap_or(0);
+        let spectrum_width = frames.iter().map(|f| f.spectrum_len).max().unwrap_or(0);
+
+        let input = PyArray2::<f64>::zeros(py, [count, waveform_width], false);
+        let filtered = PyArray2::<f64>::zeros(py, [count, waveform_width], false);
+        let magnitude = PyArray2::<f64>::zeros(py, [count, spectrum_width], false);
+
+        // Freshly created arrays: no other view can alias them
+        if let (Ok(input_out), Ok(filtered_out), Ok(magnitude_out)) =
+            unsafe { (input.as_slice_mut(), filtered.as_slice_mut(), magnitude.as_slice_mut()) }
+        {
+            for (row, frame) in frames.iter().enumerate() {
+                let w = frame.waveform_len;
+                let s = frame.spectrum_len;
+                input_out[row * waveform_width..row * waveform_width + w].copy_from_slice(&frame.input_waveform[..w]);
+                filtered_out[row * waveform_width..row * waveform_width + w].copy_from_slice(&frame.filtered_waveform[..w]);
+                magnitude_out[row * spectrum_width..row * spectrum_width + s].copy_from_slice(&frame.spectrum_magnitude[..s]);
+            }
+        }
+
+        let dict = pyo3::types::PyDict::new(py);
+        dict.set_item("input_waveform", input)?;
+        dict.set_item("filtered_waveform", filtered)?;
+        dict.set_item("spectrum_magnitude", magnitude)?;
+        dict.set_item("waveform_len", PyArray1::from_iter(py, frames.iter().map(|f| f.waveform_len)))?;
+        dict.set_item("spectrum_len", PyArray1::from_iter(py, frames.iter().map(|f| f.spectrum_len)))?;
+        dict.set_item("spectrum_generation", PyArray1::from_iter(py, frames.iter().map(|f| f.spectrum_generation)))?;
+        dict.set_item("sequence", PyArray1::from_iter(py, frames.iter().map(|f| f.sequence)))?;
+        dict.set_item("sample_rate", frames.last().map_or(0.0, |f| f.sample_rate))?;
+        dict.set_item("dropped", queue.dropped())?;
+
+        queue.consume(count);
+        Ok(dict.into())
+    }
+
+    /// Iterate over results frames as they are published
+    ///
+    /// Each step blocks (with the GIL released) until the processing thread
+    /// publishes a new frame; no polling. Frames are taken from the same
+    /// slot get_results reads, so do not also poll get_results meanwhile.
+    ///
+    /// Args:
+    ///     timeout: Seconds to wait for a frame before the iteration ends
+    ///     display_width: Passed to get_results (0 = full-resolution waveforms)
+    ///
+    /// Returns:
+    ///     Iterator of get_results() dictionaries; ends on timeout or stop()
+    #[pyo3(signature = (timeout=1.0, display_width=0))]
+    fn iter_frames(slf: PyRef<'_, Self>, timeout: f64, display_width: usize) -> PyFrameIterator {
+        let signal = slf.processor.frame_signal();
+        PyFrameIterator {
+            seen: signal.sequence(),
+            signal,
+            timeout: timeout_duration(timeout),
+            display_width,
+            processor: slf.into(),
+        }
+    }
+
+    /// Get a thread-safe waiter for new results frames
+    ///
+    /// Unlike the processor itself, the waiter may be used from any thread,
+    /// e.g. an asyncio executor.
+    fn frame_waiter(&self) -> PyFrameWaiter {
+        PyFrameWaiter {
+            signal: self.processor.frame_signal(),
+            cancelled: Arc::new(AtomicBool::new(false)),
+        }
+    }
+
+    /// Run a recording through the processing chain without a device
+    ///
+    /// Uses fresh copies of the current noise gate, filter, FFT, averaging
+    /// and overlap settings; the live stream is not affected. Runs with the
+    /// GIL released, as fast as the CPU allows.
+    ///
+    /// Args:
+    ///     signal: Input samples (1D float64 array)
+    ///     block_size: Samples per chain block (default: min_block_fill)
+    ///     sample_rate: Sample rate of the recording (default: current rate)
+    ///
+    /// Returns:
+    ///     Dictionary with 'filtered' (same length as signal), 'spectrogram'
+    ///     (rows x bins, dB), 'frequencies', 'hop' and 'sample_rate'
+    #[pyo3(signature = (signal, block_size=None, sample_rate=None))]
+    fn process_offline<'py>(
+        slf: &PyCell<Self>,
+        py: Python<'py>,
+        signal: PyReadonlyArray1<f64>,
+        block_size: Option<usize>,
+        sample_rate: Option<f64>,
+    ) -> PyResult<PyObject> {
+        // Processor borrowed only to copy the settings, not while running
+        let mut pipeline = slf.try_borrow()?.offline_pipeline(block_size, sample_rate);
+        let results = run_offline(py, &mut pipeline, &signal)?;
+
+        results.set_item("frequencies", PyArray1::from_slice(py, pipeline.frequency_axis_hz()))?;
+        Ok(results.into())
+    }
+
+    /// Create an offline processor for recordings fed in chunks
+    ///
+    /// Args:
+    ///     block_size: Samples per chain block (default: min_block_fill)
+    ///     sample_rate: Sample rate of the recording (default: current rate)
+    ///
+    /// Returns:
+    ///     OfflineProcessor keeping filter and analysis state between chunks
+    #[pyo3(signature = (block_size=None, sample_rate=None))]
+    fn offline_processor(&self, block_size: Option<usize>, sample_rate: Option<f64>) -> PyOfflineProcessor {
+        PyOfflineProcessor {
+            pipeline: self.offline_pipeline(block_size, sample_rate),
+        }
+    }
+
+    /// Get the spectrum frequency axis
+    ///
+    /// Returns:
+    ///     (generation, frequencies in Hz); compare the generation with the
+    ///     one returned by get_results_into to tell whether they match
+    fn get_frequency_axis<'py>(&self, py: Python<'py>) -> Option<(u64, &'py PyArray1<f64>)> {
+        self.processor
+            .frequency_axis()
+            .map(|(generation, frequencies)| (generation, PyArray1::from_vec(py, frequencies)))
+    }
+
+    /// Get the spectrogram (waterfall) history
+    ///
+    /// Args:
+    ///     new_only: Return only rows added since the previous call
+    ///
+    /// Returns:
+    ///     2D float64 array of shape (rows, bins), oldest row first
+    #[pyo3(signature = (new_only=false))]
+    fn get_spectrogram<'py>(&mut self, py: Python<'py>, new_only: bool) -> &'py PyArray2<f64> {
+        let since = if new_only { self.spectrogram_seq } else { 0 };
+
+        let (array, next_seq) = self
+            .processor
+            .with_spectrogram(|ring| {
+                let (first, count) = ring.rows_since(since);
+                let array = PyArray2::<f64>::zeros(py, [count, ring.bins()], false);
+                // Freshly created array: no other view can alias it
+                if let Ok(out) = unsafe { array.as_slice_mut() } {
+                    ring.copy_rows(first, count, out);
+                }
+                (array, ring.next_seq())
+            })
+            .unwrap_or_else(|| (PyArray2::<f64>::zeros(py, [0, 0], false), since));
+
+        self.spectrogram_seq = next_seq;
+        array
+    }
+
+    /// Discard all spectrogram rows
+    fn clear_spectrogram(&self) {
+        self.processor.clear_spectrogram();
+    }
+
+    /// Enable or disable RGBA waterfall rendering in the processing thread
+    fn set_waterfall_rendering(&self, enabled: bool) {
+        self.processor.set_waterfall_rendering(enabled);
+    }
+
+    /// Set the waterfall colormap
+    ///
+    /// Args:
+    ///     colors: List of (r, g, b) tuples from lowest to highest level
+    fn set_waterfall_colormap(&self, colors: Vec<(u8, u8, u8)>) -> PyResult<()> {
+        if colors.is_empty() {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>("Colormap needs at least one color"));
+        }
+
+        let stops: Vec<[u8; 3]> = colors.iter().map(|&(r, g, b)| [r, g, b]).collect();
+        self.processor.set_waterfall_colormap(&stops);
+        Ok(())
+    }
+
+    /// Get rendered waterfall rows (requires set_waterfall_rendering(True))
+    ///
+    /// Args:
+    ///     new_only: Return only rows rendered since the previous call
+    ///
+    /// Returns:
+    ///     3D uint8 array of shape (rows, bins, 4) with RGBA pixels, oldest row first
+    #[pyo3(signature = (new_only=true))]
+    fn get_waterfall_image<'py>(&mut self, py: Python<'py>, new_only: bool) -> &'py PyArray3<u8> {
+        let since = if new_only { self.waterfall_seq } else { 0 };
+
+        let (array, next_seq) = self
+            .processor
+            .with_waterfall_image(|image| {
+                let (first, count) = image.rows_since(since);
+                let array = PyArray3::<u8>::zeros(py, [count, image.bins() / RGBA_CHANNELS, RGBA_CHANNELS], false);
+                // Freshly created array: no other view can alias it
+                if let Ok(out) = unsafe { array.as_slice_mut() } {
+                    image.copy_rows(first, count, out);
+                }
+                (array, image.next_seq())
+            })
+            .unwrap_or_else(|| (PyArray3::<u8>::zeros(py, [0, 0, RGBA_CHANNELS], false), since));
+
+        self.waterfall_seq = next_seq;
+        array
     }
     
     /// List available audio devices
@@ -173,3 +769,185 @@ impl PyAudioProcessor {
         self.processor.is_gate_enabled()
     }
 }
+
+impl PyAudioProcessor {
+    /// Offline pipeline with the current settings
+    fn offline_pipeline(&self, block_size: Option<usize>, sample_rate: Option<f64>) -> OfflinePipeline {
+        let block_size = block_size.unwrap_or_else(|| self.processor.min_block_fill());
+        self.processor.offline_pipeline(block_size, sample_rate)
+    }
+}
+
+/// Blocking iterator over published results frames (see `iter_frames`)
+#[pyclass(name = "FrameIterator")]
+pub struct PyFrameIterator {
+    processor: Py<PyAudioProcessor>,
+    signal: Arc<FrameSignal>,
+    seen: u64,
+    timeout: Duration,
+    display_width: usize,
+}
+
+#[pymethods]
+impl PyFrameIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self, py: Python<'_>) -> Option<PyObject> {
+        loop {
+            let (signal, seen, timeout) = (Arc::clone(&self.signal), self.seen, self.timeout);
+            self.seen = py.allow_threads(move || signal.wait_after(seen, timeout))?;
+
+            // The processor may be in use on another thread, or another
+            // reader may have taken the frame; wait for the next one
+            let mut processor = match self.processor.try_borrow_mut(py) {
+                Ok(processor) => processor,
+                Err(_) => continue,
+            };
+            if let Some(results) = processor.get_results(py, self.display_width, None) {
+                return Some(results);
+            }
+        }
+    }
+}
+
+/// Thread-safe wait for new results frames
+#[pyclass(name = "FrameWaiter")]
+pub struct PyFrameWaiter {
+    signal: Arc<FrameSignal>,
+
+    /// Set by `close`; ends current and future waits of this waiter only
+    cancelled: Arc<AtomicBool>,
+}
+
+#[pymethods]
+impl PyFrameWaiter {
+    /// Block (GIL released) until a frame newer than `after` is published
+    ///
+    /// Args:
+    ///     after: Sequence number already seen
+    ///     timeout: Maximum seconds to wait
+    ///
+    /// Returns:
+    ///     Newest sequence number, or None on timeout, after stop() or
+    ///     after close()
+    #[pyo3(signature = (after=0, timeout=1.0))]
+    fn wait(&self, py: Python<'_>, after: u64, timeout: f64) -> Option<u64> {
+        let (signal, cancelled) = (Arc::clone(&self.signal), Arc::clone(&self.cancelled));
+        let timeout = timeout_duration(timeout);
+        py.allow_threads(move || signal.wait_after_unless(after, timeout, &cancelled))
+    }
+
+    /// Release a wait blocked on another thread and end all further waits
+    ///
+    /// Other waiters and iterators of the processor are not affected.
+    fn close(&self) {
+        self.cancelled.store(true, Ordering::SeqCst);
+        self.signal.wake_all();
+    }
+
+    /// Sequence number of the newest published frame
+    fn sequence(&self) -> u64 {
+        self.signal.sequence()
+    }
+}
+
+/// Processing chain fed from memory (see `offline_processor`)
+#[pyclass(name = "OfflineProcessor")]
+pub struct PyOfflineProcessor {
+    pipeline: OfflinePipeline,
+}
+
+#[pymethods]
+impl PyOfflineProcessor {
+    /// Process the next chunk of a recording (GIL released)
+    ///
+    /// Filter and analysis state carry over, so chunks produce the same
+    /// output as one process_offline call on the whole recording.
+    ///
+    /// Args:
+    ///     chunk: Next input samples (1D float64 array)
+    ///
+    /// Returns:
+    ///     Dictionary with 'filtered', 'spectrogram' (rows completed in this
+    ///     chunk), 'hop' and 'sample_rate'
+    fn process(&mut self, py: Python<'_>, chunk: PyReadonlyArray1<f64>) -> PyResult<PyObject> {
+        Ok(run_offline(py, &mut self.pipeline, &chunk)?.into())
+    }
+
+    /// Get frequency of each spectrogram column in Hz
+    fn frequencies<'py>(&self, py: Python<'py>) -> &'py PyArray1<f64> {
+        PyArray1::from_slice(py, self.pipeline.frequency_axis_hz())
+    }
+
+    /// Get samples between spectrogram rows
+    fn hop(&self) -> usize {
+        self.pipeline.hop()
+    }
+
+    /// Get sample rate the analysis assumes
+    fn sample_rate(&self) -> f64 {
+        self.pipeline.sample_rate()
+    }
+}
+
+/// Run samples through an offline pipeline into preallocated numpy arrays
+fn run_offline<'py>(
+    py: Python<'py>,
+    pipeline: &mut OfflinePipeline,
+    signal: &PyReadonlyArray1<'_, f64>,
+) -> PyResult<&'py pyo3::types::PyDict> {
+    let input = signal.as_slice().map_err(|_| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>("'signal' must be a contiguous array")
+    })?;
+
+    let rows = pipeline.rows_for(input.len());
+    let bins = pipeline.num_bins();
+    let filtered = PyArray1::<f64>::zeros(py, input.len(), false);
+    let spectrogram = PyArray2::<f64>::zeros(py, [rows, bins], false);
+
+    {
+        // Freshly created arrays: no other view can alias them
+        let filtered_out = unsafe { filtered.as_slice_mut() }.expect("new array is contiguous");
+        let spectrogram_out = unsafe { spectrogram.as_slice_mut() }.expect("new array is contiguous");
+
+        py.allow_threads(|| {
+            let mut rows = spectrogram_out.chunks_exact_mut(bins.max(1));
+            pipeline.process(input, filtered_out, |row| {
+                if let Some(out) = rows.next() {
+                    out[..row.len()].copy_from_slice(row);
+                }
+            });
+        });
+    }
+
+    let results = pyo3::types::PyDict::new(py);
+    results.set_item("filtered", filtered)?;
+    results.set_item("spectrogram", spectrogram)?;
+    results.set_item("hop", pipeline.hop())?;
+    results.set_item("sample_rate", pipeline.sample_rate())?;
+    Ok(results)
+}
+
+/// Convert a Python timeout in seconds (clamped to 0 s .. 1 day)
+fn timeout_duration(seconds: f64) -> Duration {
+    let seconds = if seconds.is_nan() { 0.0 } else { seconds.clamp(0.0, 86_400.0) };
+    Duration::from_secs_f64(seconds)
+}
+
+/// First `needed` values of a caller-provided array, or a ValueError
+fn writable_prefix<'a>(name: &str, array: &'a mut PyReadwriteArray1<'_, f64>, needed: usize) -> PyResult<&'a mut [f64]> {
+    let out = array.as_slice_mut().map_err(|_| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("'{}' must be a contiguous array", name))
+    })?;
+    if out.len() < needed {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "'{}' holds {} values, needs {}",
+            name,
+            out.len(),
+            needed
+        )));
+    }
+    Ok(&mut out[..needed])
+}
@@ -1,8 +1,10 @@
 //! Python bindings for spectrum analysis
 
 use pyo3::prelude::*;
-use numpy::{PyArray1, PyReadonlyArray1};
+use numpy::{PyArray1, PyArray2, PyReadonlyArray1};
 use crate::spectrum::{SpectrumAnalyzer, analysis::AnalyzerConfig};
+use crate::spectrum::batch::{stft_frames, stft_into};
+use crate::spectrum::stft::{DEFAULT_OVERLAP, hop_for_overlap};
 use super::filter_bindings::PyWindowType;
 
 /// Spectrum analyzer exposed to Python
@@ -40,7 +42,7 @@ impl PySpectrumAnalyzer {
         }
     }
     
-    /// Analyze signal and return magnitude spectrum
+    /// Analyze signal and return magnitude spectrum (releases the GIL)
     /// 
     /// Args:
     ///     signal: Input signal as numpy array
@@ -53,12 +55,13 @@ impl PySpectrumAnalyzer {
         signal: PyReadonlyArray1<f64>,
     ) -> PyResult<&'py PyArray1<f64>> {
         let sig = signal.as_slice().unwrap();
-        let spectrum = self.analyzer.analyze(sig);
+        let analyzer = &mut self.analyzer;
+        let spectrum = py.allow_threads(move || analyzer.analyze(sig));
         
         Ok(PyArray1::from_vec(py, spectrum))
     }
     
-    /// Analyze signal and return magnitude in dB
+    /// Analyze signal and return magnitude in dB (releases the GIL)
     /// 
     /// Args:
     ///     signal: Input signal as numpy array
@@ -74,7 +77,8 @@ impl PySpectrumAnalyzer {
         reference: f64,
     ) -> PyResult<&'py PyArray1<f64>> {
         let sig = signal.as_slice().unwrap();
-        let spectrum = self.analyzer.analyze_db(sig, reference);
+        let analyzer = &mut self.analyzer;
+        let spectrum = py.allow_threads(move || analyzer.analyze_db(sig, reference));
         
         Ok(PyArray1::from_vec(py, spectrum))
     }
@@ -145,3 +149,55 @@ impl PySpectrumAnalyzer {
         self.analyzer.config().fft_size
     }
 }
+
+/// Short-time Fourier transform of a whole signal
+///
+/// All frames are computed in Rust in one call, split across threads, and
+/// written into one preallocated array with the GIL released.
+///
+/// Args:
+///     signal: Input samples (1D float64 array)
+///     fft_size: Frame length in samples
+///     hop: Samples between frame starts (default: 75% overlap)
+///     window: Window type
+///     db: Return magnitude in dB (reference 1.0) instead of linear
+///     threads: Worker threads (default: all available cores)
+///
+/// Returns:
+///     2D float64 array of shape (frames, fft_size // 2 + 1); frame k
+///     covers signal[k * hop : k * hop + fft_size]
+#[pyfunction]
+#[pyo3(signature = (signal, fft_size=2048, hop=None, window=PyWindowType::Hamming, db=true, threads=None))]
+pub fn stft<'py>(
+    py: Python<'py>,
+    signal: PyReadonlyArray1<f64>,
+    fft_size: usize,
+    hop: Option<usize>,
+    window: PyWindowType,
+    db: bool,
+    threads: Option<usize>,
+) -> PyResult<&'py PyArray2<f64>> {
+    if fft_size == 0 {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>("fft_size must be positive"));
+    }
+    let input = signal.as_slice().map_err(|_| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>("'signal' must be a contiguous array")
+    })?;
+
+    let hop = hop.unwrap_or_else(|| hop_for_overlap(fft_size, DEFAULT_OVERLAP)).max(1);
+    let config = AnalyzerConfig {
+        fft_size,
+        window_type: window.into(),
+        ..AnalyzerConfig::default()
+    };
+
+    let rows = stft_frames(input.len(), fft_size, hop);
+    let spectrogram = PyArray2::<f64>::zeros(py, [rows, fft_size / 2 + 1], false);
+    {
+        // Freshly created array: no other view can alias it
+        let out = unsafe { spectrogram.as_slice_mut() }.expect("new array is contiguous");
+        py.allow_threads(|| stft_into(input, &config, hop, db, threads.unwrap_or(0), out));
+    }
+
+    Ok(spectrogram)
+}
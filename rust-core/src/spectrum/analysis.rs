@@ -3,8 +3,8 @@
 //! Combines FFT engine with windowing for real-time spectral analysis
 
 use super::fft::FftEngine;
-use super::windowing::{apply_window, window_correction_factor};
-use crate::filters::windows::WindowType;
+use super::windowing::window_correction_factor;
+use crate::filters::windows::{WindowType, generate_window};
 
 /// Spectrum analyzer configuration
 #[derive(Debug, Clone)]
@@ -33,11 +33,66 @@ impl Default for AnalyzerConfig {
     }
 }
 
+/// Spectrum averaging mode
+/// 
+/// Averages are accumulated in the power domain (|X|²) and only converted
+/// to dB when read with `averaged_db_into`.
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub enum AveragingMode {
+    /// Instantaneous spectrum (no averaging)
+    None,
+    
+    /// Linear (Welch) average over the last `frames` frames
+    Welch { frames: usize },
+    
+    /// Exponential average with the given time constant in seconds
+    Exponential { time_constant: f64 },
+    
+    /// Peak hold, decaying at the given rate in dB per second
+    PeakHold { decay_db_per_second: f64 },
+}
+
+impl Default for AveragingMode {
+    fn default() -> Self {
+        AveragingMode::None
+    }
+}
+
 /// Real-time spectrum analyzer
 pub struct SpectrumAnalyzer {
     config: AnalyzerConfig,
     fft_engine: FftEngine,
     correction_factor: f64,
+    
+    /// Window table for the current window type (regenerated on config or length change)
+    window: Vec<f64>,
+    
+    /// Reusable windowed-signal buffer
+    windowed: Vec<f64>,
+    
+    /// Frequency axis in Hz for the current configuration
+    frequencies_hz: Vec<f64>,
+    
+    /// Configuration generation (incremented on every `update_config`)
+    generation: u64,
+    
+    /// Averaging mode
+    averaging: AveragingMode,
+    
+    /// Power spectrum of the latest accumulated frame
+    power: Vec<f64>,
+    
+    /// Accumulated power (Welch: running sum; exponential/peak: current value)
+    average: Vec<f64>,
+    
+    /// Welch frame history (`frames` power spectra, contiguous)
+    welch_history: Vec<f64>,
+    
+    /// Welch history slot to overwrite next
+    welch_pos: usize,
+    
+    /// Frames accumulated since the last reset (saturates at the Welch length)
+    frames_accumulated: usize,
 }
 
 impl SpectrumAnalyzer {
@@ -50,11 +105,47 @@ impl SpectrumAnalyzer {
             1.0
         };
         
-        Self {
+        let window = generate_window(config.window_type, config.fft_size);
+        let windowed = Vec::with_capacity(config.fft_size);
+        let frequencies_hz = Self::compute_frequency_axis(&fft_engine, config.sample_rate);
+        
+        let mut analyzer = Self {
             config,
             fft_engine,
             correction_factor,
+            window,
+            windowed,
+            frequencies_hz,
+            generation: 0,
+            averaging: AveragingMode::None,
+            power: Vec::new(),
+            average: Vec::new(),
+            welch_history: Vec::new(),
+            welch_pos: 0,
+            frames_accumulated: 0,
+        };
+        analyzer.reset_averaging();
+        analyzer
+    }
+    
+    /// Compute bin frequencies in Hz
+    fn compute_frequency_axis(fft_engine: &FftEngine, sample_rate: f64) -> Vec<f64> {
+        fft_engine
+            .frequency_axis()
+            .iter()
+            .map(|&f_norm| FftEngine::normalized_to_hz(f_norm, sample_rate))
+            .collect()
+    }
+    
+    /// Window `signal` into the reusable buffer using the cached table
+    fn apply_cached_window(&mut self, signal: &[f64]) {
+        // Only reallocates if callers change the input length
+        if self.window.len() != signal.len() {
+            self.window = generate_window(self.config.window_type, signal.len());
         }
+        
+        self.windowed.clear();
+        self.windowed.extend(signal.iter().zip(&self.window).map(|(&s, &w)| s * w));
     }
     
     /// Analyze signal and return magnitude spectrum
@@ -65,20 +156,34 @@ impl SpectrumAnalyzer {
     /// # Returns
     /// Magnitude spectrum |X[k]| for positive frequencies
     pub fn analyze(&mut self, signal: &[f64]) -> Vec<f64> {
-        // Apply window
-        let windowed = apply_window(signal, self.config.window_type);
+        let mut spectrum = vec![0.0; self.num_bins()];
+        self.analyze_into(signal, &mut spectrum);
+        spectrum
+    }
+    
+    /// Analyze signal into a caller-provided buffer (zero allocations)
+    /// 
+    /// # Arguments
+    /// * `signal` - Input signal (will be windowed and zero-padded if needed)
+    /// * `out` - Output buffer for |X[k]|
+    /// 
+    /// # Returns
+    /// Number of bins written (min of `out.len()` and `num_bins()`)
+    pub fn analyze_into(&mut self, signal: &[f64], out: &mut [f64]) -> usize {
+        // Apply cached window
+        self.apply_cached_window(signal);
         
         // Compute FFT magnitude
-        let mut spectrum = self.fft_engine.compute_magnitude(&windowed);
+        let len = self.fft_engine.compute_magnitude_into(&self.windowed, out);
         
         // Apply correction factor
         if self.config.apply_correction {
-            for s in spectrum.iter_mut() {
+            for s in out[..len].iter_mut() {
                 *s *= self.correction_factor;
             }
         }
         
-        spectrum
+        len
     }
     
     /// Analyze and return magnitude in dB
@@ -90,23 +195,49 @@ impl SpectrumAnalyzer {
     /// # Returns
     /// Magnitude spectrum in dB
     pub fn analyze_db(&mut self, signal: &[f64], reference: f64) -> Vec<f64> {
-        let spectrum = self.analyze(signal);
+        let mut spectrum = vec![0.0; self.num_bins()];
+        self.analyze_db_into(signal, reference, &mut spectrum);
         spectrum
-            .iter()
-            .map(|&mag| {
-                let mag_clamped = mag.max(1e-10);
-                20.0 * (mag_clamped / reference).log10()
-            })
-            .collect()
+    }
+    
+    /// Analyze and write magnitude in dB into a caller-provided buffer
+    /// 
+    /// Windows, transforms and converts to dB with no allocations.
+    /// 
+    /// # Arguments
+    /// * `signal` - Input signal
+    /// * `reference` - Reference level for dB (default: 1.0)
+    /// * `out` - Output buffer for the dB spectrum
+    /// 
+    /// # Returns
+    /// Number of bins written (min of `out.len()` and `num_bins()`)
+    pub fn analyze_db_into(&mut self, signal: &[f64], reference: f64, out: &mut [f64]) -> usize {
+        let len = self.analyze_into(signal, out);
+        
+        for s in out[..len].iter_mut() {
+            let mag_clamped = (*s).max(1e-10);
+            *s = 20.0 * (mag_clamped / reference).log10();
+        }
+        
+        len
     }
     
     /// Get frequency bins in Hz
     pub fn frequency_bins_hz(&self) -> Vec<f64> {
-        self.fft_engine
-            .frequency_axis()
-            .iter()
-            .map(|&f_norm| FftEngine::normalized_to_hz(f_norm, self.config.sample_rate))
-            .collect()
+        self.frequencies_hz.clone()
+    }
+    
+    /// Get the cached frequency axis in Hz (no allocation)
+    pub fn frequency_axis_hz(&self) -> &[f64] {
+        &self.frequencies_hz
+    }
+    
+    /// Get configuration generation
+    /// 
+    /// Changes whenever the configuration (and hence possibly the frequency
+    /// axis) changes, so consumers can re-fetch the axis only when needed.
+    pub fn generation(&self) -> u64 {
+        self.generation
     }
     
     /// Get frequency bins in normalized units (0 to 1, where 1 = Nyquist)
@@ -128,7 +259,149 @@ impl SpectrumAnalyzer {
             1.0
         };
         
+        // Precompute the window once per configuration
+        if needs_new_fft || config.window_type != self.config.window_type || self.window.len() != config.fft_size {
+            self.window = generate_window(config.window_type, config.fft_size);
+        }
+        
+        self.frequencies_hz = Self::compute_frequency_axis(&self.fft_engine, config.sample_rate);
+        self.generation = self.generation.wrapping_add(1);
+        
         self.config = config;
+        
+        // Bin count or scaling may have changed: restart averaging
+        self.reset_averaging();
+    }
+    
+    /// Set averaging mode (restarts the average)
+    pub fn set_averaging(&mut self, mode: AveragingMode) {
+        self.averaging = mode;
+        self.reset_averaging();
+    }
+    
+    /// Get averaging mode
+    pub fn averaging(&self) -> AveragingMode {
+        self.averaging
+    }
+    
+    /// Clear accumulated averages (allocates buffers for the current mode)
+    pub fn reset_averaging(&mut self) {
+        let bins = self.num_bins();
+        let welch_frames = match self.averaging {
+            AveragingMode::Welch { frames } => frames.max(1),
+            _ => 0,
+        };
+        
+        self.power.clear();
+        self.power.resize(bins, 0.0);
+        self.average.clear();
+        self.average.resize(bins, 0.0);
+        self.welch_history.clear();
+        self.welch_history.resize(welch_frames * bins, 0.0);
+        self.welch_pos = 0;
+        self.frames_accumulated = 0;
+    }
+    
+    /// Add one frame to the running average (zero allocations)
+    /// 
+    /// # Arguments
+    /// * `signal` - Input frame (windowed and zero-padded like `analyze`)
+    /// * `frame_interval` - Time since the previous frame in seconds (hop / sample rate)
+    pub fn accumulate(&mut self, signal: &[f64], frame_interval: f64) {
+        self.apply_cached_window(signal);
+        let bins = self.fft_engine.compute_magnitude_into(&self.windowed, &mut self.power);
+        
+        // Power of the amplitude-corrected magnitude
+        let scale = self.correction_factor * self.correction_factor;
+        for p in self.power[..bins].iter_mut() {
+            *p = *p * *p * scale;
+        }
+        
+        let power = &self.power[..bins];
+        let average = &mut self.average[..bins];
+        let first = self.frames_accumulated == 0;
+        
+        match self.averaging {
+            AveragingMode::None => {
+                average.copy_from_slice(power);
+            },
+            AveragingMode::Welch { frames } => {
+                let frames = frames.max(1);
+                let slot = &mut self.welch_history[self.welch_pos * bins..(self.welch_pos + 1) * bins];
+                
+                // Running sum: add the new frame, drop the one it replaces
+                for ((sum, old), &p) in average.iter_mut().zip(slot.iter_mut()).zip(power) {
+                    *sum += p - *old;
+                    *old = p;
+                }
+                self.welch_pos = (self.welch_pos + 1) % frames;
+                
+                // Re-sum once per cycle so rounding errors cannot build up
+                if self.welch_pos == 0 {
+                    average.fill(0.0);
+                    for frame in self.welch_history.chunks_exact(bins) {
+                        for (sum, &p) in average.iter_mut().zip(frame) {
+                            *sum += p;
+                        }
+                    }
+                }
+            },
+            AveragingMode::Exponential { time_constant } => {
+                let alpha = if first || time_constant <= 0.0 {
+                    1.0
+                } else {
+                    1.0 - (-frame_interval / time_constant).exp()
+                };
+                for (avg, &p) in average.iter_mut().zip(power) {
+                    *avg += alpha * (p - *avg);
+                }
+            },
+            AveragingMode::PeakHold { decay_db_per_second } => {
+                let decay = 10.0_f64.powf(-decay_db_per_second.max(0.0) * frame_interval / 10.0);
+                for (peak, &p) in average.iter_mut().zip(power) {
+                    *peak = p.max(*peak * decay);
+                }
+            },
+        }
+        
+        let limit = match self.averaging {
+            AveragingMode::Welch { frames } => frames.max(1),
+            _ => usize::MAX,
+        };
+        self.frames_accumulated = (self.frames_accumulated + 1).min(limit);
+    }
+    
+    /// Write the averaged spectrum in dB into a caller-provided buffer
+    /// 
+    /// # Arguments
+    /// * `reference` - Reference level for dB (default: 1.0)
+    /// * `out` - Output buffer for the dB spectrum
+    /// 
+    /// # Returns
+    /// Number of bins written (0 if nothing has been accumulated yet)
+    pub fn averaged_db_into(&self, reference: f64, out: &mut [f64]) -> usize {
+        if self.frames_accumulated == 0 {
+            return 0;
+        }
+        
+        let len = out.len().min(self.average.len());
+        let scale = match self.averaging {
+            AveragingMode::Welch { .. } => 1.0 / self.frames_accumulated as f64,
+            _ => 1.0,
+        };
+        let reference_power = reference * reference;
+        
+        for (o, &avg) in out[..len].iter_mut().zip(&self.average) {
+            let power_clamped = (avg * scale).max(1e-20);
+            *o = 10.0 * (power_clamped / reference_power).log10();
+        }
+        
+        len
+    }
+    
+    /// Get number of frames in the current average
+    pub fn frames_accumulated(&self) -> usize {
+        self.frames_accumulated
     }
     
     /// Get current configuration
@@ -181,6 +454,123 @@ mod tests {
         assert!((peak_freq - freq_hz).abs() < 100.0);  // Within 100 Hz
     }
     
+    #[test]
+    fn test_analyze_db_into_matches_analyze_db() {
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig::default());
+        let signal: Vec<f64> = (0..2048).map(|n| (n as f64 * 0.05).sin()).collect();
+        
+        let expected = analyzer.analyze_db(&signal, 1.0);
+        let mut out = vec![0.0; 4097];
+        let len = analyzer.analyze_db_into(&signal, 1.0, &mut out);
+        
+        assert_eq!(len, expected.len());
+        assert_eq!(&out[..len], &expected[..]);
+        
+        // Window follows config changes
+        analyzer.update_config(AnalyzerConfig {
+            window_type: WindowType::Rectangular,
+            ..AnalyzerConfig::default()
+        });
+        let rect = analyzer.analyze_db(&signal, 1.0);
+        assert!(rect.iter().zip(&expected).any(|(a, b)| (a - b).abs() > 1e-6));
+    }
+    
+    #[test]
+    fn test_frequency_axis_generation() {
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig::default());
+        let generation = analyzer.generation();
+        assert_eq!(analyzer.frequency_axis_hz().len(), 1025);
+        assert_eq!(analyzer.frequency_axis_hz()[1024], 24000.0);
+        
+        analyzer.update_config(AnalyzerConfig {
+            fft_size: 4096,
+            ..AnalyzerConfig::default()
+        });
+        
+        assert_ne!(analyzer.generation(), generation);
+        assert_eq!(analyzer.frequency_axis_hz().len(), 2049);
+        assert_eq!(analyzer.frequency_bins_hz(), analyzer.frequency_axis_hz());
+    }
+    
+    fn sine(freq_hz: f64, amplitude: f64) -> Vec<f64> {
+        (0..2048)
+            .map(|n| amplitude * (2.0 * PI * freq_hz * n as f64 / 48000.0).sin())
+            .collect()
+    }
+    
+    #[test]
+    fn test_averaging_none_matches_analyze_db() {
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig::default());
+        let signal = sine(1000.0, 0.5);
+        
+        analyzer.accumulate(&signal, 0.01);
+        let mut averaged = vec![0.0; 1025];
+        assert_eq!(analyzer.averaged_db_into(1.0, &mut averaged), 1025);
+        
+        let instantaneous = analyzer.analyze_db(&signal, 1.0);
+        for (a, b) in averaged.iter().zip(&instantaneous) {
+            assert!((a - b).abs() < 1e-9 || (*a <= -199.9 && *b <= -199.9));
+        }
+    }
+    
+    #[test]
+    fn test_welch_average_of_constant_frames() {
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig::default());
+        analyzer.set_averaging(AveragingMode::Welch { frames: 4 });
+        
+        let loud = sine(1000.0, 1.0);
+        let quiet = sine(1000.0, 0.0);
+        let mut out = vec![0.0; 1025];
+        
+        // Two loud + two silent frames: half the power of one loud frame
+        analyzer.accumulate(&loud, 0.01);
+        analyzer.averaged_db_into(1.0, &mut out);
+        let peak_db = out.iter().cloned().fold(f64::MIN, f64::max);
+        
+        analyzer.accumulate(&loud, 0.01);
+        analyzer.accumulate(&quiet, 0.01);
+        analyzer.accumulate(&quiet, 0.01);
+        analyzer.averaged_db_into(1.0, &mut out);
+        let half_db = out.iter().cloned().fold(f64::MIN, f64::max);
+        assert!((peak_db - half_db - 3.0103).abs() < 0.01);
+        
+        // Window slides: four silent frames push the tone out
+        for _ in 0..4 {
+            analyzer.accumulate(&quiet, 0.01);
+        }
+        assert_eq!(analyzer.frames_accumulated(), 4);
+        analyzer.averaged_db_into(1.0, &mut out);
+        assert!(out.iter().all(|&db| db < -150.0));
+    }
+    
+    #[test]
+    fn test_exponential_and_peak_hold() {
+        let loud = sine(1000.0, 1.0);
+        let quiet = sine(1000.0, 0.0);
+        let mut out = vec![0.0; 1025];
+        let peak_of = |analyzer: &SpectrumAnalyzer, out: &mut Vec<f64>| {
+            analyzer.averaged_db_into(1.0, out);
+            out.iter().cloned().fold(f64::MIN, f64::max)
+        };
+        
+        // Exponential: one time constant of silence leaves 1/e of the power
+        let mut analyzer = SpectrumAnalyzer::new(AnalyzerConfig::default());
+        analyzer.set_averaging(AveragingMode::Exponential { time_constant: 0.1 });
+        analyzer.accumulate(&loud, 0.1);
+        let start = peak_of(&analyzer, &mut out);
+        analyzer.accumulate(&quiet, 0.1);
+        let after = peak_of(&analyzer, &mut out);
+        assert!((start - after - 10.0 * std::f64::consts::E.log10()).abs() < 0.01);
+        
+        // Peak hold: decays at the configured rate
+        analyzer.set_averaging(AveragingMode::PeakHold { decay_db_per_second: 20.0 });
+        analyzer.accumulate(&loud, 0.1);
+        let start = peak_of(&analyzer, &mut out);
+        analyzer.accumulate(&quiet, 0.5);
+        let after = peak_of(&analyzer, &mut out);
+        assert!((start - after - 10.0).abs() < 1e-6);
+    }
+    
     #[test]
     fn test_analyzer_db() {
         let config = AnalyzerConfig::default();
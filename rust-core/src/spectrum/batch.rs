@@ -0,0 +1,125 @@
+//! Batch STFT of whole recordings across threads
+//!
+//! Computes every frame of a long signal in one call instead of one
+//! `analyze` per frame. Frames are independent, so contiguous ranges of
+//! output rows are handed to scoped threads, each with its own analyzer.
+
+use super::analysis::{AnalyzerConfig, SpectrumAnalyzer};
+
+/// Number of complete frames in a signal
+///
+/// # Arguments
+/// * `samples` - Signal length
+/// * `fft_size` - Frame length
+/// * `hop` - Samples between frame starts (at least 1)
+///
+/// # Returns
+/// Frames starting at `k * hop` that fit entirely in the signal
+pub fn stft_frames(samples: usize, fft_size: usize, hop: usize) -> usize {
+    if fft_size == 0 || samples < fft_size {
+        0
+    } else {
+        1 + (samples - fft_size) / hop.max(1)
+    }
+}
+
+/// Compute the STFT of a signal into a caller-provided row-major array
+///
+/// Each row is the windowed spectrum of one frame, scaled like
+/// `SpectrumAnalyzer::analyze_into` / `analyze_db_into`.
+///
+/// # Arguments
+/// * `signal` - Input samples
+/// * `config` - FFT size, window and amplitude correction
+/// * `hop` - Samples between frame starts (at least 1)
+/// * `db` - Magnitude in dB (reference 1.0) instead of linear
+/// * `threads` - Worker threads (0 = available parallelism)
+/// * `out` - Destination of `stft_frames(..) * num_bins` values
+///
+/// # Returns
+/// Number of rows written
+pub fn stft_into(
+    signal: &[f64],
+    config: &AnalyzerConfig,
+    hop: usize,
+    db: bool,
+    threads: usize,
+    out: &mut [f64],
+) -> usize {
+    let hop = hop.max(1);
+    let fft_size = config.fft_size;
+    let bins = fft_size / 2 + 1;
+    let rows = stft_frames(signal.len(), fft_size, hop).min(out.len() / bins);
+    if rows == 0 {
+        return 0;
+    }
+
+    let threads = if threads == 0 {
+        std::thread::available_parallelism().map_or(1, |n| n.get())
+    } else {
+        threads
+    };
+    let rows_per_thread = (rows + threads - 1) / threads;
+
+    let analyze_rows = |first_row: usize, block: &mut [f64]| {
+        let mut analyzer = SpectrumAnalyzer::new(config.clone());
+        for (i, row) in block.chunks_exact_mut(bins).enumerate() {
+            let start = (first_row + i) * hop;
+            let frame = &signal[start..start + fft_size];
+            if db {
+                analyzer.analyze_db_into(frame, 1.0, row);
+            } else {
+                analyzer.analyze_into(frame, row);
+            }
+        }
+    };
+
+    let out = &mut out[..rows * bins];
+    if rows_per_thread >= rows {
+        analyze_rows(0, out);
+    } else {
+        std::thread::scope(|scope| {
+            for (index, block) in out.chunks_mut(rows_per_thread * bins).enumerate() {
+                let analyze_rows = &analyze_rows;
+                scope.spawn(move || analyze_rows(index * rows_per_thread, block));
+            }
+        });
+    }
+
+    rows
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_frame_count() {
+        assert_eq!(stft_frames(100, 256, 64), 0);
+        assert_eq!(stft_frames(256, 256, 64), 1);
+        assert_eq!(stft_frames(1000, 256, 64), 12);
+    }
+
+    #[test]
+    fn test_threads_match_single_frame_analysis() {
+        let signal: Vec<f64> = (0..20000).map(|i| ((i as f64) * 0.07).sin()).collect();
+        let config = AnalyzerConfig {
+            fft_size: 512,
+            ..AnalyzerConfig::default()
+        };
+        let rows = stft_frames(signal.len(), 512, 128);
+        let bins = 257;
+
+        let mut single = vec![0.0; rows * bins];
+        let mut parallel = vec![0.0; rows * bins];
+        assert_eq!(stft_into(&signal, &config, 128, true, 1, &mut single), rows);
+        assert_eq!(stft_into(&signal, &config, 128, true, 4, &mut parallel), rows);
+        assert_eq!(single, parallel);
+
+        // Same result as analyzing one frame at a time
+        let mut analyzer = SpectrumAnalyzer::new(config);
+        let last = (rows - 1) * 128;
+        let expected = analyzer.analyze_db(&signal[last..last + 512], 1.0);
+        assert_eq!(&parallel[(rows - 1) * bins..], &expected[..]);
+    }
+}
@@ -40,14 +40,8 @@ impl FftEngine {
         }
     }
     
-    /// Compute FFT and return magnitude spectrum
-    /// 
-    /// # Arguments
-    /// * `signal` - Input signal (will be zero-padded if shorter than fft_size)
-    /// 
-    /// # Returns
-    /// Magnitude spectrum |X[k]| for k = 0..fft_size/2 (positive frequencies only)
-    pub fn compute_magnitude(&mut self, signal: &[f64]) -> Vec<f64> {
+    /// Run the forward FFT on `signal` (zero-padded or truncated to fft_size)
+    fn transform(&mut self, signal: &[f64]) {
         // Copy signal to input buffer with zero-padding
         let copy_len = signal.len().min(self.fft_size);
         self.input_buffer[..copy_len].copy_from_slice(&signal[..copy_len]);
@@ -59,9 +53,37 @@ impl FftEngine {
         self.r2c
             .process(&mut self.input_buffer, &mut self.output_buffer)
             .expect("FFT processing failed");
+    }
+    
+    /// Compute FFT and return magnitude spectrum
+    /// 
+    /// # Arguments
+    /// * `signal` - Input signal (will be zero-padded if shorter than fft_size)
+    /// 
+    /// # Returns
+    /// Magnitude spectrum |X[k]| for k = 0..fft_size/2 (positive frequencies only)
+    pub fn compute_magnitude(&mut self, signal: &[f64]) -> Vec<f64> {
+        let mut magnitude = vec![0.0; self.num_bins()];
+        self.compute_magnitude_into(signal, &mut magnitude);
+        magnitude
+    }
+    
+    /// Compute FFT magnitude into a caller-provided buffer (zero allocations)
+    /// 
+    /// # Arguments
+    /// * `signal` - Input signal (will be zero-padded if shorter than fft_size)
+    /// * `out` - Output buffer for |X[k]|
+    /// 
+    /// # Returns
+    /// Number of bins written (min of `out.len()` and `num_bins()`)
+    pub fn compute_magnitude_into(&mut self, signal: &[f64], out: &mut [f64]) -> usize {
+        self.transform(signal);
         
-        // Calculate magnitude
-        self.output_buffer.iter().map(|c| c.norm()).collect()
+        let len = out.len().min(self.output_buffer.len());
+        for (m, c) in out[..len].iter_mut().zip(&self.output_buffer) {
+            *m = c.norm();
+        }
+        len
     }
     
     /// Compute FFT and return magnitude spectrum in dB
@@ -3,7 +3,14 @@
 pub mod fft;
 pub mod windowing;
 pub mod analysis;
+pub mod stft;
+pub mod spectrogram;
+pub mod waterfall;
+pub mod batch;
 
 pub use fft::FftEngine;
 pub use windowing::apply_window;
-pub use analysis::SpectrumAnalyzer;
+pub use analysis::{SpectrumAnalyzer, AveragingMode};
+pub use stft::StftHistory;
+pub use spectrogram::SpectrogramRing;
+pub use waterfall::WaterfallRenderer;
@@ -0,0 +1,167 @@
+//! Fixed-size spectrogram (waterfall) history
+//!
+//! Stores the most recent spectra as rows of one contiguous ring buffer.
+//! Rows are numbered by a monotonically increasing sequence so readers can
+//! fetch only the rows added since their previous call.
+
+/// Default number of rows kept in the spectrogram
+pub const DEFAULT_SPECTROGRAM_ROWS: usize = 200;
+
+/// 2D ring buffer of spectrum rows
+///
+/// Rows are `f64` dB values by default; `SpectrogramRing<u8>` holds rendered
+/// RGBA image rows.
+pub struct SpectrogramRing<T = f64> {
+    /// Row data (`capacity` rows of `bins` values, contiguous)
+    data: Vec<T>,
+
+    /// Maximum number of rows
+    capacity: usize,
+
+    /// Values per row
+    bins: usize,
+
+    /// Sequence number of the next row (total rows ever pushed)
+    next_seq: u64,
+
+    /// Sequence number of the first row with the current `bins`
+    first_valid: u64,
+}
+
+impl<T: Copy + Default> SpectrogramRing<T> {
+    /// Create new spectrogram ring
+    ///
+    /// # Arguments
+    /// * `capacity` - Maximum number of rows kept
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            data: Vec::new(),
+            capacity: capacity.max(1),
+            bins: 0,
+            next_seq: 0,
+            first_valid: 0,
+        }
+    }
+
+    /// Append a spectrum row, overwriting the oldest when full
+    ///
+    /// A row with a different length (FFT size change) discards the existing
+    /// rows; this is the only case that allocates.
+    pub fn push_row(&mut self, row: &[T]) {
+        if row.len() != self.bins {
+            self.bins = row.len();
+            self.data = vec![T::default(); self.capacity * self.bins];
+            self.first_valid = self.next_seq;
+        }
+
+        let slot = (self.next_seq % self.capacity as u64) as usize;
+        self.data[slot * self.bins..(slot + 1) * self.bins].copy_from_slice(row);
+        self.next_seq += 1;
+    }
+
+    /// Range of rows a reader has not seen yet
+    ///
+    /// # Arguments
+    /// * `since` - Sequence number returned by the reader's previous call (0 = all)
+    ///
+    /// # Returns
+    /// (sequence of the first available row, number of rows)
+    pub fn rows_since(&self, since: u64) -> (u64, usize) {
+        let oldest = self
+            .next_seq
+            .saturating_sub(self.capacity as u64)
+            .max(self.first_valid);
+        let first = since.clamp(oldest, self.next_seq);
+        (first, (self.next_seq - first) as usize)
+    }
+
+    /// Get one row by sequence number (must be within `rows_since(0)`)
+    pub fn row(&self, seq: u64) -> &[T] {
+        let slot = (seq % self.capacity as u64) as usize;
+        &self.data[slot * self.bins..(slot + 1) * self.bins]
+    }
+
+    /// Copy `count` rows starting at `first` (oldest first) into `out`
+    ///
+    /// # Arguments
+    /// * `first` - Sequence number of the first row
+    /// * `count` - Number of rows
+    /// * `out` - Destination of at least `count * bins()` values
+    pub fn copy_rows(&self, first: u64, count: usize, out: &mut [T]) {
+        for (seq, dst) in (first..first + count as u64).zip(out.chunks_exact_mut(self.bins.max(1))) {
+            dst.copy_from_slice(self.row(seq));
+        }
+    }
+
+    /// Sequence number the next pushed row will get
+    pub fn next_seq(&self) -> u64 {
+        self.next_seq
+    }
+
+    /// Values per row
+    pub fn bins(&self) -> usize {
+        self.bins
+    }
+
+    /// Maximum number of rows
+    pub fn capacity(&self) -> usize {
+        self.capacity
+    }
+
+    /// Discard all rows (sequence numbers keep increasing)
+    pub fn clear(&mut self) {
+        self.first_valid = self.next_seq;
+    }
+}
+
+impl<T: Copy + Default> Default for SpectrogramRing<T> {
+    fn default() -> Self {
+        Self::new(DEFAULT_SPECTROGRAM_ROWS)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_spectrogram_wraps_and_keeps_newest() {
+        let mut ring = SpectrogramRing::new(3);
+        for i in 0..5 {
+            ring.push_row(&[i as f64, -(i as f64)]);
+        }
+
+        let (first, count) = ring.rows_since(0);
+        assert_eq!((first, count), (2, 3));
+
+        let mut out = vec![0.0; count * ring.bins()];
+        ring.copy_rows(first, count, &mut out);
+        assert_eq!(out, vec![2.0, -2.0, 3.0, -3.0, 4.0, -4.0]);
+    }
+
+    #[test]
+    fn test_spectrogram_new_rows_only() {
+        let mut ring = SpectrogramRing::new(10);
+        ring.push_row(&[1.0]);
+        ring.push_row(&[2.0]);
+        let seen = ring.next_seq();
+
+        ring.push_row(&[3.0]);
+        let (first, count) = ring.rows_since(seen);
+        assert_eq!(count, 1);
+        assert_eq!(ring.row(first), &[3.0]);
+
+        assert_eq!(ring.rows_since(ring.next_seq()).1, 0);
+    }
+
+    #[test]
+    fn test_spectrogram_resets_on_bin_change() {
+        let mut ring = SpectrogramRing::new(4);
+        ring.push_row(&[1.0, 2.0]);
+        ring.push_row(&[1.0, 2.0, 3.0]);
+
+        let (first, count) = ring.rows_since(0);
+        assert_eq!(count, 1);
+        assert_eq!(ring.row(first), &[1.0, 2.0, 3.0]);
+    }
+}
@@ -0,0 +1,210 @@
+//! Rolling STFT history for overlapping spectrum analysis
+//!
+//! Keeps the last `fft_size` samples of the stream in a ring buffer and emits
+//! an analysis frame every `hop` samples. Frame cadence and length are
+//! independent of the capture block size, so large FFTs see real signal
+//! instead of one zero-padded block.
+
+/// Default overlap between consecutive analysis frames (75%)
+pub const DEFAULT_OVERLAP: f64 = 0.75;
+
+/// Hop size for a given FFT size and overlap fraction
+///
+/// # Arguments
+/// * `fft_size` - Frame length in samples
+/// * `overlap` - Overlap between frames (0.0 = none, 0.75 = 75%)
+///
+/// # Returns
+/// Hop in samples, between 1 and `fft_size`
+pub fn hop_for_overlap(fft_size: usize, overlap: f64) -> usize {
+    let overlap = if overlap.is_finite() { overlap.clamp(0.0, 1.0) } else { 0.0 };
+    let hop = (fft_size as f64 * (1.0 - overlap)).round() as usize;
+    hop.clamp(1, fft_size.max(1))
+}
+
+/// Ring buffer of recent samples producing overlapping analysis frames
+pub struct StftHistory {
+    /// Last `fft_size` samples (circular)
+    history: Vec<f64>,
+
+    /// Next write position in `history` (also the oldest sample)
+    write_pos: usize,
+
+    /// Samples between frame starts
+    hop: usize,
+
+    /// Samples still needed before the next frame is due
+    until_next: usize,
+
+    /// Unrolled frame handed to the analyzer (oldest sample first)
+    frame: Vec<f64>,
+}
+
+impl StftHistory {
+    /// Create new history
+    ///
+    /// # Arguments
+    /// * `fft_size` - Frame length in samples
+    /// * `hop` - Samples between frames (clamped to 1..=fft_size)
+    pub fn new(fft_size: usize, hop: usize) -> Self {
+        let fft_size = fft_size.max(1);
+        let hop = hop.clamp(1, fft_size);
+
+        Self {
+            history: vec![0.0; fft_size],
+            write_pos: 0,
+            hop,
+            until_next: hop,
+            frame: vec![0.0; fft_size],
+        }
+    }
+
+    /// Change frame length and hop (no-op when unchanged)
+    ///
+    /// Resizing keeps the most recent samples, so the analysis continues
+    /// without a gap. Allocates only when `fft_size` changes.
+    pub fn configure(&mut self, fft_size: usize, hop: usize) {
+        let fft_size = fft_size.max(1);
+        let hop = hop.clamp(1, fft_size);
+
+        if fft_size != self.history.len() {
+            self.unroll();
+            let mut history = vec![0.0; fft_size];
+            let keep = fft_size.min(self.frame.len());
+            history[fft_size - keep..].copy_from_slice(&self.frame[self.frame.len() - keep..]);
+
+            self.history = history;
+            self.write_pos = 0;
+            self.frame = vec![0.0; fft_size];
+        }
+
+        if hop != self.hop {
+            self.hop = hop;
+            self.until_next = self.until_next.min(hop);
+        }
+    }
+
+    /// Append samples, calling `on_frame` for every frame that becomes due
+    ///
+    /// # Arguments
+    /// * `samples` - New samples (any length)
+    /// * `on_frame` - Receives each `fft_size` frame, oldest sample first
+    ///
+    /// # Returns
+    /// Number of frames emitted
+    pub fn push<F: FnMut(&[f64])>(&mut self, samples: &[f64], mut on_frame: F) -> usize {
+        let mut frames = 0;
+        let mut rest = samples;
+
+        while !rest.is_empty() {
+            let take = rest.len().min(self.until_next);
+            self.write(&rest[..take]);
+            rest = &rest[take..];
+            self.until_next -= take;
+
+            if self.until_next == 0 {
+                self.unroll();
+                on_frame(&self.frame);
+                frames += 1;
+                self.until_next = self.hop;
+            }
+        }
+
+        frames
+    }
+
+    /// Number of frames the next `push` of `samples` samples will emit
+    pub fn frames_for(&self, samples: usize) -> usize {
+        if samples < self.until_next {
+            0
+        } else {
+            1 + (samples - self.until_next) / self.hop
+        }
+    }
+
+    /// Write at most `fft_size` samples into the ring
+    fn write(&mut self, samples: &[f64]) {
+        let size = self.history.len();
+        let first = samples.len().min(size - self.write_pos);
+
+        self.history[self.write_pos..self.write_pos + first].copy_from_slice(&samples[..first]);
+        self.history[..samples.len() - first].copy_from_slice(&samples[first..]);
+        self.write_pos = (self.write_pos + samples.len()) % size;
+    }
+
+    /// Copy the ring into `frame` in chronological order
+    fn unroll(&mut self) {
+        let tail = self.history.len() - self.write_pos;
+        self.frame[..tail].copy_from_slice(&self.history[self.write_pos..]);
+        self.frame[tail..].copy_from_slice(&self.history[..self.write_pos]);
+    }
+
+    /// Clear history and restart the hop counter
+    pub fn reset(&mut self) {
+        self.history.fill(0.0);
+        self.write_pos = 0;
+        self.until_next = self.hop;
+    }
+
+    /// Get frame length
+    pub fn fft_size(&self) -> usize {
+        self.history.len()
+    }
+
+    /// Get hop size
+    pub fn hop(&self) -> usize {
+        self.hop
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_hop_for_overlap() {
+        assert_eq!(hop_for_overlap(4096, 0.75), 1024);
+        assert_eq!(hop_for_overlap(4096, 0.5), 2048);
+        assert_eq!(hop_for_overlap(4096, 0.0), 4096);
+        assert_eq!(hop_for_overlap(4096, 1.0), 1);
+    }
+
+    #[test]
+    fn test_frames_every_hop_independent_of_block_size() {
+        let signal: Vec<f64> = (0..10000).map(|i| i as f64).collect();
+
+        for block in [1, 100, 256, 3000] {
+            let mut stft = StftHistory::new(1024, 256);
+            let mut frames = Vec::new();
+            for chunk in signal.chunks(block) {
+                let expected = stft.frames_for(chunk.len());
+                assert_eq!(stft.push(chunk, |frame| frames.push(frame.to_vec())), expected);
+            }
+
+            // One frame per hop, each ending at the newest sample
+            assert_eq!(frames.len(), signal.len() / 256);
+            for (k, frame) in frames.iter().enumerate() {
+                let end = (k + 1) * 256;
+                assert_eq!(frame.len(), 1024);
+                assert_eq!(frame[1023], (end - 1) as f64);
+                if end >= 1024 {
+                    assert_eq!(frame[0], (end - 1024) as f64);
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn test_configure_keeps_recent_samples() {
+        let mut stft = StftHistory::new(8, 8);
+        let samples: Vec<f64> = (1..=8).map(|i| i as f64).collect();
+        stft.push(&samples, |_| {});
+
+        stft.configure(16, 4);
+        let mut last = Vec::new();
+        stft.push(&[9.0, 10.0, 11.0, 12.0], |frame| last = frame.to_vec());
+
+        let expected: Vec<f64> = [0.0; 4].iter().copied().chain((1..=12).map(|i| i as f64)).collect();
+        assert_eq!(last, expected);
+    }
+}
@@ -0,0 +1,242 @@
+//! Waterfall rendering to RGBA image rows
+//!
+//! Each new spectrum row is quantized to 8 bits against running display
+//! levels and mapped through a precomputed colormap lookup table. The GUI
+//! receives ready RGBA rows, so it neither normalizes the image nor applies
+//! a lookup table to the whole waterfall every frame.
+
+use super::spectrogram::{SpectrogramRing, DEFAULT_SPECTROGRAM_ROWS};
+
+/// Bytes per pixel (RGBA)
+pub const RGBA_CHANNELS: usize = 4;
+
+/// "Hot" colormap stops: black, purple, red, yellow, white (evenly spaced)
+pub const HOT_COLORMAP: [[u8; 3]; 5] = [
+    [0, 0, 0],
+    [128, 0, 128],
+    [255, 0, 0],
+    [255, 255, 0],
+    [255, 255, 255],
+];
+
+/// Lower display level percentile of each row
+const LOW_PERCENTILE: f64 = 0.05;
+
+/// Upper display level percentile of each row
+const HIGH_PERCENTILE: f64 = 0.95;
+
+/// Per-row smoothing of the display levels (0 = frozen, 1 = per-row levels)
+const LEVEL_SMOOTHING: f64 = 0.1;
+
+/// Smallest display range in dB (keeps silence from amplifying noise)
+const MIN_RANGE_DB: f64 = 1.0;
+
+/// Build a 256-entry RGBA lookup table from evenly spaced color stops
+///
+/// # Arguments
+/// * `stops` - RGB colors from lowest to highest level (at least one)
+///
+/// # Returns
+/// Opaque RGBA color for each 8-bit level
+pub fn colormap_lut(stops: &[[u8; 3]]) -> [[u8; 4]; 256] {
+    let mut lut = [[0, 0, 0, 255]; 256];
+    if stops.is_empty() {
+        return lut;
+    }
+
+    let segments = (stops.len() - 1).max(1) as f64;
+    for (level, entry) in lut.iter_mut().enumerate() {
+        let position = level as f64 / 255.0 * segments;
+        let index = (position.floor() as usize).min(stops.len() - 1);
+        let next = (index + 1).min(stops.len() - 1);
+        let frac = position - index as f64;
+
+        for c in 0..3 {
+            let a = stops[index][c] as f64;
+            let b = stops[next][c] as f64;
+            entry[c] = (a + (b - a) * frac).round() as u8;
+        }
+    }
+
+    lut
+}
+
+/// Renders spectrum rows into an RGBA waterfall image
+pub struct WaterfallRenderer {
+    /// Colormap lookup table
+    lut: [[u8; 4]; 256],
+
+    /// Running lower display level in dB
+    low: f64,
+
+    /// Running upper display level in dB
+    high: f64,
+
+    /// Whether the levels have been seeded from a row
+    levels_valid: bool,
+
+    /// Scratch copy of a row for percentile selection
+    scratch: Vec<f64>,
+
+    /// Rendered RGBA row
+    row: Vec<u8>,
+
+    /// Rendered rows (`bins * 4` bytes each)
+    image: SpectrogramRing<u8>,
+}
+
+impl WaterfallRenderer {
+    /// Create new renderer with the hot colormap
+    ///
+    /// # Arguments
+    /// * `capacity` - Maximum number of image rows kept
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            lut: colormap_lut(&HOT_COLORMAP),
+            low: 0.0,
+            high: 0.0,
+            levels_valid: false,
+            scratch: Vec::new(),
+            row: Vec::new(),
+            image: SpectrogramRing::new(capacity),
+        }
+    }
+
+    /// Replace the colormap
+    ///
+    /// Only affects rows rendered afterwards.
+    pub fn set_colormap(&mut self, stops: &[[u8; 3]]) {
+        self.lut = colormap_lut(stops);
+    }
+
+    /// Render a dB spectrum row and append it to the image
+    ///
+    /// Allocates only when the row length changes.
+    pub fn push_row(&mut self, spectrum_db: &[f64]) {
+        let bins = spectrum_db.len();
+        if bins == 0 {
+            return;
+        }
+        if self.scratch.len() != bins {
+            self.scratch = vec![0.0; bins];
+            self.row = vec![0; bins * RGBA_CHANNELS];
+            self.levels_valid = false;
+        }
+
+        self.update_levels(spectrum_db);
+
+        // Quantize to 8 bits and map through the LUT
+        let scale = 255.0 / (self.high - self.low);
+        for (&value, pixel) in spectrum_db.iter().zip(self.row.chunks_exact_mut(RGBA_CHANNELS)) {
+            let level = if value.is_finite() {
+                ((value - self.low) * scale).clamp(0.0, 255.0).round() as usize
+            } else {
+                0
+            };
+            pixel.copy_from_slice(&self.lut[level]);
+        }
+
+        self.image.push_row(&self.row);
+    }
+
+    /// Track the row's low/high percentiles with exponential smoothing
+    fn update_levels(&mut self, spectrum_db: &[f64]) {
+        let last = self.scratch.len() - 1;
+        self.scratch.copy_from_slice(spectrum_db);
+
+        // Linear-time selection instead of a full sort
+        let low_index = (LOW_PERCENTILE * last as f64).round() as usize;
+        let high_index = (HIGH_PERCENTILE * last as f64).round() as usize;
+        let row_low = *self.scratch.select_nth_unstable_by(low_index, f64::total_cmp).1;
+        let row_high = *self.scratch.select_nth_unstable_by(high_index, f64::total_cmp).1;
+
+        if !row_low.is_finite() || !row_high.is_finite() {
+            if !self.levels_valid {
+                self.low = 0.0;
+                self.high = MIN_RANGE_DB;
+            }
+            return;
+        }
+
+        if self.levels_valid {
+            self.low += LEVEL_SMOOTHING * (row_low - self.low);
+            self.high += LEVEL_SMOOTHING * (row_high - self.high);
+        } else {
+            self.low = row_low;
+            self.high = row_high;
+            self.levels_valid = true;
+        }
+        self.high = self.high.max(self.low + MIN_RANGE_DB);
+    }
+
+    /// Rendered rows
+    pub fn image(&self) -> &SpectrogramRing<u8> {
+        &self.image
+    }
+
+    /// Current display levels in dB (low, high)
+    pub fn levels(&self) -> (f64, f64) {
+        (self.low, self.high)
+    }
+
+    /// Discard all rows and re-seed the levels from the next row
+    pub fn clear(&mut self) {
+        self.image.clear();
+        self.levels_valid = false;
+    }
+}
+
+impl Default for WaterfallRenderer {
+    fn default() -> Self {
+        Self::new(DEFAULT_SPECTROGRAM_ROWS)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_lut_endpoints_and_midpoint() {
+        let lut = colormap_lut(&HOT_COLORMAP);
+        assert_eq!(lut[0], [0, 0, 0, 255]);
+        assert_eq!(lut[255], [255, 255, 255, 255]);
+
+        let two = colormap_lut(&[[0, 0, 0], [200, 100, 0]]);
+        assert_eq!(two[128], [100, 50, 0, 255]);
+    }
+
+    #[test]
+    fn test_rows_map_levels_to_colors() {
+        let mut renderer = WaterfallRenderer::new(4);
+        renderer.set_colormap(&[[0, 0, 0], [255, 255, 255]]);
+
+        // Low bins at the floor, high bins at the top of the range
+        let row: Vec<f64> = (0..100).map(|i| if i < 50 { -100.0 } else { 0.0 }).collect();
+        renderer.push_row(&row);
+
+        let image = renderer.image();
+        let (first, count) = image.rows_since(0);
+        assert_eq!(count, 1);
+        assert_eq!(image.bins(), 100 * RGBA_CHANNELS);
+
+        let pixels = image.row(first);
+        assert_eq!(&pixels[..4], &[0, 0, 0, 255]);
+        assert_eq!(&pixels[99 * 4..], &[255, 255, 255, 255]);
+    }
+
+    #[test]
+    fn test_levels_follow_signal_gradually() {
+        let mut renderer = WaterfallRenderer::new(4);
+        let quiet: Vec<f64> = (0..64).map(|i| -100.0 + i as f64).collect();
+        let loud: Vec<f64> = quiet.iter().map(|v| v + 50.0).collect();
+
+        renderer.push_row(&quiet);
+        let (low0, high0) = renderer.levels();
+        renderer.push_row(&loud);
+        let (low1, high1) = renderer.levels();
+
+        assert!(low1 > low0 && low1 < low0 + 50.0);
+        assert!(high1 > high0 && high1 < high0 + 50.0);
+    }
+}